@@ -1,9 +1,31 @@
-import mysql.connector
-from mysql.connector import Error
+import threading
+import time
+
+from lazy_import import lazy_import
+
+# mysql.connector导入较慢，第一次连接数据库时才导入
+mysql_connector = lazy_import("mysql.connector")
 
 # 默认版本信息，如果无法从main_new获取时使用
 DEFAULT_VERSION = "V1.0"
 
+# 数据库连接参数
+DB_CONFIG = {
+    "host": "p-dbsec-mysql.gz.cvte.cn",
+    "port": "10008",
+    "user": "tv_td_platform",
+    "password": "Abs#Yh2NusCK",
+    "database": "tv_td_platform",
+    # 连接会被复用，开启自动提交避免旧事务快照导致查询不到新数据
+    "autocommit": True,
+}
+
+# 连接池参数
+POOL_MAX_SIZE = 5              # 最大连接数（空闲 + 使用中）
+POOL_IDLE_TIMEOUT = 300        # 空闲超过该秒数的连接会被回收
+POOL_CHECKOUT_TIMEOUT = 10     # 连接池满时等待空闲连接的最长秒数
+
+
 def get_version_from_main():
     """动态获取版本信息，避免循环导入"""
     try:
@@ -13,29 +35,246 @@ def get_version_from_main():
         return DEFAULT_VERSION
 
 
+class PooledConnection:
+    """连接池中的连接包装，close()时归还连接池而不是真正断开"""
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._conn = raw_conn
+        self._released = False
+
+    def cursor(self, *args, **kwargs):
+        return self._conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self):
+        return not self._released and self._conn.is_connected()
+
+    def close(self):
+        """归还连接到连接池（重复调用无副作用）"""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class MySQLConnectionPool:
+    """MySQL连接池：限制连接数量、取出时健康检查、回收空闲连接并统计命中情况"""
+
+    def __init__(self, config, max_size=POOL_MAX_SIZE, idle_timeout=POOL_IDLE_TIMEOUT,
+                 checkout_timeout=POOL_CHECKOUT_TIMEOUT):
+        self.config = dict(config)
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = []      # [(连接, 最后归还时间)]，末尾为最近归还的连接
+        self._in_use = 0     # 已借出或正在创建的连接数
+        self._cond = threading.Condition()
+
+        self.stats = {
+            "hits": 0,                   # 复用空闲连接的次数
+            "misses": 0,                 # 新建连接的次数
+            "waits": 0,                  # 因连接池已满而等待的次数
+            "wait_time_total": 0.0,      # 累计等待时间（秒）
+            "wait_time_max": 0.0,        # 单次最长等待时间（秒）
+            "health_check_failures": 0,  # 取出时健康检查失败而丢弃的连接数
+            "evicted": 0,                # 因空闲超时被回收的连接数
+            "timeouts": 0,               # 等待超时的次数
+        }
+
+    def get_connection(self):
+        """从连接池取出一个连接，必要时新建；连接池满时等待，超时抛出PoolError"""
+        wait_start = None
+        deadline = time.monotonic() + self.checkout_timeout
+
+        # 空闲超时的连接在锁内取出、在锁外关闭，关闭连接的网络往返不阻塞其他线程
+        with self._cond:
+            expired = self._take_expired_locked()
+        for raw_conn in expired:
+            self._discard(raw_conn)
+
+        while True:
+            candidate = None
+            with self._cond:
+                if self._idle:
+                    candidate, _ = self._idle.pop()
+                    self._in_use += 1
+                elif self._in_use < self.max_size:
+                    self._in_use += 1
+                    self.stats["misses"] += 1
+                else:
+                    if wait_start is None:
+                        wait_start = time.monotonic()
+                        self.stats["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        self._record_wait_locked(wait_start)
+                        raise mysql_connector.errors.PoolError(f"连接池已满（{self.max_size}），等待空闲连接超时")
+                    self._cond.wait(remaining)
+                    continue
+                if wait_start is not None:
+                    self._record_wait_locked(wait_start)
+
+            # 健康检查和新建连接都在锁外进行，避免阻塞其他线程
+            if candidate is not None:
+                if self._is_healthy(candidate):
+                    with self._cond:
+                        self.stats["hits"] += 1
+                    return PooledConnection(self, candidate)
+                with self._cond:
+                    self.stats["health_check_failures"] += 1
+                self._discard(candidate)
+                # 丢弃后释放名额，重新尝试取出或新建
+                with self._cond:
+                    self._in_use -= 1
+                    self._cond.notify()
+                continue
+
+            try:
+                raw_conn = mysql_connector.connect(**self.config)
+            except Exception:
+                with self._cond:
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            return PooledConnection(self, raw_conn)
+
+    def release(self, raw_conn):
+        """归还连接，无法清理未读结果的连接直接丢弃"""
+        healthy = True
+        try:
+            # fetchone()之后可能还有未读取的结果，不清理会导致下次复用时报错
+            if getattr(raw_conn, "unread_result", False):
+                raw_conn.consume_results()
+        except Exception:
+            healthy = False
+
+        if not healthy:
+            self._discard(raw_conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((raw_conn, time.monotonic()))
+            self._cond.notify()
+
+    def get_stats(self):
+        """获取连接池统计信息"""
+        with self._cond:
+            stats = dict(self.stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+            stats["max_size"] = self.max_size
+            checkouts = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / checkouts if checkouts else 0.0
+        return stats
+
+    def close_all(self):
+        """关闭所有空闲连接（程序退出时调用）"""
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+        for raw_conn, _ in idle:
+            self._discard(raw_conn)
+
+    @staticmethod
+    def _is_healthy(raw_conn):
+        """取出时ping一次检查连接是否可用（远比重新握手便宜）"""
+        try:
+            raw_conn.ping(reconnect=False, attempts=1)
+            return True
+        except Exception:
+            return False
+
+    def _take_expired_locked(self):
+        """从空闲列表中取出空闲超时的连接并返回（调用方需持有锁，并在释放锁后关闭这些连接）"""
+        now = time.monotonic()
+        fresh = []
+        expired = []
+        for raw_conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                expired.append(raw_conn)
+            else:
+                fresh.append((raw_conn, last_used))
+        self._idle = fresh
+        self.stats["evicted"] += len(expired)
+        return expired
+
+    def _record_wait_locked(self, wait_start):
+        waited = time.monotonic() - wait_start
+        self.stats["wait_time_total"] += waited
+        self.stats["wait_time_max"] = max(self.stats["wait_time_max"], waited)
+
+    @staticmethod
+    def _discard(raw_conn):
+        try:
+            raw_conn.close()
+        except Exception:
+            pass
+
+
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """获取进程内共享的连接池（首次调用时创建）"""
+    global _connection_pool
+    if _connection_pool is None:
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = MySQLConnectionPool(DB_CONFIG)
+    return _connection_pool
+
+
 
 # 【类】 数据库连接函数
 class ReadDataBase:
     def mysql_connection(self):
+        """从共享连接池取出连接，用完后调用close_connection归还"""
         try:
-            conn = mysql.connector.connect(
-                host="p-dbsec-mysql.gz.cvte.cn",
-                port="10008",
-                user="tv_td_platform",
-                password="Abs#Yh2NusCK",
-                database="tv_td_platform"
-            )
-            return conn
-        except mysql.connector.Error as e:
+            return get_connection_pool().get_connection()
+        except mysql_connector.Error as e:
             print(f"Error connecting to MySQL database: {e}")
             return None
+
+    def close_connection(self, conn, cursor=None):
+        """关闭游标并将连接归还连接池"""
+        try:
+            if cursor is not None:
+                cursor.close()
+        except mysql_connector.Error:
+            pass
+        conn.close()
+
+    def get_pool_stats(self):
+        """获取连接池命中/未命中/等待时间统计"""
+        return get_connection_pool().get_stats()
     
     def get_system_enable_status(self):
-        """查询电源测试设备集成控制系统的启用状态"""
+        """查询电源测试设备集成控制系统的启用状态（查询失败时返回None）"""
+        try:
+            return self.query_system_enable_status()
+        except ConnectionError:
+            return None
+    
+    def query_system_enable_status(self):
+        """查询启用状态：没有该版本的记录时返回None，数据库连接或查询失败时抛出ConnectionError"""
         conn = self.mysql_connection()
         if conn is None:
-            return None
+            raise ConnectionError("无法连接数据库")
         
+        cursor = None
         try:
             cursor = conn.cursor()
             # 获取版本信息并构建查询参数
@@ -55,13 +294,11 @@ class ReadDataBase:
                 # 如果找不到精确匹配，返回None（禁用）
                 return None
                 
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error executing query: {e}")
-            return None
+            raise ConnectionError(str(e)) from e
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
     
     def check_instrument_command_exists(self, device_type, device_model, function_type):
         """检查仪器指令是否已存在，如果存在则返回详细信息"""
@@ -69,6 +306,7 @@ class ReadDataBase:
         if conn is None:
             return None
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -88,13 +326,11 @@ class ReadDataBase:
             else:
                 return None
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error checking instrument command existence: {e}")
             return None
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
     
     def get_all_instrument_commands(self):
         """获取所有仪器指令数据"""
@@ -102,6 +338,7 @@ class ReadDataBase:
         if conn is None:
             return []
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -113,26 +350,56 @@ class ReadDataBase:
             results = cursor.fetchall()
             
             # 转换为字典列表
-            commands = []
-            for row in results:
-                commands.append({
-                    'device_type': row[0],
-                    'device_model': row[1], 
-                    'function_type': row[2],
-                    'command': row[3],
-                    'params_reminder': row[4],
-                    'update_time': row[5].strftime("%Y-%m-%d %H:%M:%S") if row[5] else ""
-                })
-            
-            return commands
+            return [self._command_row_to_dict(row) for row in results]
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error getting instrument commands: {e}")
             return []
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
+    
+    def query_instrument_commands(self, since_time=None):
+        """查询仪器指令（用于本地缓存同步），数据库连接或查询失败时抛出ConnectionError
+        
+        since_time为None时返回全部记录；否则只返回更新时间不早于since_time的记录，
+        使用 >= 比较，避免漏掉与水位线同一秒内写入的记录，调用方按主键覆盖即可。
+        与get_all_instrument_commands不同，空列表表示表中确实没有（新的）记录。
+        """
+        conn = self.mysql_connection()
+        if conn is None:
+            raise ConnectionError("无法连接数据库")
+        
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            query = """
+            SELECT 仪器分类, 仪器型号, 功能分类, 指令, 指令参数提醒, 更新时间
+            FROM tb_instrument_command 
+            """
+            if since_time is None:
+                cursor.execute(query + "ORDER BY 更新时间 DESC")
+            else:
+                cursor.execute(query + "WHERE 更新时间 >= %s ORDER BY 更新时间 ASC", (since_time,))
+            results = cursor.fetchall()
+            return [self._command_row_to_dict(row) for row in results]
+            
+        except mysql_connector.Error as e:
+            print(f"Error querying instrument commands: {e}")
+            raise ConnectionError(str(e)) from e
+        finally:
+            self.close_connection(conn, cursor)
+    
+    @staticmethod
+    def _command_row_to_dict(row):
+        """将tb_instrument_command查询结果行转换为字典"""
+        return {
+            'device_type': row[0],
+            'device_model': row[1], 
+            'function_type': row[2],
+            'command': row[3],
+            'params_reminder': row[4],
+            'update_time': row[5].strftime("%Y-%m-%d %H:%M:%S") if row[5] else ""
+        }
     
     def insert_instrument_command(self, device_type, device_model, function_type, command, params_reminder, update_time):
         """插入仪器指令到数据库"""
@@ -140,6 +407,7 @@ class ReadDataBase:
         if conn is None:
             return False
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -151,13 +419,11 @@ class ReadDataBase:
             conn.commit()
             return True
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error inserting instrument command: {e}")
             return False
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
 
     def check_test_program_exists(self, program_name):
         """检查测试项目名称是否已存在"""
@@ -165,6 +431,7 @@ class ReadDataBase:
         if conn is None:
             return False
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -175,13 +442,11 @@ class ReadDataBase:
             result = cursor.fetchone()
             return result[0] > 0 if result else False
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error checking test program existence: {e}")
             return False
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
 
     def insert_test_program(self, program_name, step_number=0):
         """插入测试项目到数据库"""
@@ -189,6 +454,7 @@ class ReadDataBase:
         if conn is None:
             return False
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -200,13 +466,11 @@ class ReadDataBase:
             conn.commit()
             return True
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error inserting test program: {e}")
             return False
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
 
     def get_all_test_programs(self):
         """获取所有测试项目名称"""
@@ -214,6 +478,7 @@ class ReadDataBase:
         if conn is None:
             return []
         
+        cursor = None
         try:
             cursor = conn.cursor()
             query = """
@@ -233,13 +498,11 @@ class ReadDataBase:
             
             return programs
             
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Error getting test programs: {e}")
             return []
         finally:
-            if conn.is_connected():
-                cursor.close()
-                conn.close()
+            self.close_connection(conn, cursor)
 
 
 
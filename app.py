@@ -2,6 +2,7 @@
 Power Test Integrate System - 主程序
 优化版本，防止界面卡顿
 """
+from startup_profiler import get_startup_profiler
 import tkinter as tk
 from tkinter import ttk
 import sys
@@ -11,7 +12,8 @@ import os
 
 # 使用tkintertools风格主界面
 try:
-    import simple_tkintertools_main as modern_main
+    with get_startup_profiler().phase("导入主界面模块"):
+        import simple_tkintertools_main as modern_main
     print("OK tkintertools风格主界面模块导入成功")  # 使用安全字符
 except ImportError as e:
     print(f"ERROR 主界面模块导入失败: {e}")  # 使用安全字符
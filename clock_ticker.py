@@ -0,0 +1,167 @@
+"""
+共享时钟
+所有时间显示（以及需要每秒刷新的状态文字）共用一个对齐到整秒的after定时器：
+窗口最小化或隐藏时不更新，文字没有变化时不修改控件，控件销毁后自动取消订阅
+"""
+import itertools
+import time
+import tkinter as tk
+from datetime import datetime
+
+TICK_OFFSET_MS = 5      # 在整秒之后多少毫秒触发，避免刚好落在整秒之前显示旧的秒数
+
+TIME_FORMAT = "%H:%M:%S"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _Subscription:
+    __slots__ = ("text_func", "apply", "widget", "last_text")
+
+    def __init__(self, text_func, apply, widget):
+        self.text_func = text_func
+        self.apply = apply
+        self.widget = widget
+        self.last_text = None
+
+
+class ClockTicker:
+    """每秒（整秒边界）通知一次订阅者
+
+    subscribe(text_func, apply, widget)：每秒调用 text_func(当前时间) 得到文字，
+    与上次不同时调用 apply(文字)；widget 被销毁后自动取消订阅。
+    没有订阅者时定时器停止。
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._subscriptions = {}
+        self._ids = itertools.count(1)
+        self._pending = None
+        self.tick_count = 0
+        self.update_count = 0
+        self.unchanged_count = 0
+        self.hidden_count = 0
+        # 窗口从最小化恢复时立即刷新一次，不必等到下一秒
+        root.bind('<Map>', self._on_map, add='+')
+
+    # ---- 订阅 ----
+
+    def subscribe(self, text_func, apply, widget=None):
+        """订阅每秒更新，返回订阅编号（用于unsubscribe）；订阅时立即更新一次"""
+        token = next(self._ids)
+        subscription = _Subscription(text_func, apply, widget)
+        self._subscriptions[token] = subscription
+        self._update(token, subscription, datetime.now())
+        self._schedule()
+        return token
+
+    def subscribe_label(self, label, fmt=TIME_FORMAT):
+        """Label（或其他有text选项的控件）显示当前时间"""
+        return self.subscribe(lambda now: now.strftime(fmt),
+                              lambda text: label.config(text=text), label)
+
+    def subscribe_canvas_text(self, canvas, item, fmt=TIME_FORMAT):
+        """画布文字项目显示当前时间；item可以是项目编号、标签或返回项目编号的函数"""
+        def apply(text):
+            target = item() if callable(item) else item
+            if target:
+                canvas.itemconfig(target, text=text)
+        return self.subscribe(lambda now: now.strftime(fmt), apply, canvas)
+
+    def refresh(self, token):
+        """立即更新一次（订阅的控件重新创建后调用，不跳过相同的文字）"""
+        subscription = self._subscriptions.get(token)
+        if subscription is not None:
+            subscription.last_text = None
+            self._update(token, subscription, datetime.now())
+
+    def unsubscribe(self, token):
+        self._subscriptions.pop(token, None)
+        if not self._subscriptions:
+            self.stop()
+
+    def stop(self):
+        if self._pending is not None:
+            try:
+                self.root.after_cancel(self._pending)
+            except tk.TclError:
+                pass
+            self._pending = None
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def stats(self):
+        return {
+            "subscribers": len(self._subscriptions),
+            "ticks": self.tick_count,
+            "updates": self.update_count,
+            "unchanged": self.unchanged_count,
+            "hidden": self.hidden_count,
+        }
+
+    # ---- 内部 ----
+
+    def _schedule(self):
+        if self._pending is not None or not self._subscriptions:
+            return
+        delay = 1000 - int(time.time() * 1000) % 1000 + TICK_OFFSET_MS
+        try:
+            self._pending = self.root.after(delay, self._tick)
+        except tk.TclError:
+            # 根窗口已销毁
+            self._pending = None
+
+    def _tick(self):
+        self._pending = None
+        self.tick_count += 1
+        if self._is_visible():
+            self._update_all()
+        else:
+            self.hidden_count += 1
+        self._schedule()
+
+    def _on_map(self, event):
+        if event.widget is self.root and self._subscriptions:
+            self._update_all()
+
+    def _is_visible(self):
+        try:
+            return self.root.state() not in ('iconic', 'withdrawn')
+        except tk.TclError:
+            return False
+
+    def _update_all(self):
+        now = datetime.now()
+        for token, subscription in list(self._subscriptions.items()):
+            self._update(token, subscription, now)
+
+    def _update(self, token, subscription, now):
+        widget = subscription.widget
+        try:
+            if widget is not None and not widget.winfo_exists():
+                self._subscriptions.pop(token, None)
+                return
+            text = subscription.text_func(now)
+            if text == subscription.last_text:
+                self.unchanged_count += 1
+                return
+            subscription.apply(text)
+            subscription.last_text = text
+            self.update_count += 1
+        except tk.TclError:
+            # 控件已被销毁
+            self._subscriptions.pop(token, None)
+        except Exception as e:
+            print(f"❌ 时间显示更新失败: {e}")
+
+
+def get_clock_ticker(widget):
+    """获取控件所属根窗口共享的时钟"""
+    root = widget._root()
+    ticker = getattr(root, '_clock_ticker', None)
+    if ticker is None:
+        ticker = ClockTicker(root)
+        root._clock_ticker = ticker
+    return ticker
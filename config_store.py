@@ -0,0 +1,197 @@
+"""
+配置存储服务
+System Information.json 只在内存中保留一份，读取时只在文件修改时间变化后才重新解析；
+修改后延迟合并写入（连续修改只写一次），写入时先写临时文件再替换，避免文件损坏
+"""
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+
+DEFAULT_CONFIG_PATH = r"D:\Power Test Integrate System\System Information.json"
+DEFAULT_SAVE_DELAY = 0.5    # 最后一次修改后多久写入文件（秒）
+
+# 配置文件不存在或无法解析时使用的默认配置
+DEFAULT_CONFIG = {
+    "device_addresses": {
+        "oscilloscope": "TCPIP::192.168.1.100::INSTR",
+        "ac_source": "TCPIP::192.168.1.101::INSTR",
+        "electronic_load": "TCPIP::192.168.1.102::INSTR",
+        "control_box": "TCPIP::192.168.1.103::INSTR"
+    }
+}
+
+
+def atomic_write(path, data):
+    """把data（str按UTF-8编码，或bytes）写入path：先写同目录的临时文件再替换，
+    程序中途退出时只会留下旧文件或新文件，不会留下写了一半的文件；失败时抛出OSError
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigStore:
+    """线程安全的JSON配置文件（读取返回副本，修改通过set/update）"""
+
+    def __init__(self, path, default=None, save_delay=DEFAULT_SAVE_DELAY):
+        self.path = path
+        self.default = copy.deepcopy(default if default is not None else DEFAULT_CONFIG)
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._data = None
+        self._signature = None      # 最近一次读取/写入时文件的 (修改时间, 大小)
+        self._dirty = False
+        self._timer = None
+        self.reload_count = 0
+        self.save_count = 0
+
+    # ---- 读取 ----
+
+    def get(self, key, default=None):
+        """返回顶层配置项的副本"""
+        with self._lock:
+            self._reload_if_changed()
+            if key not in self._data:
+                return default
+            return copy.deepcopy(self._data[key])
+
+    def get_device_address(self, device_key):
+        """返回设备地址（没有配置时返回None）"""
+        with self._lock:
+            self._reload_if_changed()
+            return self._data.get("device_addresses", {}).get(device_key)
+
+    def exists(self):
+        """配置文件存在（或有尚未写入的修改）"""
+        with self._lock:
+            self._reload_if_changed()
+            return self._dirty or self._signature is not None
+
+    def snapshot(self):
+        """返回整个配置的副本"""
+        with self._lock:
+            self._reload_if_changed()
+            return copy.deepcopy(self._data)
+
+    # ---- 修改 ----
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values):
+        """修改顶层配置项；内容有变化（或配置文件还不存在）时安排延迟写入，返回是否有变化"""
+        with self._lock:
+            self._reload_if_changed()
+            changed = False
+            for key, value in values.items():
+                if self._data.get(key) != value:
+                    self._data[key] = copy.deepcopy(value)
+                    changed = True
+            if changed or self._signature is None:
+                self._schedule_save()
+            return changed
+
+    def set_device_addresses(self, addresses):
+        """更新部分设备地址（保留未指定设备的地址）"""
+        with self._lock:
+            merged = self.get("device_addresses", {})
+            merged.update(addresses)
+            return self.update({"device_addresses": merged})
+
+    def flush(self):
+        """立即写入尚未保存的修改（程序退出时自动调用）"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save()
+
+    # ---- 内部 ----
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _reload_if_changed(self):
+        """文件修改时间或大小变化时重新读取（有未保存的修改时以内存为准）"""
+        if self._data is not None and self._dirty:
+            return
+        signature = self._file_signature()
+        if self._data is not None and signature == self._signature:
+            return
+        self._data = self._load()
+        self._signature = signature
+        self.reload_count += 1
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            print(f"⚠️ 配置文件格式错误，使用默认配置: {self.path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"加载配置文件失败: {e}")
+        return copy.deepcopy(self.default)
+
+    def _schedule_save(self):
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.save_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _save(self):
+        try:
+            atomic_write(self.path, json.dumps(self._data, ensure_ascii=False, indent=4))
+        except OSError as e:
+            print(f"保存配置文件失败: {e}")
+            return
+        self._dirty = False
+        self._signature = self._file_signature()
+        self.save_count += 1
+        print(f"配置已保存到: {self.path}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_config_store(path=DEFAULT_CONFIG_PATH):
+    """返回该路径共享的配置存储"""
+    key = os.path.normcase(os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ConfigStore(path)
+        return store
+
+
+@atexit.register
+def _flush_all():
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
@@ -6,6 +6,11 @@
 
 import tkinter as tk
 
+import gradient_engine
+
+# 从浅天空蓝到深海蓝的二次曲线渐变，没有水平光效
+SKY_TO_SEA_CURVE = gradient_engine.linear_segments((135, 206, 250), (25, 42, 86), exponent=2)
+
 def create_gradient_ppm():
     """创建PPM格式的渐变背景图片"""
     print("🎨 生成PPM格式渐变图片...")
@@ -13,42 +18,9 @@ def create_gradient_ppm():
     width = 800
     height = 600
     
-    # PPM文件头
-    ppm_data = f"P3\n{width} {height}\n255\n"
-    
-    # 生成像素数据
-    for y in range(height):
-        for x in range(width):
-            # 计算渐变比例
-            ratio = y / height
-            
-            # 使用平滑过渡
-            smooth_ratio = ratio * ratio
-            
-            # 颜色计算：从浅蓝到深蓝
-            start_r, start_g, start_b = 135, 206, 250  # 浅天空蓝
-            end_r, end_g, end_b = 25, 42, 86   # 深海蓝
-            
-            r = int(start_r + (end_r - start_r) * smooth_ratio)
-            g = int(start_g + (end_g - start_g) * smooth_ratio)
-            b = int(start_b + (end_b - start_b) * smooth_ratio)
-            
-            # 确保颜色值在有效范围内
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            ppm_data += f"{r} {g} {b} "
-        
-        ppm_data += "\n"
-        
-        # 显示进度
-        if y % 100 == 0:
-            print(f"   生成进度: {y}/{height} ({y/height*100:.1f}%)")
-    
-    # 保存PPM文件
-    with open("d:/Power Test Integrate System/gradient_background.ppm", "w") as f:
-        f.write(ppm_data)
+    # 由渐变引擎直接生成二进制PPM（P6）
+    gradient_engine.save_gradient("d:/Power Test Integrate System/gradient_background.ppm",
+                                  width, height, scale=1, segments=SKY_TO_SEA_CURVE, light=0)
     
     print("✅ PPM渐变图片已保存: gradient_background.ppm")
     
@@ -65,42 +37,9 @@ def create_gradient_gif():
     width = 800
     height = 600
     
-    # 创建PhotoImage
-    img = tk.PhotoImage(width=width, height=height)
-    
     print("🎨 生成GIF格式渐变...")
     
-    # 逐行设置像素
-    for y in range(height):
-        row_colors = []
-        for x in range(width):
-            # 计算渐变比例
-            ratio = y / height
-            smooth_ratio = ratio * ratio
-            
-            # 颜色计算
-            start_r, start_g, start_b = 135, 206, 250
-            end_r, end_g, end_b = 25, 42, 86
-            
-            r = int(start_r + (end_r - start_r) * smooth_ratio)
-            g = int(start_g + (end_g - start_g) * smooth_ratio)
-            b = int(start_b + (end_b - start_b) * smooth_ratio)
-            
-            # 确保颜色值在有效范围内
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            row_colors.append(color)
-        
-        # 设置整行像素
-        row_data = " ".join(row_colors)
-        img.put(row_data, (0, y))
-        
-        # 显示进度
-        if y % 100 == 0:
-            print(f"   生成进度: {y}/{height} ({y/height*100:.1f}%)")
+    img = gradient_engine.photo_image(root, width, height, segments=SKY_TO_SEA_CURVE, light=0)
     
     # 保存GIF文件
     img.write("d:/Power Test Integrate System/gradient_background.gif")
@@ -0,0 +1,241 @@
+"""
+设备发现引擎
+在线程池中并发执行COM、VISA、网络、GPIB、LPT等扫描，每个扫描有独立超时，
+VISA资源列表只枚举一次供VISA和GPIB共用，每个扫描完成后立即回调部分结果
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from lazy_import import lazy_import
+from network_scanner import scan_subnets, to_visa_address
+
+# pyserial用于COM口检测，第一次扫描COM口时才导入
+list_ports = lazy_import("serial.tools.list_ports")
+
+# 地址排序的类型优先级：COM -> TCPIP -> GPIB -> LPT -> 其他
+ADDRESS_PREFIX_ORDER = ('COM', 'TCPIP', 'GPIB', 'LPT')
+
+# 各扫描的默认超时（秒）
+DEFAULT_BACKEND_TIMEOUTS = {
+    "com": 3.0,
+    "visa": 8.0,
+    "network": 5.0,
+    "gpib": 8.0,
+    "lpt": 1.0,
+}
+
+
+class DiscoveryContext:
+    """一次发现过程中各扫描共享的数据（VISA资源只枚举一次）"""
+
+    def __init__(self, options=None):
+        self.options = dict(options or {})   # 扫描选项，如 subnets: 要探测的子网列表
+        self._visa_lock = threading.Lock()
+        self._visa_resources = None
+        self._visa_error = None
+
+    def list_visa_resources(self):
+        """枚举VISA资源，多个扫描同时调用时只执行一次；未安装PyVISA时抛出ImportError"""
+        with self._visa_lock:
+            if self._visa_resources is None and self._visa_error is None:
+                try:
+                    import pyvisa
+                    rm = pyvisa.ResourceManager()
+                    try:
+                        self._visa_resources = [res for res in rm.list_resources()
+                                                if isinstance(res, str)]
+                    finally:
+                        rm.close()
+                except Exception as e:
+                    self._visa_error = e
+            if self._visa_error is not None:
+                raise self._visa_error
+            return list(self._visa_resources)
+
+
+class DiscoveryResult:
+    """一次设备发现的结果"""
+
+    def __init__(self):
+        self.by_backend = {}    # 扫描名称 -> 地址列表
+        self.timings = {}       # 扫描名称 -> 耗时（毫秒）
+        self.errors = {}        # 扫描名称 -> 错误信息
+        self.timed_out = []     # 超时未完成的扫描
+        self.total_time = 0.0   # 总耗时（毫秒）
+        self.addresses = []     # 合并、去重、排序后的地址
+
+    def format_timings(self):
+        """格式化各扫描耗时，用于日志输出"""
+        parts = []
+        for name, elapsed in self.timings.items():
+            status = "超时" if name in self.timed_out else ("失败" if name in self.errors else "完成")
+            parts.append(f"{name}={elapsed:.0f}ms({status})")
+        return f"总耗时 {self.total_time:.0f}ms: " + ", ".join(parts)
+
+
+def sort_addresses(addresses):
+    """去重并按 COM -> TCPIP -> GPIB -> LPT -> 其他 的顺序排序"""
+    groups = {prefix: [] for prefix in ADDRESS_PREFIX_ORDER}
+    others = []
+    for addr in set(addresses):
+        for prefix in ADDRESS_PREFIX_ORDER:
+            if addr.startswith(prefix):
+                groups[prefix].append(addr)
+                break
+        else:
+            others.append(addr)
+
+    result = []
+    for prefix in ADDRESS_PREFIX_ORDER:
+        result.extend(sorted(groups[prefix]))
+    result.extend(sorted(others))
+    return result
+
+
+def scan_com_ports(context):
+    """获取可用COM端口列表 - 动态扫描"""
+    ports = []
+    if list_ports.available():
+        for port in list_ports.comports():
+            # 添加详细的端口信息
+            ports.append(f"{port.device} - {port.description}")
+        if not ports:
+            print("ℹ️ 未检测到COM口，使用默认列表")
+    else:
+        print("⚠️ pyserial未安装，使用默认COM端口列表")
+
+    # 如果没有找到端口，返回常见的COM端口供测试
+    return ports or ["COM1", "COM2", "COM3", "COM4"]
+
+
+def scan_visa_resources(context):
+    """使用PyVISA扫描所有VISA资源"""
+    try:
+        return context.list_visa_resources()
+    except ImportError:
+        print("⚠️ 未安装PyVISA，跳过VISA资源扫描")
+        return []
+
+
+def scan_network_devices(context):
+    """并发探测子网内的LXI仪器端口，只返回真正应答的主机（TCPIP地址）
+
+    子网取自 context.options["subnets"]，未配置时探测本机所在的/24网段。
+    """
+    found = scan_subnets(context.options.get("subnets"))
+    return [to_visa_address(ip, open_ports) for ip, open_ports in sorted(found.items())]
+
+
+def scan_gpib_devices(context):
+    """扫描GPIB设备（复用同一次VISA枚举结果）"""
+    gpib_devices = []
+    try:
+        gpib_devices = [res for res in context.list_visa_resources() if 'GPIB' in res]
+    except ImportError:
+        print("⚠️ pyvisa未安装，使用默认GPIB地址")
+    except Exception as e:
+        print(f"❌ VISA扫描GPIB失败: {e}")
+
+    # 添加标准GPIB地址格式
+    for i in range(1, 31):
+        for gpib in (f"GPIB0::{i}::INSTR", f"GPIB::{i}"):
+            if gpib not in gpib_devices:
+                gpib_devices.append(gpib)
+    return gpib_devices
+
+
+def scan_lpt_devices(context):
+    """扫描LPT并口设备（仅Windows）"""
+    if os.name == 'nt':
+        return ["LPT1", "LPT2", "LPT3"]
+    return []
+
+
+DEFAULT_BACKENDS = {
+    "com": scan_com_ports,
+    "visa": scan_visa_resources,
+    "network": scan_network_devices,
+    "gpib": scan_gpib_devices,
+    "lpt": scan_lpt_devices,
+}
+
+
+class DeviceDiscoveryEngine:
+    """并发设备发现引擎"""
+
+    def __init__(self, backends=None, timeouts=None):
+        self.backends = dict(backends or DEFAULT_BACKENDS)
+        self.timeouts = dict(DEFAULT_BACKEND_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+
+    def discover(self, extra_addresses=(), on_partial=None, options=None):
+        """并发执行所有扫描并返回DiscoveryResult
+
+        extra_addresses: 额外合并的地址（如配置文件中的地址）
+        options: 传给各扫描的选项（见DiscoveryContext）
+        on_partial(backend_name, addresses): 每个扫描完成后以当前已合并、排序的地址回调
+            （在调用discover的线程中执行）
+        """
+        result = DiscoveryResult()
+        context = DiscoveryContext(options)
+        merged = [addr for addr in extra_addresses if isinstance(addr, str)]
+        start_time = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=len(self.backends),
+                                      thread_name_prefix="device-discovery")
+        futures = {}
+        deadlines = {}
+        for name, backend in self.backends.items():
+            future = executor.submit(self._run_backend, backend, context)
+            futures[future] = name
+            deadlines[future] = start_time + self.timeouts.get(name, 5.0)
+
+        pending = set(futures)
+        while pending:
+            next_deadline = min(deadlines[f] for f in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.perf_counter()),
+                           return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                addresses, elapsed, error = future.result()
+                result.timings[name] = elapsed
+                if error is not None:
+                    result.errors[name] = error
+                    print(f"❌ {name} 扫描失败: {error}")
+                    continue
+                result.by_backend[name] = addresses
+                merged.extend(addresses)
+                print(f"✅ {name} 扫描完成，发现 {len(addresses)} 个地址，耗时 {elapsed:.0f}ms")
+                if on_partial:
+                    on_partial(name, sort_addresses(merged))
+
+            # 超过各自超时的扫描直接放弃，不再等待
+            for future in [f for f in pending if now >= deadlines[f]]:
+                pending.discard(future)
+                name = futures[future]
+                result.timed_out.append(name)
+                result.timings[name] = (now - start_time) * 1000
+                print(f"⚠️ {name} 扫描超时（{self.timeouts.get(name, 5.0)}s），已跳过")
+
+        # 不等待超时的扫描线程结束
+        executor.shutdown(wait=False)
+
+        result.addresses = sort_addresses(merged)
+        result.total_time = (time.perf_counter() - start_time) * 1000
+        print(f"📡 设备发现完成，共 {len(result.addresses)} 个地址，{result.format_timings()}")
+        return result
+
+    @staticmethod
+    def _run_backend(backend, context):
+        start_time = time.perf_counter()
+        try:
+            addresses = backend(context)
+            return addresses, (time.perf_counter() - start_time) * 1000, None
+        except Exception as e:
+            return [], (time.perf_counter() - start_time) * 1000, str(e)
@@ -0,0 +1,91 @@
+"""
+设备发现结果缓存
+保存最近一次设备发现的地址列表和 *IDN? 识别结果，持久化到配置文件旁的JSON文件，
+在有效期内供所有地址下拉框共用，避免每个下拉框各自重新扫描
+"""
+import json
+import os
+import threading
+import time
+
+from config_store import atomic_write
+from instrument_identifier import InstrumentIdentity
+
+DISCOVERY_CACHE_FILENAME = "Device Discovery Cache.json"
+DEFAULT_TTL = 300   # 缓存有效期（秒），超过后仍可使用，但应在后台重新检测
+
+
+def get_discovery_cache_path(config_path):
+    """发现缓存文件与 System Information.json 放在同一目录"""
+    return os.path.join(os.path.dirname(config_path), DISCOVERY_CACHE_FILENAME)
+
+
+class DiscoveryCache:
+    """线程安全的设备发现结果缓存"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry = self._load()
+
+    def get(self):
+        """返回 (地址列表, {地址: InstrumentIdentity})，没有缓存时返回None（过期的缓存同样返回）"""
+        with self._lock:
+            entry = self._entry
+        if entry is None:
+            return None
+        identities = {address: InstrumentIdentity(address, idn=idn)
+                      for address, idn in entry["identities"].items()}
+        return list(entry["addresses"]), identities
+
+    def get_age(self):
+        """缓存已保存的秒数，没有缓存时返回None"""
+        with self._lock:
+            if self._entry is None:
+                return None
+            return max(0.0, time.time() - self._entry["timestamp"])
+
+    def is_stale(self):
+        """没有缓存或缓存超过有效期"""
+        age = self.get_age()
+        return age is None or age > self.ttl
+
+    def store(self, addresses, identities):
+        """保存一次发现结果并写入文件（只保存有应答的识别结果）"""
+        entry = {
+            "timestamp": time.time(),
+            "addresses": list(addresses),
+            "identities": {address: identity.idn for address, identity in identities.items()
+                           if identity.idn},
+        }
+        with self._lock:
+            self._entry = entry
+            self._save(entry)
+
+    def invalidate(self):
+        """清除缓存（下次获取地址时重新检测）"""
+        with self._lock:
+            self._entry = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if not isinstance(entry.get("addresses"), list):
+                return None
+            entry.setdefault("identities", {})
+            entry.setdefault("timestamp", 0)
+            return entry
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _save(self, entry):
+        try:
+            atomic_write(self.path, json.dumps(entry, ensure_ascii=False, indent=4))
+        except OSError as e:
+            print(f"⚠️ 保存设备发现缓存失败: {e}")
@@ -0,0 +1,121 @@
+"""
+系统启用状态检查
+启用状态缓存在本地文件中（带有效期和校验值，手工修改后失效），启动时不再等待数据库：
+缓存有效且为"启用"时直接显示界面，同时在后台查询数据库刷新缓存；
+否则界面照常创建，等数据库查询结果决定是否放行，断网时使用过期的"启用"缓存
+"""
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+
+from config_store import atomic_write
+
+ENABLED_STATUS = "启用"
+ENABLE_CACHE_FILENAME = "System Enable Cache.json"
+DEFAULT_TTL = 3 * 24 * 3600     # 缓存有效期（秒），过期后必须等数据库查询结果
+
+# 放行决定
+GATE_ALLOWED = "allowed"
+GATE_BLOCKED = "blocked"
+
+# 校验值的密钥与本机绑定，缓存文件复制到其他电脑后无效
+_SIGNING_KEY = hashlib.sha256(f"power-test-enable:{uuid.getnode()}".encode('utf-8')).digest()
+
+
+def get_enable_cache_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), ENABLE_CACHE_FILENAME)
+
+
+def _sign(version, status, timestamp):
+    payload = json.dumps([version, status, timestamp], ensure_ascii=False).encode('utf-8')
+    return hmac.new(_SIGNING_KEY, payload, hashlib.sha256).hexdigest()
+
+
+class EnableStatusCache:
+    """本地缓存的启用状态（按版本保存，校验失败或版本不符时视为没有缓存）"""
+
+    def __init__(self, version, path=None, ttl=DEFAULT_TTL):
+        self.version = version
+        self.path = path or get_enable_cache_path()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self):
+        """返回 (状态, 查询时间)，没有有效缓存时返回None（过期的缓存同样返回）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            version, status = entry["version"], entry["status"]
+            timestamp, signature = entry["timestamp"], entry["signature"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if version != self.version:
+            return None
+        if not hmac.compare_digest(str(signature), _sign(version, status, timestamp)):
+            print("⚠️ 启用状态缓存校验失败，已忽略")
+            return None
+        return status, timestamp
+
+    def is_fresh(self, timestamp):
+        age = time.time() - timestamp
+        return 0 <= age <= self.ttl
+
+    def store(self, status):
+        """保存数据库查询到的状态"""
+        timestamp = time.time()
+        entry = {
+            "version": self.version,
+            "status": status,
+            "timestamp": timestamp,
+            "signature": _sign(self.version, status, timestamp),
+        }
+        with self._lock:
+            try:
+                atomic_write(self.path, json.dumps(entry, ensure_ascii=False, indent=4))
+            except OSError as e:
+                print(f"⚠️ 保存启用状态缓存失败: {e}")
+
+
+class EnableGate:
+    """启动时的启用检查
+
+    check_cached() 在主线程立即给出结论（可能为None，表示需要等数据库）；
+    check_live() 在后台线程查询数据库并刷新缓存；decide(live_status) 给出最终结论。
+    """
+
+    def __init__(self, query_status, cache):
+        self.query_status = query_status    # 查询数据库的函数：返回状态（没有记录时None），连不上时抛出异常
+        self.cache = cache
+        self.cached = cache.get()
+
+    def check_cached(self):
+        """缓存有效且为启用时返回GATE_ALLOWED，否则返回None"""
+        if self.cached is not None:
+            status, timestamp = self.cached
+            if status == ENABLED_STATUS and self.cache.is_fresh(timestamp):
+                return GATE_ALLOWED
+        return None
+
+    def check_live(self):
+        """查询数据库（在后台线程执行）：返回 (True, 状态)；连接失败时返回 (False, 异常)"""
+        try:
+            status = self.query_status()
+        except Exception as e:
+            print(f"⚠️ 查询系统启用状态失败，使用本地缓存: {e}")
+            return False, e
+        self.cache.store(status)
+        return True, status
+
+    def decide(self, live_result):
+        """根据数据库查询结果给出结论：数据库可达时以数据库为准，
+        不可达时只要本机曾经查询到过"启用"（即使已过期）就放行"""
+        reachable, status = live_result
+        if reachable:
+            return GATE_ALLOWED if status == ENABLED_STATUS else GATE_BLOCKED
+        if self.cached is not None and self.cached[0] == ENABLED_STATUS:
+            return GATE_ALLOWED
+        return GATE_BLOCKED
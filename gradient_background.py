@@ -0,0 +1,110 @@
+"""
+渐变背景渲染
+渐变（含网格线）按尺寸档位预先渲染成一张PhotoImage，保存在小型LRU缓存中；
+窗口缩放时只需替换画布上的一个图片项目，任何窗口尺寸（包括4K最大化）都显示完整渐变
+"""
+import tkinter as tk
+from collections import OrderedDict
+
+import gradient_engine
+
+DEFAULT_TOP_COLOR = "#6699CC"
+DEFAULT_BOTTOM_COLOR = "#B8D4F0"
+DEFAULT_GRID_COLOR = "#A8C5E8"
+DEFAULT_GRID_SIZE = 160     # 网格线间距（像素），0表示不画网格
+SIZE_BUCKET = 64            # 尺寸按该值向上取整，同一档位内缩放不重新渲染
+CACHE_SIZE = 4              # 缓存的图片数
+
+
+def _parse_color(color):
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def gradient_colors(top_color, bottom_color, count):
+    """从top_color到bottom_color的count个颜色（#rrggbb）"""
+    r1, g1, b1 = _parse_color(top_color)
+    r2, g2, b2 = _parse_color(bottom_color)
+    colors = []
+    for i in range(count):
+        ratio = i / max(1, count - 1)
+        r = int(r1 + (r2 - r1) * ratio)
+        g = int(g1 + (g2 - g1) * ratio)
+        b = int(b1 + (b2 - b1) * ratio)
+        colors.append(f"#{r:02x}{g:02x}{b:02x}")
+    return colors
+
+
+def _bucket(size):
+    return max(SIZE_BUCKET, -(-size // SIZE_BUCKET) * SIZE_BUCKET)
+
+
+class GradientBackground:
+    """画布上的垂直渐变背景（一个tags为bg的图片项目，位于最底层）"""
+
+    def __init__(self, canvas, top_color=DEFAULT_TOP_COLOR, bottom_color=DEFAULT_BOTTOM_COLOR,
+                 grid_color=DEFAULT_GRID_COLOR, grid_size=DEFAULT_GRID_SIZE,
+                 cache_size=CACHE_SIZE, tags="bg", segments=None, light=0):
+        self.canvas = canvas
+        # 指定segments（分段渐变曲线，见gradient_engine）时用NumPy渐变引擎生成，可带水平光效；
+        # 未安装NumPy时退回top_color到bottom_color的线性渐变
+        self.segments = segments
+        self.light = light
+        self.top_color = top_color
+        self.bottom_color = bottom_color
+        self.grid_color = grid_color
+        self.grid_size = grid_size
+        self.cache_size = cache_size
+        self.tags = tags
+        self._cache = OrderedDict()     # (档位宽, 档位高) -> PhotoImage
+        self._item = None
+        self._image = None              # 当前显示的图片（被LRU淘汰后仍需保留引用）
+        self.render_count = 0
+
+    def render(self, width, height):
+        """显示覆盖 width x height 的背景，返回使用的图片"""
+        image = self.get_image(width, height)
+        if self._item is None or not self.canvas.find_withtag(self._item):
+            self._item = self.canvas.create_image(0, 0, image=image, anchor='nw', tags=self.tags)
+            self.canvas.tag_lower(self._item)
+        elif image is not self._image:
+            self.canvas.itemconfig(self._item, image=image)
+        self._image = image
+        return image
+
+    def get_image(self, width, height):
+        """返回该尺寸档位的背景图片（不在缓存中时渲染）"""
+        key = (_bucket(width), _bucket(height))
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            return image
+        image = self._render_image(*key)
+        self._cache[key] = image
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return image
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _render_image(self, width, height):
+        """生成渐变图片，网格线用矩形填充画上
+
+        线性渐变先生成1像素宽的渐变列，再横向放大到目标宽度。
+        """
+        self.render_count += 1
+        if self.segments is not None and gradient_engine.available():
+            image = gradient_engine.photo_image(self.canvas, width, height,
+                                                segments=self.segments, light=self.light)
+        else:
+            column = tk.PhotoImage(master=self.canvas, width=1, height=height)
+            column.put(' '.join('{%s}' % color for color in
+                                gradient_colors(self.top_color, self.bottom_color, height)))
+            image = column.zoom(width, 1)
+        if self.grid_size:
+            for x in range(0, width, self.grid_size):
+                image.put(self.grid_color, to=(x, 0, x + 1, height))
+            for y in range(0, height, self.grid_size):
+                image.put(self.grid_color, to=(0, y, width, y + 1))
+        return image
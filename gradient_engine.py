@@ -0,0 +1,136 @@
+"""
+渐变图片生成引擎
+用NumPy数组一次计算整张图片：垂直方向为分段渐变曲线，水平方向为中间亮、两侧暗的光效，
+直接输出PNG/PPM字节（不需要PIL），任意分辨率和DPI都可以在界面运行时生成
+"""
+import struct
+import time
+import zlib
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# 分段渐变：(起始比例, 结束比例, 起始颜色, 结束颜色, 曲线系数, 曲线指数)
+# 段内颜色 = 起始颜色 + (结束颜色 - 起始颜色) * 系数 * 段内比例 ** 指数
+THREE_SEGMENT_CURVE = (
+    (0.0, 0.3, (160, 220, 255), (100, 180, 240), 0.5, 2),   # 顶部：浅天空蓝到中蓝
+    (0.3, 0.7, (100, 180, 240), (60, 120, 200), 1.0, 2),    # 中部：中蓝到深蓝
+    (0.7, 1.0, (60, 120, 200), (20, 40, 80), 1.5, 2),       # 底部：深蓝到深海蓝
+)
+DEFAULT_LIGHT = 0.05    # 水平光效强度：中间比两侧亮5%
+DEFAULT_DPI = 96        # scale为1时对应的屏幕DPI
+
+
+def linear_segments(start_color, end_color, factor=1.0, exponent=1):
+    """只有一段的渐变曲线"""
+    return ((0.0, 1.0, tuple(start_color), tuple(end_color), factor, exponent),)
+
+
+def _span(start, end):
+    """段长度，按十进制比例取整：0.7 - 0.3 的浮点结果是 0.39999999999999997，
+    直接用它做除数会让个别行的颜色在截断为整数时与按 0.4 计算的结果差1"""
+    return round(end - start, 12)
+
+
+def available():
+    """是否安装了NumPy"""
+    return np.available()
+
+
+def render_gradient(width, height, segments=THREE_SEGMENT_CURVE, light=DEFAULT_LIGHT):
+    """返回 height x width x 3 的uint8数组"""
+    if width <= 0 or height <= 0:
+        raise ValueError(f"图片尺寸无效: {width}x{height}")
+
+    # 每一行的颜色（与逐像素计算时一样先截断为整数）
+    ratio = np.arange(height, dtype=np.float64) / height
+    rows = np.zeros((height, 3), dtype=np.float64)
+    for index, (start, end, start_color, end_color, factor, exponent) in enumerate(segments):
+        last = index == len(segments) - 1
+        mask = (ratio >= start) & ((ratio <= end) if last else (ratio < end))
+        local = (ratio[mask] - start) / _span(start, end)
+        smooth = factor * local ** exponent
+        start_color = np.asarray(start_color, dtype=np.float64)
+        end_color = np.asarray(end_color, dtype=np.float64)
+        rows[mask] = start_color + (end_color - start_color) * smooth[:, None]
+    rows = np.trunc(rows)
+
+    if not light:
+        pixels = np.clip(rows, 0, 255).astype(np.uint8)
+        return np.broadcast_to(pixels[:, None, :], (height, width, 3))
+
+    # 每一列的亮度系数；颜色分量只有256种取值，先算出 分量值 x 列 的查找表再按行取出，
+    # 避免对 height x width x 3 个像素做浮点运算
+    half = width / 2
+    columns = 1.0 + light * (1 - np.abs(np.arange(width, dtype=np.float64) - half) / half)
+    values = np.arange(256, dtype=np.float64)
+    table = np.clip(np.trunc(values[:, None] * columns[None, :]), 0, 255).astype(np.uint8)
+    channels = np.clip(rows, 0, 255).astype(np.intp)           # height x 3
+    return np.ascontiguousarray(table[channels].transpose(0, 2, 1))
+
+
+def to_ppm(pixels):
+    """编码为二进制PPM（P6），Tk的PhotoImage可以直接读取"""
+    height, width = pixels.shape[:2]
+    return b"P6\n%d %d\n255\n" % (width, height) + np.ascontiguousarray(pixels).tobytes()
+
+
+def _png_chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+
+def to_png(pixels, dpi=None, compress_level=6):
+    """编码为PNG（RGB 8位）；指定dpi时写入pHYs块"""
+    height, width = pixels.shape[:2]
+    # 每行前加一个字节的过滤类型0
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = np.ascontiguousarray(pixels).reshape(height, width * 3)
+    png = b"\x89PNG\r\n\x1a\n"
+    png += _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    if dpi:
+        pixels_per_meter = int(round(dpi / 0.0254))
+        png += _png_chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+    png += _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level))
+    png += _png_chunk(b"IEND", b"")
+    return png
+
+
+def gradient_bytes(width, height, fmt="png", dpi=DEFAULT_DPI, scale=None, **options):
+    """生成渐变图片字节
+
+    width/height为96 DPI下的尺寸，按 scale（默认 dpi/96）放大到实际像素；
+    fmt为"png"或"ppm"，options传给render_gradient（segments、light）。
+    """
+    scale = dpi / DEFAULT_DPI if scale is None else scale
+    pixels = render_gradient(max(1, round(width * scale)), max(1, round(height * scale)), **options)
+    if fmt == "png":
+        return to_png(pixels, dpi=dpi)
+    if fmt == "ppm":
+        return to_ppm(pixels)
+    raise ValueError(f"不支持的图片格式: {fmt}")
+
+
+def save_gradient(path, width, height, **options):
+    """生成渐变图片并保存（按扩展名选择PNG或PPM）"""
+    fmt = "ppm" if path.lower().endswith(".ppm") else "png"
+    data = gradient_bytes(width, height, fmt=fmt, **options)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def photo_image(master, width, height, **options):
+    """直接生成Tk的PhotoImage（width/height为实际像素，不经过文件）"""
+    import tkinter as tk
+    return tk.PhotoImage(master=master, data=to_ppm(render_gradient(width, height, **options)),
+                         format="ppm")
+
+
+if __name__ == "__main__":
+    for size in ((1200, 800), (1920, 1080), (3840, 2160)):
+        start_time = time.perf_counter()
+        data = gradient_bytes(*size, fmt="png", scale=1)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        print(f"{size[0]}x{size[1]}: {elapsed:.0f} ms，PNG {len(data) // 1024} KB")
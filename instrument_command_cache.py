@@ -0,0 +1,221 @@
+"""
+仪器指令本地缓存
+将 tb_instrument_command 镜像到本地SQLite文件，启动时直接读取本地数据，
+再在后台按 更新时间 水位线从MySQL增量同步；增量同步看不到数据库中删除的记录，
+因此每隔 FULL_SYNC_INTERVAL 做一次全量核对
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from ConnectDatabase import ReadDataBase
+
+# 默认缓存文件放在程序目录下
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "instrument_command_cache.db")
+
+# 与 ReadDataBase.query_instrument_commands 返回的字典字段保持一致
+COMMAND_FIELDS = ('device_type', 'device_model', 'function_type',
+                  'command', 'params_reminder', 'update_time')
+
+# 两次全量核对之间的最长间隔（秒），数据库中删除的记录最迟在这之后从缓存中消失
+FULL_SYNC_INTERVAL = 30 * 60
+
+
+class InstrumentCommandCache:
+    """tb_instrument_command 的本地只读镜像"""
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, db_factory=ReadDataBase):
+        self.cache_path = cache_path
+        self.db_factory = db_factory
+        self.version = 0                 # 每次同步到新数据后递增，供界面判断是否需要刷新
+        self._lock = threading.Lock()    # 串行化对SQLite文件的访问
+        self._sync_lock = threading.Lock()
+        self._listeners = []
+        self._init_schema()
+
+    def _connect(self):
+        # 每次操作使用独立连接，避免跨线程共享sqlite3连接
+        return sqlite3.connect(self.cache_path, timeout=5)
+
+    def _init_schema(self):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS instrument_command (
+                        device_type TEXT NOT NULL,
+                        device_model TEXT NOT NULL,
+                        function_type TEXT NOT NULL,
+                        command TEXT,
+                        params_reminder TEXT,
+                        update_time TEXT,
+                        PRIMARY KEY (device_type, device_model, function_type)
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_all(self):
+        """读取本地缓存中的全部指令，按更新时间倒序（与数据库查询顺序一致）"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute("""
+                    SELECT device_type, device_model, function_type,
+                           command, params_reminder, update_time
+                    FROM instrument_command
+                    ORDER BY update_time DESC
+                """).fetchall()
+            finally:
+                conn.close()
+        return [dict(zip(COMMAND_FIELDS, row)) for row in rows]
+
+    def _get_state(self, key):
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row and row[0] else None
+
+    def get_watermark(self):
+        """获取已同步数据的最大更新时间，缓存为空时返回None"""
+        return self._get_state('watermark')
+
+    def full_sync_due(self):
+        """距上次全量核对是否已超过FULL_SYNC_INTERVAL（从未全量同步过时为True）"""
+        last_full_sync = self._get_state('full_sync_time')
+        return last_full_sync is None or time.time() - float(last_full_sync) >= FULL_SYNC_INTERVAL
+
+    def sync(self, full=False):
+        """从MySQL同步数据到本地，返回实际变更的记录数
+
+        缓存为空、full=True或距上次全量核对超过FULL_SYNC_INTERVAL时全量拉取，
+        并删除数据库中已不存在的记录（包括数据库表被清空的情况）；否则只拉取
+        更新时间不早于水位线的记录，这时数据库中删除的记录要等下次全量核对才会从缓存中删除。
+        数据库连接或查询失败时抛出ConnectionError，缓存保持不变。
+        多个调用方同时请求同步时只执行一次，其余调用等待其完成后返回0
+        （新数据会通过监听器通知所有调用方）。
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            with self._sync_lock:
+                pass
+            return 0
+
+        try:
+            watermark = None if full or self.full_sync_due() else self.get_watermark()
+            commands = self.db_factory().query_instrument_commands(watermark)
+            changed = self._upsert(commands, replace_all=watermark is None)
+            if changed:
+                self.version += 1
+            print(f"🗄️ 仪器指令缓存同步完成: 水位线 {watermark or '无'}，拉取 {len(commands)} 条，变更 {changed} 条")
+        finally:
+            self._sync_lock.release()
+
+        if changed:
+            for listener in list(self._listeners):
+                try:
+                    listener(self)
+                except Exception as e:
+                    print(f"❌ 仪器指令缓存监听器执行失败: {e}")
+        return changed
+
+    def add_listener(self, callback):
+        """注册同步到新数据后的回调（在同步线程中调用，界面需自行切回主线程）"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _upsert(self, commands, replace_all=False):
+        """按(仪器分类, 仪器型号, 功能分类)写入记录并推进水位线，返回实际变更的行数
+
+        replace_all为True时commands是数据库中的全部记录，缓存中其余的记录被删除。
+        """
+        if not commands and not replace_all:
+            return 0
+
+        rows = []
+        watermark = None
+        for cmd in commands:
+            update_time = cmd.get('update_time') or ""
+            rows.append((
+                cmd.get('device_type') or "",
+                cmd.get('device_model') or "",
+                cmd.get('function_type') or "",
+                cmd.get('command'),
+                cmd.get('params_reminder'),
+                update_time,
+            ))
+            if update_time and (watermark is None or update_time > watermark):
+                watermark = update_time
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                # 重复拉到的记录（增量同步水位线那一秒的记录、全量同步的全部记录）
+                # 内容未变化时不写入，也不计入变更
+                conn.executemany("""
+                    INSERT INTO instrument_command
+                    (device_type, device_model, function_type, command, params_reminder, update_time)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(device_type, device_model, function_type) DO UPDATE SET
+                        command = excluded.command,
+                        params_reminder = excluded.params_reminder,
+                        update_time = excluded.update_time
+                    WHERE command IS NOT excluded.command
+                       OR params_reminder IS NOT excluded.params_reminder
+                       OR update_time IS NOT excluded.update_time
+                """, rows)
+                if replace_all:
+                    # 全量同步时以数据库为准，只删除数据库中已不存在的记录
+                    existing = set(conn.execute(
+                        "SELECT device_type, device_model, function_type FROM instrument_command"))
+                    stale = existing - {row[:3] for row in rows}
+                    conn.executemany("""
+                        DELETE FROM instrument_command
+                        WHERE device_type = ? AND device_model = ? AND function_type = ?
+                    """, stale)
+                changed = conn.total_changes
+                if replace_all:
+                    conn.execute("""
+                        INSERT INTO sync_state (key, value) VALUES ('full_sync_time', ?)
+                        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                    """, (str(time.time()),))
+                if watermark:
+                    conn.execute("""
+                        INSERT INTO sync_state (key, value) VALUES ('watermark', ?)
+                        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                        WHERE excluded.value > sync_state.value
+                    """, (watermark,))
+                conn.commit()
+            finally:
+                conn.close()
+        return changed
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_instrument_command_cache():
+    """获取进程内共享的仪器指令缓存，所有选项卡读取同一份数据"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = InstrumentCommandCache()
+    return _shared_cache
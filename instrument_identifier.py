@@ -0,0 +1,199 @@
+"""
+仪器识别
+对发现的地址并发发送 *IDN? 查询，解析厂商/型号，并按型号规则把仪器分配到
+设备角色（oscilloscope / ac_source / electronic_load / control_box）
+"""
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_IDN_TIMEOUT = 1.0     # 单个地址的查询超时（秒）
+DEFAULT_MAX_WORKERS = 16      # 同时查询的地址数
+DEFAULT_SOCKET_PORT = 5025    # 未安装PyVISA时TCPIP地址改用的SCPI Socket端口
+
+# 只有这些类型的地址会发送 *IDN?（COM/LPT需要另行配置波特率等，不参与识别）
+IDENTIFIABLE_PREFIXES = ('TCPIP', 'GPIB', 'USB')
+
+# 角色识别规则：(厂商正则, 型号正则)，按顺序匹配，厂商/型号均不区分大小写
+ROLE_RULES = {
+    "oscilloscope": [
+        (r"TEKTRONIX", r"^(MSO|DPO|MDO|TDS|TBS)"),
+        (r"KEYSIGHT|AGILENT", r"^(DSO|MSO|EXR|UXR|DSOX)"),
+        # DS/MSO/DHO后面跟系列号；DSG信号源、DSA频谱仪不属于示波器
+        (r"RIGOL", r"^(DS|MSO|DHO)[0-9]"),
+        (r"SIGLENT", r"^SDS"),
+        (r"LECROY|TELEDYNE", r"^(WAVE ?(SURFER|RUNNER|PRO|MASTER|ACE|JET)|WS[0-9]|WR[0-9]|WP[0-9]|WM[0-9]"
+                             r"|HDO[0-9]|MDA[0-9]|SDA|DDA|LABMASTER|T3DSO)"),
+        (r"", r"OSCILLOSCOPE"),
+    ],
+    "ac_source": [
+        (r"CHROMA", r"^61[0-9]{3}"),
+        (r"KEYSIGHT|AGILENT", r"^(AC6[0-9]{3}|6[89][0-9]{2})"),
+        (r"KIKUSUI", r"^PCR"),
+        (r"PACIFIC", r""),
+        (r"ITECH", r"^IT7[0-9]{3}"),
+        (r"", r"AC ?SOURCE"),
+    ],
+    "electronic_load": [
+        (r"CHROMA", r"^63[0-9]{3}"),
+        (r"KEYSIGHT|AGILENT", r"^(N33[0-9]{2}|EL3[0-9]{4})"),
+        (r"ITECH", r"^IT8[0-9]{3}"),
+        (r"KIKUSUI", r"^PLZ"),
+        (r"RIGOL", r"^DL3"),
+        (r"TELEDYNE|LECROY", r"^T3EL"),
+        (r"", r"LOAD"),
+    ],
+    "control_box": [
+        (r"KEYSIGHT|AGILENT", r"^(34970|34972|DAQ970|34980)"),
+        (r"", r"CONTROL|RELAY|SWITCH"),
+    ],
+}
+
+_COMPILED_RULES = {
+    role: [(re.compile(vendor, re.IGNORECASE), re.compile(model, re.IGNORECASE))
+           for vendor, model in rules]
+    for role, rules in ROLE_RULES.items()
+}
+
+
+class InstrumentIdentity:
+    """一个地址的识别结果"""
+
+    def __init__(self, address, idn=None, error=None, elapsed=0.0):
+        self.address = address
+        self.idn = idn              # *IDN? 原始响应
+        self.error = error          # 查询失败时的错误信息
+        self.elapsed = elapsed      # 查询耗时（毫秒）
+        fields = parse_idn(idn) if idn else {}
+        self.manufacturer = fields.get("manufacturer", "")
+        self.model = fields.get("model", "")
+        self.serial = fields.get("serial", "")
+        self.firmware = fields.get("firmware", "")
+        self.role = classify_instrument(self.manufacturer, self.model) if idn else None
+
+    def describe(self):
+        if self.error:
+            return f"{self.address}: 无响应（{self.error}）"
+        return f"{self.address}: {self.manufacturer} {self.model} -> {self.role or '未知角色'}"
+
+
+def parse_idn(response):
+    """解析 *IDN? 响应 "厂商,型号,序列号,固件版本" """
+    parts = [part.strip() for part in response.strip().split(',')]
+    parts += [""] * (4 - len(parts))
+    return {
+        "manufacturer": parts[0],
+        "model": parts[1],
+        "serial": parts[2],
+        "firmware": ','.join(parts[3:]).strip(','),
+    }
+
+
+def classify_instrument(manufacturer, model):
+    """按ROLE_RULES判断仪器角色，无法判断时返回None"""
+    for role, rules in _COMPILED_RULES.items():
+        for vendor_pattern, model_pattern in rules:
+            if vendor_pattern.search(manufacturer) and model_pattern.search(model):
+                return role
+    return None
+
+
+def _query_idn_socket(ip_address, port, timeout):
+    with socket.create_connection((ip_address, port), timeout=timeout) as sock:
+        sock.settimeout(timeout)
+        sock.sendall(b"*IDN?\n")
+        data = bytearray()
+        deadline = time.perf_counter() + timeout
+        while b'\n' not in data:
+            if time.perf_counter() > deadline:
+                raise socket.timeout("读取 *IDN? 响应超时")
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data.extend(chunk)
+    return data.split(b'\n', 1)[0].decode('utf-8', errors='replace').strip()
+
+
+class _VisaQuerier:
+    """一次识别过程中共享的VISA资源管理器（懒创建，未安装PyVISA时抛出ImportError）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resource_manager = None
+
+    def query(self, address, timeout):
+        with self._lock:
+            if self._resource_manager is None:
+                import pyvisa
+                self._resource_manager = pyvisa.ResourceManager()
+            resource_manager = self._resource_manager
+        session = resource_manager.open_resource(address)
+        try:
+            session.timeout = int(timeout * 1000)
+            return session.query("*IDN?").strip()
+        finally:
+            session.close()
+
+    def close(self):
+        if self._resource_manager is not None:
+            try:
+                self._resource_manager.close()
+            except Exception:
+                pass
+
+
+def _query_idn(address, timeout, visa):
+    """查询一个地址的 *IDN?：::SOCKET 地址直接走Socket，其余走VISA，
+    未安装PyVISA时TCPIP地址退回到5025端口的Socket查询"""
+    match = re.match(r'TCPIP\d*::([^:]+)::(\d+)::SOCKET$', address)
+    if match:
+        return _query_idn_socket(match.group(1), int(match.group(2)), timeout)
+    try:
+        return visa.query(address, timeout)
+    except ImportError:
+        match = re.match(r'TCPIP\d*::([^:]+)::', address)
+        if not match:
+            raise
+        return _query_idn_socket(match.group(1), DEFAULT_SOCKET_PORT, timeout)
+
+
+def is_identifiable(address):
+    return isinstance(address, str) and address.startswith(IDENTIFIABLE_PREFIXES)
+
+
+def identify_instruments(addresses, timeout=DEFAULT_IDN_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS):
+    """并发查询一组地址的 *IDN?，返回 {地址: InstrumentIdentity}（应在后台线程中调用）"""
+    addresses = [addr for addr in dict.fromkeys(addresses) if is_identifiable(addr)]
+    if not addresses:
+        return {}
+
+    visa = _VisaQuerier()
+
+    def identify(address):
+        start_time = time.perf_counter()
+        try:
+            idn = _query_idn(address, timeout, visa)
+            return InstrumentIdentity(address, idn=idn,
+                                      elapsed=(time.perf_counter() - start_time) * 1000)
+        except Exception as e:
+            return InstrumentIdentity(address, error=str(e) or type(e).__name__,
+                                      elapsed=(time.perf_counter() - start_time) * 1000)
+
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(addresses)),
+                                thread_name_prefix="idn-query") as executor:
+            identities = dict(zip(addresses, executor.map(identify, addresses)))
+    finally:
+        visa.close()
+
+    elapsed = (time.perf_counter() - start_time) * 1000
+    answered = sum(1 for identity in identities.values() if identity.idn)
+    print(f"🔎 仪器识别完成: 查询 {len(identities)} 个地址，{answered} 个应答，耗时 {elapsed:.0f}ms")
+    for identity in identities.values():
+        if identity.idn:
+            print(f"   {identity.describe()}")
+    return identities
+
@@ -0,0 +1,146 @@
+"""
+按钮形状缓存与状态切换
+相同尺寸的按钮共用一份顶点坐标（按 宽、高、圆角半径、倾斜度 缓存）；
+按钮的图形只在创建时画一次，悬停/激活等状态变化只用itemconfig修改颜色
+"""
+import math
+from functools import lru_cache
+
+CORNER_STEP = 5     # 圆角每隔多少度取一个顶点（须能整除90）
+
+
+@lru_cache(maxsize=8)
+def _arc(step):
+    """0~360度每隔step度的 (cos, sin)"""
+    return tuple((math.cos(math.radians(i)), math.sin(math.radians(i)))
+                 for i in range(0, 360, step))
+
+
+@lru_cache(maxsize=128)
+def rounded_rect_points(width, height, radius, offset_x=0, offset_y=0, step=CORNER_STEP):
+    """圆角矩形的多边形顶点（半径不超过宽高的一半）"""
+    x1, y1 = offset_x, offset_y
+    x2, y2 = offset_x + width, offset_y + height
+    radius = min(radius, width // 2, height // 2)
+    # 四个圆角的圆心：右上、右下、左下、左上（按角度0~90、90~180、180~270、270~360）
+    centers = ((x2 - radius, y1 + radius), (x2 - radius, y2 - radius),
+               (x1 + radius, y2 - radius), (x1 + radius, y1 + radius))
+    per_corner = 90 // step
+    points = []
+    for index, (cos, sin) in enumerate(_arc(step)):
+        cx, cy = centers[index // per_corner]
+        points.extend((cx + radius * cos, cy - radius * sin))
+    return tuple(points)
+
+
+@lru_cache(maxsize=128)
+def parallelogram_points(width, height, skew, offset_x=0, offset_y=0):
+    """向右倾斜的平行四边形顶点：左上、右上、右下、左下"""
+    return (offset_x + skew, offset_y,
+            offset_x + width + skew, offset_y,
+            offset_x + width, offset_y + height,
+            offset_x, offset_y + height)
+
+
+@lru_cache(maxsize=128)
+def corner_ovals(width, height, skew, radius):
+    """平行四边形四个角上模拟圆角的小圆（外接矩形）"""
+    half = radius // 2
+    points = parallelogram_points(width, height, skew)
+    return tuple((x - half, y - half, x + half, y + half)
+                 for x, y in zip(points[::2], points[1::2]))
+
+
+def cache_info():
+    """各几何缓存的命中情况"""
+    return {
+        "rounded_rect_points": rounded_rect_points.cache_info(),
+        "parallelogram_points": parallelogram_points.cache_info(),
+        "corner_ovals": corner_ovals.cache_info(),
+    }
+
+
+class ButtonStateMixin:
+    """画布按钮的状态切换（normal / hover / active）
+
+    子类在画出图形后设置：
+    self.fill_items —— 填充色随状态变化的项目
+    self.solid_items —— 填充色和轮廓色都随状态变化的项目
+    self.text_id —— 文字项目（文字颜色随状态变化）
+    """
+
+    def state_colors(self, state=None):
+        """返回 (填充色, 文字颜色)"""
+        state = state or self.state
+        if state == 'active':
+            return self.active_bg, self.active_fg
+        if state == 'hover':
+            return self.hover_bg, self.hover_fg
+        return self.bg_color, self.fg_color
+
+    def apply_state(self):
+        """按当前状态修改已有图形的颜色（修改了颜色属性后也可以直接调用）"""
+        fill_color, text_color = self.state_colors()
+        for item in self.fill_items:
+            self.canvas.itemconfig(item, fill=fill_color)
+        for item in self.solid_items:
+            self.canvas.itemconfig(item, fill=fill_color, outline=fill_color)
+        if self.text_id:
+            self.canvas.itemconfig(self.text_id, fill=text_color)
+
+    def set_state(self, state):
+        """切换状态，状态没有变化时不做任何事；返回是否变化"""
+        if state == self.state:
+            return False
+        self.state = state
+        self.apply_state()
+        return True
+
+    def set_text(self, text):
+        self.text = text
+        if self.text_id:
+            self.canvas.itemconfig(self.text_id, text=text)
+
+    def bind_events(self):
+        """绑定事件（只在创建时绑定一次，点击画布任意位置都触发）"""
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Enter>', self.on_enter)
+        self.canvas.bind('<Leave>', self.on_leave)
+
+    def on_click(self, event):
+        """点击事件"""
+        if self.command:
+            self.command()
+
+    def on_enter(self, event):
+        """鼠标进入"""
+        if self.state != 'active':
+            self.set_state('hover')
+            self.canvas.configure(cursor='hand2')
+
+    def on_leave(self, event):
+        """鼠标离开"""
+        if self.state != 'active':
+            self.set_state('normal')
+            self.canvas.configure(cursor='')
+
+    def set_active(self, active=True):
+        """设置激活状态"""
+        self.set_state('active' if active else 'normal')
+
+    def pack(self, **kwargs):
+        """布局方法"""
+        self.canvas.pack(**kwargs)
+
+    def place(self, **kwargs):
+        """位置布局方法"""
+        self.canvas.place(**kwargs)
+
+    def grid(self, **kwargs):
+        """网格布局方法"""
+        self.canvas.grid(**kwargs)
+
+    def destroy(self):
+        """销毁按钮"""
+        if self.canvas:
+            self.canvas.destroy()
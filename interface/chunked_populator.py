@@ -0,0 +1,94 @@
+"""
+分片填充
+大量行的处理分成多个 after_idle 片段执行，每个片段只运行一小段时间（默认8ms），
+片段之间Tk可以处理鼠标键盘和重绘事件；每次开始新的填充时代号加一，旧的填充自动作废
+"""
+import itertools
+import time
+
+DEFAULT_BUDGET_MS = 8        # 每个片段的时间预算（毫秒）
+DEFAULT_CHUNK_SIZE = 200     # 每次检查耗时前处理的行数
+
+
+class ChunkedPopulator:
+    """在Tk空闲时分片消费一个可迭代对象（只能在主线程使用）"""
+
+    def __init__(self, widget, budget_ms=DEFAULT_BUDGET_MS, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.chunk_size = chunk_size
+        self.generation = 0          # 每次start/cancel加一，旧片段据此判断自己已过期
+        self._job = None
+        self._iterator = None
+        self._consume = None
+        self._on_progress = None
+        self._on_done = None
+        self._done = 0
+        self._total = None
+
+    @property
+    def running(self):
+        return self._iterator is not None
+
+    def start(self, items, consume, on_progress=None, on_done=None):
+        """开始新的填充（正在进行的填充被取消），返回本次填充的代号
+
+        consume(chunk)：处理一批元素；on_progress(done, total)：每个片段结束后回调，
+        total在items没有长度时为None；on_done(done)：全部处理完后回调。
+        """
+        self.cancel()
+        self._iterator = iter(items)
+        self._consume = consume
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._done = 0
+        try:
+            self._total = len(items)
+        except TypeError:
+            self._total = None
+        generation = self.generation
+        self._job = self.widget.after_idle(self._run_slice, generation)
+        return generation
+
+    def cancel(self):
+        """取消正在进行的填充（已处理的部分不会回滚）"""
+        self.generation += 1
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+        self._job = None
+        self._iterator = None
+        self._consume = self._on_progress = self._on_done = None
+
+    def _run_slice(self, generation):
+        if generation != self.generation or self._iterator is None:
+            return
+        self._job = None
+        deadline = time.perf_counter() + self.budget
+        finished = False
+        while True:
+            chunk = list(itertools.islice(self._iterator, self.chunk_size))
+            if chunk:
+                self._consume(chunk)
+                self._done += len(chunk)
+            if len(chunk) < self.chunk_size:
+                finished = True
+                break
+            # consume中的回调可能开始了新的填充
+            if generation != self.generation or time.perf_counter() >= deadline:
+                break
+
+        if generation != self.generation:
+            return
+        if self._on_progress:
+            self._on_progress(self._done, self._total)
+        if finished:
+            on_done, done = self._on_done, self._done
+            self._iterator = None
+            self._consume = self._on_progress = self._on_done = None
+            if on_done:
+                on_done(done)
+        else:
+            self._job = self.widget.after_idle(self._run_slice, generation)
@@ -0,0 +1,61 @@
+"""
+仪器指令内存索引
+按 仪器分类 / 仪器型号 / 功能分类 为每一列建立 值 -> 行号集合 的倒排索引，
+任意筛选组合通过集合求交得到结果，无需扫描全部数据；同时提供级联筛选选项
+"""
+
+# 表示"不筛选该列"的下拉框选项
+FILTER_ALL = "全部"
+
+# 建立索引的列
+INDEX_FIELDS = ("device_type", "device_model", "function_type")
+
+
+class CommandIndex:
+    """仪器指令的多列倒排索引（数据变化时重新创建）"""
+
+    def __init__(self, rows=(), fields=INDEX_FIELDS):
+        self.rows = list(rows)
+        self.fields = tuple(fields)
+        self._postings = {field: {} for field in self.fields}   # 列 -> 值 -> 行号集合
+        self._by_key = {}                                        # (各列值) -> 行
+        for position, row in enumerate(self.rows):
+            for field in self.fields:
+                self._postings[field].setdefault(row[field], set()).add(position)
+            self._by_key.setdefault(tuple(row[field] for field in self.fields), row)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def query(self, **criteria):
+        """返回满足所有条件的行（保持原始顺序）；值为"全部"或None的条件忽略"""
+        positions = self._match(criteria)
+        if positions is None:
+            return list(self.rows)
+        return [self.rows[position] for position in sorted(positions)]
+
+    def values(self, field, **criteria):
+        """返回满足条件的行中该列的所有非空取值（排序），用于级联筛选选项"""
+        positions = self._match(criteria)
+        postings = self._postings[field]
+        if positions is None:
+            return sorted(value for value in postings if value)
+        return sorted(value for value, rows in postings.items()
+                      if value and not rows.isdisjoint(positions))
+
+    def find(self, *key):
+        """按 (仪器分类, 仪器型号, 功能分类) 查找一行，找不到时返回None"""
+        return self._by_key.get(key)
+
+    def _match(self, criteria):
+        """求各条件行号集合的交集；没有有效条件时返回None（表示全部行）"""
+        posting_sets = []
+        for field, value in criteria.items():
+            if value is None or value == FILTER_ALL:
+                continue
+            posting_sets.append(self._postings[field].get(value, set()))
+        if not posting_sets:
+            return None
+        # 从最小的集合开始求交，减少比较次数
+        posting_sets.sort(key=len)
+        return posting_sets[0].intersection(*posting_sets[1:])
@@ -0,0 +1,116 @@
+"""
+后台数据加载服务
+数据库查询在工作线程中执行，结果放入线程安全队列，
+再由Tk主线程通过 after 定时取出并回调，避免界面在等待数据库时卡死
+"""
+import tkinter as tk
+import threading
+import queue
+import time
+
+# 表格等待后台数据时显示的占位文字
+LOADING_TEXT = "⏳ 正在加载..."
+
+
+class BackgroundDataLoader:
+    """后台数据加载服务（每个Tk根窗口共享一个实例）"""
+
+    def __init__(self, root, workers=4, poll_interval=30):
+        self.root = root
+        self.poll_interval = poll_interval  # 有任务未完成时检查结果队列的间隔（毫秒）
+        self._jobs = queue.Queue()          # 待执行的任务
+        self._results = queue.Queue()       # 待交回主线程的回调
+        self._pending = 0                   # 已提交但结果尚未交回主线程的任务数
+        self._pending_lock = threading.Lock()
+        self._pump_scheduled = False
+        self._ui_thread = threading.get_ident()  # 创建服务的线程（Tk主线程）
+
+        # 使用守护线程，程序退出时不会因为数据库超时而卡住
+        for i in range(workers):
+            worker = threading.Thread(target=self._worker_loop,
+                                      name=f"data-loader-{i}", daemon=True)
+            worker.start()
+
+    def submit(self, func, on_success=None, on_error=None, name=None):
+        """提交后台任务（只能在主线程调用）
+
+        func在工作线程中执行；on_success(result) / on_error(exception)在主线程中回调。
+        """
+        with self._pending_lock:
+            self._pending += 1
+        self._jobs.put((func, on_success, on_error, name or getattr(func, '__name__', 'job')))
+        self._schedule_pump()
+
+    def call_in_ui(self, callback, *args):
+        """从任意线程请求在主线程中执行回调（在下一次取队列时执行）"""
+        self._results.put((callback, args))
+        if threading.get_ident() == self._ui_thread:
+            self._schedule_pump()
+            return
+        # 工作线程不能直接修改轮询状态：通过after把安排轮询交给主线程执行
+        # （tkinter会把其他线程的调用转交给主线程的事件循环）
+        try:
+            self.root.after(0, self._schedule_pump)
+        except (RuntimeError, tk.TclError):
+            # 主线程不在事件循环中或窗口已销毁，回调在下一次取队列时执行
+            pass
+
+    def _worker_loop(self):
+        while True:
+            func, on_success, on_error, name = self._jobs.get()
+            start_time = time.perf_counter()
+            try:
+                result = func()
+                elapsed = (time.perf_counter() - start_time) * 1000
+                print(f"⏱️ 后台任务 {name} 完成，耗时 {elapsed:.0f} ms")
+                if on_success:
+                    self._results.put((on_success, (result,)))
+            except Exception as e:
+                print(f"❌ 后台任务 {name} 失败: {e}")
+                if on_error:
+                    self._results.put((on_error, (e,)))
+            finally:
+                self._results.put((self._job_done, ()))
+
+    def _job_done(self):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def _schedule_pump(self):
+        if self._pump_scheduled:
+            return
+        try:
+            self.root.after(self.poll_interval, self._pump)
+            self._pump_scheduled = True
+        except tk.TclError:
+            # 窗口已销毁
+            pass
+
+    def _pump(self):
+        """在主线程中取出结果并执行回调；没有未完成任务时停止轮询"""
+        self._pump_scheduled = False
+        while True:
+            try:
+                callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"❌ 后台任务回调执行失败: {e}")
+
+        with self._pending_lock:
+            has_pending = self._pending > 0
+        if has_pending or not self._results.empty():
+            self._schedule_pump()
+
+
+def get_data_loader(widget):
+    """获取控件所属根窗口共享的后台数据加载服务"""
+    root = widget._root()
+    loader = getattr(root, '_background_data_loader', None)
+    if loader is None:
+        loader = BackgroundDataLoader(root)
+        root._background_data_loader = loader
+    return loader
+
@@ -17,6 +17,8 @@ class FloatingTabFrame:
         self.tabs = []
         self.tab_frames = []
         self.tab_buttons = []
+        self.tab_factories = []     # 每个标签页内容的构建函数（None表示内容已直接放入框架）
+        self.tab_contents = []      # 构建函数的返回值（尚未构建时为None）
         
         # 创建主容器
         self.main_container = tk.Frame(parent, bg='#f5f5f5')
@@ -40,8 +42,11 @@ class FloatingTabFrame:
         self.tab_bar = tk.Frame(self.tab_bar_container, bg='#f5f5f5')
         self.tab_bar.pack(expand=True, pady=10)
     
-    def add_tab(self, text, content_frame):
-        """添加悬空标签"""
+    def add_tab(self, text, content_frame, factory=None):
+        """添加悬空标签
+
+        factory(content_frame) 在标签第一次显示时才调用，用于推迟构建标签页内容。
+        """
         tab_index = len(self.tabs)
         
         # 创建标签容器 - 固定尺寸确保按钮可见
@@ -72,16 +77,32 @@ class FloatingTabFrame:
         self.tabs.append(text)
         self.tab_buttons.append(tab_button)
         self.tab_frames.append(content_frame)
+        self.tab_factories.append(factory)
+        self.tab_contents.append(None)
         
         # 将内容框架添加到内容区域
         content_frame.pack(in_=self.content_area, fill=tk.BOTH, expand=True)
         
         # 如果是第一个标签，设为选中状态
         if tab_index == 0:
+            self.ensure_tab_built(0)
             self.switch_tab(0)
         else:
             content_frame.pack_forget()
     
+    def ensure_tab_built(self, tab_index):
+        """如果标签页内容还没有构建，现在构建，返回构建结果"""
+        factory = self.tab_factories[tab_index]
+        if factory is not None:
+            # 先清除构建函数，构建过程中再次切换到该标签时不会重复构建
+            self.tab_factories[tab_index] = None
+            self.tab_contents[tab_index] = factory(self.tab_frames[tab_index])
+            print(f"✅ 构建标签页: {self.tabs[tab_index]}")
+        return self.tab_contents[tab_index]
+    
+    def is_tab_built(self, tab_index):
+        return self.tab_factories[tab_index] is None
+    
     def switch_tab(self, tab_index):
         """切换标签"""
         if tab_index == self.current_tab:
@@ -92,7 +113,8 @@ class FloatingTabFrame:
             self.tab_frames[self.current_tab].pack_forget()
             self.tab_buttons[self.current_tab].set_active(False)
         
-        # 显示新标签内容
+        # 显示新标签内容（第一次显示时构建）
+        self.ensure_tab_built(tab_index)
         self.tab_frames[tab_index].pack(fill=tk.BOTH, expand=True)
         self.tab_buttons[tab_index].set_active(True)
         
@@ -105,12 +127,40 @@ class FloatingTabNotebook:
     def __init__(self, parent):
         self.floating_frame = FloatingTabFrame(parent)
         self.tabs = []
+        self._prewarm_job = None
     
-    def add(self, frame, text=""):
-        """添加标签页"""
-        self.floating_frame.add_tab(text, frame)
+    def add(self, frame, text="", factory=None):
+        """添加标签页；指定factory时标签页内容在第一次切换到该标签时才构建"""
+        self.floating_frame.add_tab(text, frame, factory)
         self.tabs.append((frame, text))
     
+    def get_tab_content(self, tab_index):
+        """返回标签页内容对象（尚未构建时立即构建）"""
+        return self.floating_frame.ensure_tab_built(tab_index)
+    
+    def prewarm(self, delay=500, interval=50):
+        """界面显示后在空闲时逐个构建尚未打开过的标签页
+
+        每次只构建一个标签页，两次之间间隔interval毫秒，让界面可以响应操作。
+        """
+        widget = self.floating_frame.main_container
+        
+        def build_next():
+            self._prewarm_job = None
+            frame = self.floating_frame
+            pending = [i for i in range(len(frame.tabs)) if not frame.is_tab_built(i)]
+            if not pending:
+                return
+            try:
+                frame.ensure_tab_built(pending[0])
+            except Exception as e:
+                print(f"❌ 预构建标签页 {frame.tabs[pending[0]]} 失败: {e}")
+            if len(pending) > 1:
+                self._prewarm_job = widget.after(interval, lambda: widget.after_idle(build_next))
+        
+        if self._prewarm_job is None:
+            self._prewarm_job = widget.after(delay, lambda: widget.after_idle(build_next))
+    
     def pack(self, **kwargs):
         """布局方法"""
         self.floating_frame.main_container.pack(**kwargs)
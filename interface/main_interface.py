@@ -4,7 +4,6 @@
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
 import sys
 import os
 
@@ -18,6 +17,8 @@ def get_version_info_from_main():
     except ImportError:
         return "V1.0 Unknown", "V1.0", "Unknown"
 
+from lazy_import import prewarm_imports
+from clock_ticker import get_clock_ticker
 from .styles import StyleManager
 from .top_frame import TopFrame
 from .floating_tabs import FloatingTabNotebook
@@ -31,8 +32,9 @@ from .tabs.device_port import DevicePortTab
 class MainInterface:
     """主界面管理器"""
     
-    def __init__(self, root):
+    def __init__(self, root, prewarm_tabs=True):
         self.root = root
+        self.prewarm_tabs = prewarm_tabs  # 首次显示后是否在空闲时预先构建其余标签页
         self.notebook = None
         self.style_manager = None
         self.top_frame = None
@@ -49,7 +51,7 @@ class MainInterface:
         # 创建主界面
         self.create_main_interface()
         
-        # 启动时间更新
+        # 启动时间更新（共享时钟，每秒对齐整秒更新）
         self.update_time()
     
     def setup_window(self):
@@ -106,33 +108,24 @@ class MainInterface:
         self.create_tabs()
     
     def create_tabs(self):
-        """创建所有选项卡"""
-        # 为悬空标签系统创建标签页框架
-        
-        # 创建测试主界面选项卡
-        test_frame = tk.Frame(bg='#ffffff')
-        self.notebook.add(test_frame, text="测试主界面")
-        TestMainTab(test_frame)  # 传入框架而不是notebook
-        
-        # 创建自定义功能选项卡
-        custom_frame = tk.Frame(bg='#ffffff')
-        self.notebook.add(custom_frame, text="自定义功能")
-        CustomFunctionTab(custom_frame)
-        
-        # 创建仪器指令选项卡
-        instrument_frame = tk.Frame(bg='#ffffff')
-        self.notebook.add(instrument_frame, text="仪器指令")
-        InstrumentCommandTab(instrument_frame)
-        
-        # 创建手动控制选项卡
-        manual_frame = tk.Frame(bg='#ffffff')
-        self.notebook.add(manual_frame, text="手动控制")
-        ManualControlTab(manual_frame)
-        
-        # 创建设备端口选项卡
-        device_frame = tk.Frame(bg='#ffffff')
-        self.notebook.add(device_frame, text="设备端口")
-        DevicePortTab(device_frame)
+        """创建所有选项卡（内容在第一次切换到该标签时才构建）"""
+        # 为悬空标签系统创建标签页框架，标签页类作为构建函数传入（参数为框架而不是notebook）
+        tabs = [
+            ("测试主界面", TestMainTab),
+            ("自定义功能", CustomFunctionTab),
+            ("仪器指令", InstrumentCommandTab),
+            ("手动控制", ManualControlTab),
+            ("设备端口", DevicePortTab),
+        ]
+        for text, tab_class in tabs:
+            frame = tk.Frame(bg='#ffffff')
+            self.notebook.add(frame, text=text, factory=tab_class)
+        
+        # 第一个标签页显示后，在后台导入数据库、串口等模块，并在空闲时构建其余标签页，
+        # 减少第一次切换时的等待
+        if self.prewarm_tabs:
+            self.root.after(200, prewarm_imports)
+            self.notebook.prewarm()
     
     def create_menu_bar(self):
         """创建顶部菜单栏"""
@@ -237,10 +230,6 @@ class MainInterface:
         messagebox.showinfo("关于", about_text)
     
     def update_time(self):
-        """更新时间显示"""
+        """订阅共享时钟更新时间显示"""
         if self.time_label:
-            current_time = datetime.now().strftime("%H:%M:%S")
-            self.time_label.config(text=current_time)
-        
-        # 每秒更新一次
-        self.root.after(1000, self.update_time)
+            get_clock_ticker(self.root).subscribe_label(self.time_label)
@@ -3,10 +3,14 @@
 用于实现现代化的标签按钮效果
 """
 import tkinter as tk
-import math
 
+try:
+    from .button_shapes import ButtonStateMixin, corner_ovals, parallelogram_points
+except ImportError:
+    from button_shapes import ButtonStateMixin, corner_ovals, parallelogram_points
 
-class RoundedParallelogramButton:
+
+class RoundedParallelogramButton(ButtonStateMixin):
     """圆角平行四边形按钮"""
     
     def __init__(self, parent, text="", width=120, height=45, 
@@ -36,6 +40,8 @@ class RoundedParallelogramButton:
         self.canvas = None
         self.text_id = None
         self.shape_id = None
+        self.fill_items = ()
+        self.solid_items = ()
         
         self.create_button()
         self.bind_events()
@@ -62,99 +68,39 @@ class RoundedParallelogramButton:
         self.draw_text()
     
     def draw_shape(self):
-        """绘制圆角平行四边形"""
-        if self.shape_id:
-            self.canvas.delete(self.shape_id)
-        
-        # 根据状态选择颜色
-        if self.state == 'active':
-            fill_color = self.active_bg
-        elif self.state == 'hover':
-            fill_color = self.hover_bg
-        else:
-            fill_color = self.bg_color
+        """绘制圆角平行四边形（只画一次，之后的状态变化由apply_state修改颜色）"""
+        if self.shape_id is not None:
+            self.apply_state()
+            return
+        fill_color, _ = self.state_colors()
         
-        # 计算平行四边形的顶点
-        points = self.calculate_parallelogram_points()
-        
-        # 绘制平行四边形（先绘制基本形状）
+        # 绘制平行四边形（先绘制基本形状，顶点坐标按尺寸缓存）
         self.shape_id = self.canvas.create_polygon(
-            points,
+            self.calculate_parallelogram_points(),
             fill=fill_color,
             outline=fill_color,
             width=0,
             smooth=True
         )
         
-        # 绘制圆角效果（在四个角添加圆角）
-        self.add_rounded_corners(fill_color)
-        
-        # 重新绑定事件
-        if self.shape_id:
-            self.canvas.tag_bind(self.shape_id, '<Button-1>', self.on_click)
+        # 绘制圆角效果（在四个角添加小的圆形来模拟圆角）
+        corners = tuple(
+            self.canvas.create_oval(*box, fill=fill_color, outline=fill_color)
+            for box in corner_ovals(self.width, self.height, self.skew, self.corner_radius)
+        )
+        self.solid_items = (self.shape_id,) + corners
     
     def calculate_parallelogram_points(self):
         """计算平行四边形顶点"""
-        # 平行四边形的四个顶点
         # 左上角向右倾斜
-        x1, y1 = self.skew, 0
-        x2, y2 = self.width + self.skew, 0
-        x3, y3 = self.width, self.height
-        x4, y4 = 0, self.height
-        
-        return [x1, y1, x2, y2, x3, y3, x4, y4]
-    
-    def add_rounded_corners(self, fill_color):
-        """添加圆角效果"""
-        radius = self.corner_radius
-        
-        # 获取平行四边形的四个角的位置
-        corners = [
-            (self.skew, 0),  # 左上
-            (self.width + self.skew, 0),  # 右上
-            (self.width, self.height),  # 右下
-            (0, self.height)  # 左下
-        ]
-        
-        # 在每个角添加小的圆形来模拟圆角
-        for i, (x, y) in enumerate(corners):
-            if i == 0:  # 左上角
-                self.canvas.create_oval(
-                    x - radius//2, y - radius//2, 
-                    x + radius//2, y + radius//2,
-                    fill=fill_color, outline=fill_color
-                )
-            elif i == 1:  # 右上角
-                self.canvas.create_oval(
-                    x - radius//2, y - radius//2, 
-                    x + radius//2, y + radius//2,
-                    fill=fill_color, outline=fill_color
-                )
-            elif i == 2:  # 右下角
-                self.canvas.create_oval(
-                    x - radius//2, y - radius//2, 
-                    x + radius//2, y + radius//2,
-                    fill=fill_color, outline=fill_color
-                )
-            else:  # 左下角
-                self.canvas.create_oval(
-                    x - radius//2, y - radius//2, 
-                    x + radius//2, y + radius//2,
-                    fill=fill_color, outline=fill_color
-                )
+        return parallelogram_points(self.width, self.height, self.skew)
     
     def draw_text(self):
-        """绘制文字"""
-        if self.text_id:
-            self.canvas.delete(self.text_id)
-        
-        # 根据状态选择文字颜色
-        if self.state == 'active':
-            text_color = self.active_fg
-        elif self.state == 'hover':
-            text_color = self.hover_fg
-        else:
-            text_color = self.fg_color
+        """绘制文字（只画一次）"""
+        if self.text_id is not None:
+            self.apply_state()
+            return
+        _, text_color = self.state_colors()
         
         # 文字位置（平行四边形的中心）
         text_x = (self.width + self.skew) // 2
@@ -167,44 +113,11 @@ class RoundedParallelogramButton:
             fill=text_color,
             anchor='center'
         )
-        
-        # 重新绑定事件
-        if self.text_id:
-            self.canvas.tag_bind(self.text_id, '<Button-1>', self.on_click)
     
     def bind_events(self):
         """绑定事件"""
-        self.canvas.bind('<Button-1>', self.on_click)
-        self.canvas.bind('<Enter>', self.on_enter)
-        self.canvas.bind('<Leave>', self.on_leave)
+        super().bind_events()
         self.canvas.bind('<Motion>', self.on_motion)
-        
-        # 确保所有图形元素都绑定了事件
-        if self.shape_id:
-            self.canvas.tag_bind(self.shape_id, '<Button-1>', self.on_click)
-        if self.text_id:
-            self.canvas.tag_bind(self.text_id, '<Button-1>', self.on_click)
-    
-    def on_click(self, event):
-        """点击事件"""
-        if self.command:
-            self.command()
-    
-    def on_enter(self, event):
-        """鼠标进入"""
-        if self.state != 'active':
-            self.state = 'hover'
-            self.draw_shape()
-            self.draw_text()
-            self.canvas.configure(cursor='hand2')
-    
-    def on_leave(self, event):
-        """鼠标离开"""
-        if self.state != 'active':
-            self.state = 'normal'
-            self.draw_shape()
-            self.draw_text()
-            self.canvas.configure(cursor='')
     
     def on_motion(self, event):
         """鼠标移动"""
@@ -229,21 +142,3 @@ class RoundedParallelogramButton:
         max_y = max(points[1::2])
         
         return min_x <= x <= max_x and min_y <= y <= max_y
-    
-    def set_active(self, active=True):
-        """设置激活状态"""
-        self.state = 'active' if active else 'normal'
-        self.draw_shape()
-        self.draw_text()
-    
-    def pack(self, **kwargs):
-        """布局方法"""
-        self.canvas.pack(**kwargs)
-    
-    def place(self, **kwargs):
-        """位置布局方法"""
-        self.canvas.place(**kwargs)
-    
-    def grid(self, **kwargs):
-        """网格布局方法"""
-        self.canvas.grid(**kwargs)
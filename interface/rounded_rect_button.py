@@ -3,9 +3,13 @@
 现代化设计的圆角矩形按钮组件
 """
 import tkinter as tk
-import math
 
-class RoundedRectButton:
+try:
+    from .button_shapes import ButtonStateMixin, rounded_rect_points
+except ImportError:
+    from button_shapes import ButtonStateMixin, rounded_rect_points
+
+class RoundedRectButton(ButtonStateMixin):
     """圆角矩形按钮"""
     
     def __init__(self, parent, text="", width=120, height=45, 
@@ -37,6 +41,8 @@ class RoundedRectButton:
         self.canvas = None
         self.shape_id = None
         self.text_id = None
+        self.fill_items = ()
+        self.solid_items = ()
         
         self.create_button()
         self.bind_events()
@@ -66,32 +72,27 @@ class RoundedRectButton:
         self.draw_button()
     
     def draw_button(self):
-        """绘制圆角矩形按钮"""
-        # 清除之前的绘制
-        self.canvas.delete("all")
-        
-        # 根据状态选择颜色
-        if self.state == 'active':
-            fill_color = self.active_bg
-            text_color = self.active_fg
-        elif self.state == 'hover':
-            fill_color = self.hover_bg
-            text_color = self.hover_fg
-        else:
-            fill_color = self.bg_color
-            text_color = self.fg_color
+        """绘制圆角矩形按钮（只画一次，之后的状态变化由apply_state修改颜色）"""
+        if self.shape_id is not None:
+            self.apply_state()
+            return
+        fill_color, text_color = self.state_colors()
         
         # 计算位置（居中）
         offset_x = 3
         offset_y = 3
         
-        # 绘制圆角矩形
-        self.draw_rounded_rectangle(
-            offset_x, offset_y,
-            offset_x + self.width, offset_y + self.height,
-            self.corner_radius,
-            fill_color
+        # 绘制圆角矩形（顶点坐标按尺寸缓存，同尺寸的按钮共用）
+        points = rounded_rect_points(self.width, self.height, self.corner_radius,
+                                     offset_x, offset_y)
+        self.shape_id = self.canvas.create_polygon(
+            points,
+            fill=fill_color,
+            outline=self.border_color,
+            width=self.border_width,
+            smooth=True
         )
+        self.fill_items = (self.shape_id,)
         
         # 绘制文本
         text_x = offset_x + self.width // 2
@@ -104,107 +105,6 @@ class RoundedRectButton:
             fill=text_color,
             anchor='center'
         )
-        
-        # 重新绑定事件
-        self.bind_shape_events()
-    
-    def draw_rounded_rectangle(self, x1, y1, x2, y2, radius, fill_color):
-        """绘制圆角矩形"""
-        # 确保半径不超过矩形的一半
-        radius = min(radius, abs(x2-x1)//2, abs(y2-y1)//2)
-        
-        points = []
-        
-        # 右上角
-        for i in range(0, 90, 5):
-            angle = math.radians(i)
-            x = x2 - radius + radius * math.cos(angle)
-            y = y1 + radius - radius * math.sin(angle)
-            points.extend([x, y])
-        
-        # 右下角
-        for i in range(90, 180, 5):
-            angle = math.radians(i)
-            x = x2 - radius + radius * math.cos(angle)
-            y = y2 - radius - radius * math.sin(angle)
-            points.extend([x, y])
-        
-        # 左下角
-        for i in range(180, 270, 5):
-            angle = math.radians(i)
-            x = x1 + radius + radius * math.cos(angle)
-            y = y2 - radius - radius * math.sin(angle)
-            points.extend([x, y])
-        
-        # 左上角
-        for i in range(270, 360, 5):
-            angle = math.radians(i)
-            x = x1 + radius + radius * math.cos(angle)
-            y = y1 + radius - radius * math.sin(angle)
-            points.extend([x, y])
-        
-        # 创建圆角矩形
-        self.shape_id = self.canvas.create_polygon(
-            points,
-            fill=fill_color,
-            outline=self.border_color,
-            width=self.border_width,
-            smooth=True
-        )
-    
-    def bind_events(self):
-        """绑定基础事件"""
-        self.canvas.bind('<Button-1>', self.on_click)
-        self.canvas.bind('<Enter>', self.on_enter)
-        self.canvas.bind('<Leave>', self.on_leave)
-    
-    def bind_shape_events(self):
-        """绑定形状事件"""
-        if self.shape_id:
-            self.canvas.tag_bind(self.shape_id, '<Button-1>', self.on_click)
-        if self.text_id:
-            self.canvas.tag_bind(self.text_id, '<Button-1>', self.on_click)
-    
-    def on_click(self, event):
-        """点击事件"""
-        if self.command:
-            self.command()
-    
-    def on_enter(self, event):
-        """鼠标进入"""
-        if self.state != 'active':
-            self.state = 'hover'
-            self.draw_button()
-            self.canvas.configure(cursor='hand2')
-    
-    def on_leave(self, event):
-        """鼠标离开"""
-        if self.state != 'active':
-            self.state = 'normal'
-            self.draw_button()
-            self.canvas.configure(cursor='')
-    
-    def set_active(self, active=True):
-        """设置激活状态"""
-        self.state = 'active' if active else 'normal'
-        self.draw_button()
-    
-    def pack(self, **kwargs):
-        """布局方法"""
-        self.canvas.pack(**kwargs)
-    
-    def place(self, **kwargs):
-        """位置布局方法"""
-        self.canvas.place(**kwargs)
-    
-    def grid(self, **kwargs):
-        """网格布局方法"""
-        self.canvas.grid(**kwargs)
-
-    def destroy(self):
-        """销毁按钮"""
-        if self.canvas:
-            self.canvas.destroy()
 
 # 为了兼容性，保持相同的接口
 def create_button(parent, text="", width=120, height=45, 
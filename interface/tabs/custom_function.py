@@ -3,7 +3,9 @@
 """
 import tkinter as tk
 from tkinter import ttk
+import itertools
 import os
+import re
 import sys
 from datetime import datetime
 
@@ -14,6 +16,16 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from ConnectDatabase import ReadDataBase
+from instrument_command_cache import get_instrument_command_cache
+from scpi_template import parameter_template
+
+from ..data_loader import get_data_loader, LOADING_TEXT
+from ..command_index import CommandIndex, FILTER_ALL
+from ..tree_reconciler import TreeReconciler
+from ..virtual_table import VirtualTable
+
+# 参数提醒中 "名称:" / "名称：" 形式的参数名
+_REMINDER_PARAM_PATTERN = re.compile(r'(\w+)\s*[:：]')
 
 
 class CustomFunctionTab:
@@ -119,21 +131,29 @@ class CustomFunctionTab:
         self.refresh_combobox_data()
     
     def refresh_combobox_data(self):
-        """刷新下拉框数据"""
-        try:
-            db = ReadDataBase()
-            # 获取所有测试项目名称
-            all_programs = db.get_all_test_programs()
-            self.all_program_names = [program['name'] for program in all_programs]
-            
-            # 更新下拉框选项
-            self.search_combobox['values'] = self.all_program_names
-            print(f"已加载 {len(self.all_program_names)} 个测试项目")
-            
-        except Exception as e:
-            print(f"刷新下拉框数据时发生错误: {e}")
+        """刷新下拉框数据（在后台线程中查询数据库）"""
+        if not hasattr(self, 'all_program_names'):
             self.all_program_names = []
-            self.search_combobox['values'] = []
+        get_data_loader(self.parent_frame).submit(
+            lambda: ReadDataBase().get_all_test_programs(),
+            on_success=self.on_test_programs_loaded,
+            on_error=self.on_test_programs_error,
+            name="加载测试项目")
+    
+    def on_test_programs_loaded(self, all_programs):
+        """测试项目加载完成（主线程回调）"""
+        # 获取所有测试项目名称
+        self.all_program_names = [program['name'] for program in all_programs]
+        
+        # 更新下拉框选项
+        self.search_combobox['values'] = self.all_program_names
+        print(f"已加载 {len(self.all_program_names)} 个测试项目")
+    
+    def on_test_programs_error(self, error):
+        """测试项目加载失败（主线程回调）"""
+        print(f"刷新下拉框数据时发生错误: {error}")
+        self.all_program_names = []
+        self.search_combobox['values'] = []
     
     def on_search_key_release(self, event):
         """搜索框输入时的模糊搜索"""
@@ -387,120 +407,112 @@ class CustomFunctionTab:
         self.device_type_combo.grid(row=0, column=1, sticky='w', padx=5, pady=2)
         self.device_type_combo.bind('<<ComboboxSelected>>', self.filter_instrument_commands)
         
-        # 创建Treeview显示列表
+        # 创建虚拟化列表（只为可见行创建表格项，点击列标题排序）
         columns = ('device_type', 'device_model', 'function_type')
-        self.tree = ttk.Treeview(self.right_frame, columns=columns, show='headings', height=15)
-        
-        # 设置列标题
-        self.tree.heading('device_type', text='仪器分类')
-        self.tree.heading('device_model', text='仪器型号')
-        self.tree.heading('function_type', text='功能分类')
+        self.table = VirtualTable(self.right_frame, columns,
+                                  headings=('仪器分类', '仪器型号', '功能分类'),
+                                  height=15, striped=True)
         
         # 设置列宽
-        self.tree.column('device_type', width=100)
-        self.tree.column('device_model', width=120)
-        self.tree.column('function_type', width=120)
+        self.table.column('device_type', width=100)
+        self.table.column('device_model', width=120)
+        self.table.column('function_type', width=120)
         
-        # 添加垂直滚动条
-        scrollbar = ttk.Scrollbar(self.right_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         # 绑定双击事件
-        self.tree.bind('<Double-1>', self.on_tree_double_click)
+        self.table.bind_rows('<Double-1>', self.on_tree_double_click)
+        
+        # 其他选项卡触发的缓存同步拿到新数据时，也刷新本列表
+        # （缓存是进程内共享的，表格销毁时注销监听，避免切换选项卡后残留）
+        loader = get_data_loader(self.parent_frame)
+        self.cache_listener = lambda cache: loader.call_in_ui(self.on_cache_synced)
+        get_instrument_command_cache().add_listener(self.cache_listener)
+        self.table.bind('<Destroy>', self.on_table_destroy, add='+')
         
         # 加载数据
         self.refresh_instrument_commands()
     
     def refresh_instrument_commands(self):
-        """刷新仪器指令列表"""
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
+        """刷新仪器指令列表：先显示本地缓存，再在后台从数据库增量同步"""
         try:
-            # 从数据库获取数据
-            db = ReadDataBase()
-            commands = db.get_all_instrument_commands()
-            
-            # 获取所有不重复的仪器分类
-            device_types = sorted(list(set([cmd['device_type'] for cmd in commands])))
-            self.device_type_combo['values'] = ['全部'] + device_types
-            self.device_type_var.set('全部')
-            
-            # 存储完整的命令数据
-            self.all_commands = commands
-            
-            # 填充数据到Treeview
-            self.populate_tree_with_commands(commands)
+            self.show_cached_instrument_commands()
+            if not self.all_commands:
+                self.table.set_placeholder(LOADING_TEXT)
+            get_data_loader(self.parent_frame).submit(
+                get_instrument_command_cache().sync,
+                on_success=lambda changed: self.on_cache_synced(),
+                on_error=lambda e: self.on_cache_synced(),
+                name="同步仪器指令")
             
         except Exception as e:
             print(f"刷新仪器指令列表时发生错误: {e}")
     
+    def show_cached_instrument_commands(self):
+        """从本地缓存读取仪器指令并填充列表，尽量保留当前的分类筛选"""
+        cache = get_instrument_command_cache()
+        self.cache_version = cache.version
+        commands = cache.get_all()
+        
+        # 存储完整的命令数据并建立索引
+        self.all_commands = commands
+        self.command_index = CommandIndex(commands)
+        
+        # 获取所有不重复的仪器分类
+        device_types = self.command_index.values('device_type')
+        self.device_type_combo['values'] = [FILTER_ALL] + device_types
+        if self.device_type_var.get() not in device_types:
+            self.device_type_var.set(FILTER_ALL)
+        
+        # 按当前筛选条件填充数据到Treeview
+        self.filter_instrument_commands()
+    
+    def on_table_destroy(self, event):
+        """表格销毁时注销缓存监听"""
+        if event.widget is self.table:
+            get_instrument_command_cache().remove_listener(self.cache_listener)
+
+    def on_cache_synced(self):
+        """后台同步完成（主线程回调），缓存有新数据时刷新列表"""
+        self.table.set_placeholder(None)
+        if get_instrument_command_cache().version != self.cache_version:
+            self.show_cached_instrument_commands()
+    
     def filter_instrument_commands(self, event=None):
         """根据选定的过滤器筛选仪器指令"""
-        selected_type = self.device_type_var.get()
+        filtered_commands = self.command_index.query(device_type=self.device_type_var.get())
         
-        if selected_type == '全部':
-            filtered_commands = self.all_commands
-        else:
-            filtered_commands = [cmd for cmd in self.all_commands if cmd['device_type'] == selected_type]
-            
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
         # 填充过滤后的数据
         self.populate_tree_with_commands(filtered_commands)
     
     def populate_tree_with_commands(self, commands):
-        """将命令数据填充到树视图中"""
-        for i, cmd in enumerate(commands):
-            # 使用交替行颜色
-            tag = 'even' if i % 2 == 0 else 'odd'
-            
-            self.tree.insert('', tk.END, values=(
-                cmd['device_type'],
-                cmd['device_model'],
-                cmd['function_type']
-            ), tags=(tag,))
-        
-        # 设置交替行颜色
-        self.tree.tag_configure('even', background='#f0f0f0')
-        self.tree.tag_configure('odd', background='#ffffff')
+        """将命令数据分片填充到列表中（以 仪器分类|型号|功能分类 作为行key）"""
+        self.table.set_rows_chunked(
+            (f"{cmd['device_type']}|{cmd['device_model']}|{cmd['function_type']}",
+             (cmd['device_type'], cmd['device_model'], cmd['function_type']))
+            for cmd in commands)
     
     def on_tree_double_click(self, event):
         """处理双击事件 - 现在是添加指令到左侧列表"""
-        selected_item = self.tree.selection()
+        selected_item = self.table.selection()
         if not selected_item:
             return
             
         # 获取选中项的值
-        item = self.tree.item(selected_item[0])
-        values = item['values']
+        values = self.table.get_values(selected_item[0])
         
         if len(values) >= 3:
             device_type, device_model, function_type = values[0], values[1], values[2]
             
             # 查找完整的命令信息并添加到左侧列表
-            for cmd in self.all_commands:
-                if (cmd['device_type'] == device_type and 
-                    cmd['device_model'] == device_model and 
-                    cmd['function_type'] == function_type):
-                    self.add_command_to_left_list(cmd)
-                    break
+            cmd = self.command_index.find(device_type, device_model, function_type)
+            if cmd is not None:
+                self.add_command_to_left_list(cmd)
     
     def show_command_details(self, device_type, device_model, function_type):
         """显示命令详细信息"""
         # 找到对应的命令
-        command_details = None
-        for cmd in self.all_commands:
-            if (cmd['device_type'] == device_type and 
-                cmd['device_model'] == device_model and 
-                cmd['function_type'] == function_type):
-                command_details = cmd
-                break
+        command_details = self.command_index.find(device_type, device_model, function_type)
                 
         if not command_details:
             return
@@ -692,6 +704,8 @@ class CustomFunctionTab:
         # 创建Treeview显示已选择的列表
         columns = ('device_info', 'command', 'params_reminder', 'params_input')
         self.left_tree = ttk.Treeview(self.left_frame, columns=columns, show='headings', height=15)
+        self.left_tree_reconciler = TreeReconciler(self.left_tree)
+        self.left_item_ids = itertools.count(1)  # 已选择指令的行ID（同一指令可重复添加，不能用指令本身作ID）
         
         # 设置列标题
         self.left_tree.heading('device_info', text='仪器信息')
@@ -730,16 +744,14 @@ class CustomFunctionTab:
     
     def view_command_details(self):
         """显示当前选中项的指令详细信息"""
-        selected_items = self.tree.selection()
+        selected_items = self.table.selection()
         if not selected_items:
             from tkinter import messagebox
             messagebox.showinfo("提示", "请先选择右侧列表中的一项", parent=self.parent_frame)
             return
         
         # 只获取第一个选中项
-        item_id = selected_items[0]
-        item = self.tree.item(item_id)
-        values = item['values']
+        values = self.table.get_values(selected_items[0])
         
         if len(values) >= 3:
             device_type, device_model, function_type = values[0], values[1], values[2]
@@ -748,25 +760,21 @@ class CustomFunctionTab:
     
     def add_to_left_list(self):
         """从右侧列表添加选中项到左侧列表 - 已被view_command_details替代，保留方法供其他地方引用"""
-        selected_items = self.tree.selection()
+        selected_items = self.table.selection()
         if not selected_items:
             from tkinter import messagebox
             messagebox.showinfo("提示", "请先选择右侧列表中的一项", parent=self.parent_frame)
             return
         
         for item_id in selected_items:
-            item = self.tree.item(item_id)
-            values = item['values']
+            values = self.table.get_values(item_id)
             if len(values) >= 3:
                 device_type, device_model, function_type = values[0], values[1], values[2]
                 
                 # 查找完整的命令信息
-                for cmd in self.all_commands:
-                    if (cmd['device_type'] == device_type and 
-                        cmd['device_model'] == device_model and 
-                        cmd['function_type'] == function_type):
-                        self.add_command_to_left_list(cmd)
-                        break
+                cmd = self.command_index.find(device_type, device_model, function_type)
+                if cmd is not None:
+                    self.add_command_to_left_list(cmd)
     
     def add_command_to_left_list(self, command):
         """添加命令到左侧列表，允许重复添加相同的指令"""
@@ -777,21 +785,9 @@ class CustomFunctionTab:
         cmd_text = command.get('command', '')
         params_reminder = command.get('params_reminder', '')
         
-        # 从指令文本中提取参数数量
-        import re
-        # 查找指令中的 value 或 valueN 模式
-        cmd_values = re.findall(r'value\d*', cmd_text)
-        # 查找可能的其他参数表示方式，如 <param1>
-        cmd_params = re.findall(r'<(\w+)>', cmd_text)
-        
-        # 如果在指令中找到了参数
-        if cmd_values:
-            # 生成与指令中匹配的参数格式
-            params_input = ";".join([f"{val}=?" for val in cmd_values]) + ";"
-        elif cmd_params:
-            # 使用找到的参数名
-            params_input = ";".join([f"{param}=?" for param in cmd_params]) + ";"
-        else:
+        # 使用指令模板引擎提取指令中的 valueN / <param> 参数
+        params_input = parameter_template(cmd_text)
+        if not params_input:
             # 分析指令文本中可能的值参数个数
             # 通常指令最后的单词可能是值参数，如 :HOR:SCA value1;
             parts = cmd_text.split()
@@ -803,19 +799,16 @@ class CustomFunctionTab:
                 params_input = "value1=?;"
             else:
                 # 从参数提醒中获取线索
-                if params_reminder:
-                    param_names = re.findall(r'(\w+)\s*[:：]', params_reminder)
-                    if param_names:
-                        # 使用从参数提醒中提取的参数名
-                        params_input = ";".join([f"{name}=?" for name in param_names]) + ";"
-                    else:
-                        # 默认使用单个参数
-                        params_input = "value1=?;"
+                param_names = _REMINDER_PARAM_PATTERN.findall(params_reminder) if params_reminder else []
+                if param_names:
+                    # 使用从参数提醒中提取的参数名
+                    params_input = ";".join([f"{name}=?" for name in param_names]) + ";"
                 else:
                     # 没有找到任何参数信息，默认使用单个参数
                     params_input = "value1=?;"
         
         extended_command['params_input'] = params_input
+        extended_command['item_id'] = f"selected-{next(self.left_item_ids)}"
         
         # 添加到已选择列表
         self.selected_commands.append(extended_command)
@@ -824,12 +817,8 @@ class CustomFunctionTab:
         self.update_left_tree()
     
     def update_left_tree(self):
-        """更新左侧树状视图"""
-        # 清空现有数据
-        for item in self.left_tree.get_children():
-            self.left_tree.delete(item)
-        
-        # 填充数据
+        """更新左侧树状视图（差异更新，保留滚动位置和选中状态）"""
+        rows = []
         for i, cmd in enumerate(self.selected_commands):
             # 使用交替行颜色
             tag = 'even' if i % 2 == 0 else 'odd'
@@ -840,12 +829,17 @@ class CustomFunctionTab:
             # 获取参数输入，如果不存在则使用空字符串
             params_input = cmd.get('params_input', "")
             
-            self.left_tree.insert('', tk.END, values=(
+            rows.append((cmd['item_id'], (
                 device_info,
                 cmd['command'],
                 cmd.get('params_reminder', ""),  # 使用get避免键不存在的错误
                 params_input
-            ), tags=(tag,))
+            ), (tag,)))
+        
+        # 移除已从列表删除的指令，再按当前顺序更新
+        removed = self.left_tree_reconciler.prune(row[0] for row in rows)
+        stats = self.left_tree_reconciler.reconcile(rows)
+        print(f"🌲 已选指令列表刷新: 删除 {removed}，{stats}")
         
         # 设置交替行颜色
         self.left_tree.tag_configure('even', background='#f0f0f0')
@@ -862,26 +856,21 @@ class CustomFunctionTab:
             self.left_tree.selection_set(item)
             self.left_tree_menu.post(event.x_root, event.y_root)
     
+    def find_selected_command(self, item_id):
+        """按行ID查找已选择的指令，返回 (索引, 指令)，找不到时返回 (None, None)"""
+        for index, cmd in enumerate(self.selected_commands):
+            if cmd['item_id'] == item_id:
+                return index, cmd
+        return None, None
+    
     def remove_selected_command(self):
-        """从左侧列表移除选中的命令"""
-        selected_items = self.left_tree.selection()
+        """从左侧列表移除选中的命令（同一指令重复添加时只移除选中的行）"""
+        selected_items = set(self.left_tree.selection())
         if not selected_items:
             return
         
-        for item_id in selected_items:
-            item = self.left_tree.item(item_id)
-            values = item['values']
-            if len(values) >= 1:
-                # 从合并的信息中提取仪器分类、型号和功能分类
-                device_info_parts = values[0].split(' - ')
-                if len(device_info_parts) >= 3:
-                    device_type, device_model, function_type = device_info_parts[0], device_info_parts[1], device_info_parts[2]
-                    
-                    # 从列表中移除
-                    self.selected_commands = [cmd for cmd in self.selected_commands 
-                                            if not (cmd['device_type'] == device_type and 
-                                                  cmd['device_model'] == device_model and 
-                                                  cmd['function_type'] == function_type)]
+        self.selected_commands = [cmd for cmd in self.selected_commands
+                                  if cmd['item_id'] not in selected_items]
         
         # 更新左侧树状视图
         self.update_left_tree()
@@ -1060,13 +1049,10 @@ class CustomFunctionTab:
             if new_params and not new_params.endswith(';'):
                 new_params += ';'  # 确保结尾有分号
                 
-            # 更新内存中的数据
-            for cmd in self.selected_commands:
-                if (cmd['device_type'] == device_type and 
-                    cmd['device_model'] == device_model and 
-                    cmd['function_type'] == function_type):
-                    cmd['params_input'] = new_params
-                    break
+            # 更新内存中的数据（按行ID，只修改正在编辑的那一行）
+            _, cmd = self.find_selected_command(item_id)
+            if cmd is not None:
+                cmd['params_input'] = new_params
             
             # 更新视图
             self.update_left_tree()
@@ -1107,36 +1093,11 @@ class CustomFunctionTab:
     
     def generate_example_format(self, text_widget, command_text):
         """根据指令文本生成参数输入示例格式"""
-        import re
-        
         # 清空当前内容
         text_widget.delete(1.0, tk.END)
         
-        # 获取命令文本
-        cmd_text = command_text
-        
-        # 查找指令中的 value 或 valueN 模式
-        cmd_values = re.findall(r'value\d*', cmd_text)
-        # 查找可能的其他参数表示方式，如 <param1>
-        cmd_params = re.findall(r'<(\w+)>', cmd_text)
-        
-        # 如果在指令中找到了参数
-        if cmd_values:
-            # 生成与指令中匹配的参数格式
-            params_input = ";".join([f"{val}=123" for val in cmd_values]) + ";"
-        elif cmd_params:
-            # 使用找到的参数名
-            params_input = ";".join([f"{param}=123" for param in cmd_params]) + ";"
-        else:
-            # 分析指令文本中可能的值参数个数
-            # 通常指令最后的单词可能是值参数，如 :HOR:SCA value1;
-            parts = cmd_text.split()
-            if parts and not parts[-1].startswith(':'):
-                # 如果最后一部分可能是值，只使用一个参数
-                params_input = "value1=123;"
-            else:
-                # 默认使用单个参数
-                params_input = "value1=123;"
+        # 使用指令模板引擎提取参数，没有参数时默认使用单个参数
+        params_input = parameter_template(command_text, fill='123') or "value1=123;"
         
         # 插入生成的示例格式
         text_widget.insert(tk.END, params_input)
@@ -1219,59 +1180,22 @@ class CustomFunctionTab:
         # 不再显示提示消息框，为了不打断用户的操作流程
     
     def move_command(self, direction):
-        """上移或下移左侧列表中的命令"""
-        selected_items = self.left_tree.selection()
+        """上移或下移左侧列表中选中的命令（按行ID定位，连续选中的多行整体移动）"""
+        selected_items = set(self.left_tree.selection())
         if not selected_items:
             return
         
-        # 获取所有项的ID
-        all_items = self.left_tree.get_children()
-        
-        for item_id in selected_items:
-            # 获取当前索引
-            current_index = all_items.index(item_id)
-            
-            if direction == "up" and current_index > 0:
-                # 上移
-                item = self.left_tree.item(item_id)
-                values = item['values']
-                if len(values) >= 1:
-                    # 从合并的信息中提取仪器分类、型号和功能分类
-                    device_info_parts = values[0].split(' - ')
-                    if len(device_info_parts) >= 3:
-                        device_type, device_model, function_type = device_info_parts[0], device_info_parts[1], device_info_parts[2]
-                        
-                        # 查找对应的命令
-                        for i, cmd in enumerate(self.selected_commands):
-                            if (cmd['device_type'] == device_type and 
-                                cmd['device_model'] == device_model and 
-                                cmd['function_type'] == function_type):
-                                if i > 0:
-                                    # 交换位置
-                                    self.selected_commands[i], self.selected_commands[i-1] = \
-                                        self.selected_commands[i-1], self.selected_commands[i]
-                                    break
-                    
-            elif direction == "down" and current_index < len(all_items) - 1:
-                # 下移
-                item = self.left_tree.item(item_id)
-                values = item['values']
-                if len(values) >= 1:
-                    # 从合并的信息中提取仪器分类、型号和功能分类
-                    device_info_parts = values[0].split(' - ')
-                    if len(device_info_parts) >= 3:
-                        device_type, device_model, function_type = device_info_parts[0], device_info_parts[1], device_info_parts[2]
-                        
-                        # 查找对应的命令
-                        for i, cmd in enumerate(self.selected_commands):
-                            if (cmd['device_type'] == device_type and 
-                                cmd['device_model'] == device_model and 
-                                cmd['function_type'] == function_type):
-                                if i < len(self.selected_commands) - 1:
-                                    # 交换位置
-                                    self.selected_commands[i], self.selected_commands[i+1] = \
-                                        self.selected_commands[i+1], self.selected_commands[i]
-                                    break
+        commands = self.selected_commands
+        indices = [i for i, cmd in enumerate(commands) if cmd['item_id'] in selected_items]
+        step = -1 if direction == "up" else 1
+        if step > 0:
+            indices.reverse()
+        
+        for i in indices:
+            j = i + step
+            # 已到顶端/底端，或相邻的也是选中行（被挡住）时不移动
+            if 0 <= j < len(commands) and commands[j]['item_id'] not in selected_items:
+                commands[i], commands[j] = commands[j], commands[i]
         
         # 更新左侧树状视图
         self.update_left_tree()
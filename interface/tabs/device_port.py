@@ -5,18 +5,6 @@ import tkinter as tk
 from tkinter import ttk
 import sys
 import os
-import json
-import socket
-import subprocess
-import re
-
-# 尝试导入pyserial用于COM口检测
-try:
-    import serial.tools.list_ports
-    SERIAL_AVAILABLE = True
-except ImportError:
-    SERIAL_AVAILABLE = False
-    print("⚠️ 未安装pyserial，COM口检测将使用默认列表")
 
 # 导入圆角矩形按钮组件
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,72 +14,65 @@ except ImportError:
     # 如果导入失败，使用普通按钮作为备用
     RoundedRectButton = None
 
+# 添加项目根目录到路径以导入设备发现引擎
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from device_discovery import DeviceDiscoveryEngine
+from instrument_identifier import identify_instruments
+from discovery_cache import DiscoveryCache, get_discovery_cache_path
+from config_store import DEFAULT_CONFIG_PATH, get_config_store
+
+from ..data_loader import get_data_loader
+
+# 下拉框中显示的检测状态提示（不是设备地址，不能写入配置）
+STATUS_TEXT_PREFIXES = ("🔍", "❌")
+
+
+def is_status_text(text):
+    """是否为"正在检测"、"检测失败"等状态提示"""
+    return not text or text.startswith(STATUS_TEXT_PREFIXES)
+
 
 class DevicePortTab:
     """设备端口选项卡"""
     
     def __init__(self, parent_frame):
         self.parent_frame = parent_frame
-        self.config_path = r"D:\Power Test Integrate System\System Information.json"
+        self.config_path = DEFAULT_CONFIG_PATH
+        self.config_store = get_config_store(self.config_path)  # 与其他选项卡共用的内存配置
         self.address_combos = {}  # 存储地址下拉框的引用
         self.device_keys = ["oscilloscope", "ac_source", "electronic_load", "control_box"]
+        self.discovery_engine = DeviceDiscoveryEngine()
+        self.instrument_identities = {}  # 地址 -> InstrumentIdentity（最近一次 *IDN? 识别结果）
+        
+        self._discovery_callbacks = None  # 进行中的设备发现完成后要回调的函数（None表示没有进行中的发现）
+        self._detecting_keys = set()      # 正在等待检测结果的下拉框
         
         # 确保配置目录存在
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
         
-        # 加载配置
-        self.config = self.load_config()
+        # 设备发现结果缓存（与配置文件在同一目录，所有下拉框共用）
+        self.discovery_cache = DiscoveryCache(get_discovery_cache_path(self.config_path))
         
         self.create_content()
+        self.show_cached_addresses()
         
-        # 创建完成后保存当前配置
+        # 创建完成后保存当前配置（地址没有变化时不写文件）
         self.save_config()
     
-    def load_config(self):
-        """加载配置文件"""
-        try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                # 默认配置
-                return {
-                    "device_addresses": {
-                        "oscilloscope": "TCPIP::192.168.1.100::INSTR",
-                        "ac_source": "TCPIP::192.168.1.101::INSTR", 
-                        "electronic_load": "TCPIP::192.168.1.102::INSTR",
-                        "control_box": "TCPIP::192.168.1.103::INSTR"
-                    }
-                }
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
-            # 返回默认配置
-            return {
-                "device_addresses": {
-                    "oscilloscope": "TCPIP::192.168.1.100::INSTR",
-                    "ac_source": "TCPIP::192.168.1.101::INSTR", 
-                    "electronic_load": "TCPIP::192.168.1.102::INSTR",
-                    "control_box": "TCPIP::192.168.1.103::INSTR"
-                }
-            }
-    
     def save_config(self):
-        """保存配置文件"""
-        try:
-            # 更新配置中的设备地址
-            if "device_addresses" not in self.config:
-                self.config["device_addresses"] = {}
-            
-            for i, key in enumerate(self.device_keys):
-                if key in self.address_combos:
-                    self.config["device_addresses"][key] = self.address_combos[key].get()
-            
-            # 保存到文件
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=4)
-            print(f"配置已保存到: {self.config_path}")
-        except Exception as e:
-            print(f"保存配置文件失败: {e}")
+        """把下拉框中的设备地址写入配置（内容变化时才延迟写入文件）
+        
+        正在检测的下拉框和显示状态提示的下拉框保留配置中原来的地址。
+        """
+        addresses = {}
+        for key in self.device_keys:
+            if key not in self.address_combos or key in self._detecting_keys:
+                continue
+            address = self.address_combos[key].get()
+            if not is_status_text(address):
+                addresses[key] = address
+        if addresses:
+            self.config_store.set_device_addresses(addresses)
     
     def on_address_changed(self, device_key):
         """地址改变时的回调函数"""
@@ -124,6 +105,22 @@ class DevicePortTab:
         # 添加全局刷新按钮区域
         button_frame = tk.Frame(inner_container, bg='#ffffff')
         button_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(20, 0))
+
+        # 忽略缓存重新检测，并通过 *IDN? 识别所有仪器，自动分配到四个设备
+        identify_btn = tk.Button(
+            button_frame,
+            text="🔍 检测并识别全部仪器",
+            font=('Microsoft YaHei', 9),
+            bg='#34495e',
+            fg='white',
+            relief='flat',
+            bd=0,
+            padx=16,
+            pady=6,
+            cursor='hand2',
+            command=lambda: self.refresh_all_addresses(force=True)
+        )
+        identify_btn.pack(side=tk.RIGHT, padx=5)
             
     def create_device_address_config(self, parent, label_text, device_key, row, column, theme_color):
         """创建单个设备地址配置（玻璃效果）"""
@@ -178,7 +175,7 @@ class DevicePortTab:
         self.address_combos[device_key] = address_combo
         
         # 从配置文件加载默认值
-        saved_address = self.config.get("device_addresses", {}).get(device_key)
+        saved_address = self.config_store.get_device_address(device_key)
         if saved_address:
             address_combo.set(saved_address)
         else:
@@ -260,327 +257,233 @@ class DevicePortTab:
         print("📋 使用默认地址列表（点击刷新按钮可检测真实设备）")
         return default_addresses
     
-    def get_available_addresses(self):
-        """获取可用的COM口、IP地址和GPIB地址（使用先进的扫描方法）"""
-        addresses = []
-        
-        # 1. 扫描COM端口（使用详细信息）
-        print("🔍 开始扫描COM端口...")
-        com_addresses = self.get_com_ports()
-        addresses.extend(com_addresses)
-        
-        # 2. 使用PyVISA扫描所有VISA资源
-        print("🔍 开始VISA资源扫描...")
-        visa_addresses = self.scan_visa_resources()
-        addresses.extend(visa_addresses)
-        
-        # 3. 扫描网络设备
-        print("🔍 开始网络设备扫描...")
-        network_addresses = self.scan_network_devices()
-        addresses.extend(network_addresses)
-        
-        # 4. 扫描GPIB设备
-        print("🔍 开始GPIB设备扫描...")
-        gpib_addresses = self.scan_gpib_devices()
-        addresses.extend(gpib_addresses)
-        
-        # 5. 扫描LPT并口设备
-        print("🔍 开始LPT并口扫描...")
-        lpt_addresses = self.scan_lpt_devices()
-        addresses.extend(lpt_addresses)
-        
-        # 6. 添加配置文件中的地址
-        print("🔍 从配置文件添加设备地址...")
-        for device_name, addr in self.config.get("device_addresses", {}).items():
-            if isinstance(addr, str) and addr not in addresses:
-                addresses.append(addr)
-                print(f"✅ 从配置添加: {device_name} -> {addr}")
-        
-        # 去重并按类型排序
-        unique_addresses = list(set(addresses))
-        com_addresses = [addr for addr in unique_addresses if addr.startswith('COM')]
-        tcpip_addresses = [addr for addr in unique_addresses if addr.startswith('TCPIP')]
-        gpib_addresses = [addr for addr in unique_addresses if addr.startswith('GPIB')]
-        lpt_addresses = [addr for addr in unique_addresses if addr.startswith('LPT')]
-        other_addresses = [addr for addr in unique_addresses if not any(addr.startswith(prefix) for prefix in ['COM', 'TCPIP', 'GPIB', 'LPT'])]
-        
-        # 排序各类地址
-        com_addresses.sort()
-        tcpip_addresses.sort()
-        gpib_addresses.sort()
-        lpt_addresses.sort()
-        other_addresses.sort()
-        
-        # 按优先级组合：COM -> TCPIP -> GPIB -> LPT -> 其他
-        result = com_addresses + tcpip_addresses + gpib_addresses + lpt_addresses + other_addresses
-        
-        print(f"📡 最终可用地址列表:")
-        print(f"   COM: {len(com_addresses)}, TCPIP: {len(tcpip_addresses)}, GPIB: {len(gpib_addresses)}, LPT: {len(lpt_addresses)}, 其他: {len(other_addresses)}")
-        for addr in result:
-            print(f"   - {addr}")
-        return result
-    
-    def get_com_ports(self):
-        """获取可用COM端口列表 - 动态扫描"""
-        ports = []
-        try:
-            if SERIAL_AVAILABLE:
-                available_ports = serial.tools.list_ports.comports()
-                for port in available_ports:
-                    # 添加详细的端口信息
-                    port_info = f"{port.device} - {port.description}"
-                    ports.append(port_info)
-                    print(f"✅ 发现COM口: {port_info}")
-                
-                # 如果没有找到端口，返回常见的COM端口供测试
-                if not ports:
-                    ports = ["COM1", "COM2", "COM3", "COM4"]
-                    print("ℹ️ 未检测到COM口，使用默认列表")
-            else:
-                ports = ["COM1", "COM2", "COM3", "COM4"]
-                print("⚠️ pyserial未安装，使用默认COM端口列表")
-                
-        except Exception as e:
-            print(f"❌ 扫描COM端口时出错: {e}")
-            ports = ["COM1", "COM2", "COM3", "COM4"]
+    def get_available_addresses(self, on_partial=None):
+        """获取可用的COM口、IP地址和GPIB地址（各类扫描并发执行）
         
-        return ports
+        on_partial(backend_name, addresses) 会在每类扫描完成后以当前已发现的地址回调，
+        本方法可能耗时数秒，应在后台线程中调用。
+        """
+        return self.run_discovery(on_partial).addresses
     
-    def scan_visa_resources(self):
-        """使用PyVISA扫描所有VISA资源"""
-        visa_addresses = []
-        try:
-            import pyvisa
-            rm = pyvisa.ResourceManager()
-            resources = rm.list_resources()
-            
-            for resource in resources:
-                if isinstance(resource, str):
-                    visa_addresses.append(resource)
-                    print(f"✅ VISA发现资源: {resource}")
-                    
-            print(f"✅ VISA共发现 {len(visa_addresses)} 个资源")
-            
-        except ImportError:
-            print("⚠️ 未安装PyVISA，跳过VISA资源扫描")
-        except Exception as e:
-            print(f"❌ VISA资源扫描失败: {e}")
-        
-        return visa_addresses
+    def run_discovery(self, on_partial=None):
+        """执行设备发现，返回DiscoveryResult（应在后台线程中调用）"""
+        # 配置文件中的地址一并合并，防止配置地址未被检测到时丢失
+        config_addresses = list(self.config_store.get("device_addresses", {}).values())
+        # 配置文件中的 scan_subnets（如 ["172.19.71.0/24"]）指定网络扫描的子网，未配置时扫描本机网段
+        options = {"subnets": self.config_store.get("scan_subnets")}
+        return self.discovery_engine.discover(extra_addresses=config_addresses,
+                                              on_partial=on_partial,
+                                              options=options)
     
-    def scan_network_devices(self):
-        """扫描网络中的设备（TCPIP地址）"""
-        network_devices = []
-        try:
-            import socket
-            
-            # 获取本机IP地址段
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            print(f"🔍 本机IP地址: {local_ip}")
-            
-            # 添加本机TCPIP地址
-            if local_ip and local_ip != "127.0.0.1":
-                local_tcpip = f"TCPIP0::{local_ip}::inst0::INSTR"
-                network_devices.append(local_tcpip)
-                print(f"✅ 添加本机TCPIP地址: {local_tcpip}")
-            
-            # 提取网络段
-            ip_parts = local_ip.split('.')
-            network_base = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}"
-            
-            # 常见的测试设备IP地址
-            common_ips = [
-                "172.19.74.20", "172.19.74.22", "172.19.74.21", "172.19.71.29",
-                "192.168.1.100", "192.168.1.101", "192.168.1.102",
-                f"{network_base}.100",
-                f"{network_base}.101",
-                f"{network_base}.102"
-            ]
-            
-            for ip in common_ips:
-                tcpip_addr = f"TCPIP0::{ip}::inst0::INSTR"
-                if tcpip_addr not in network_devices:
-                    network_devices.append(tcpip_addr)
-            
-            print(f"✅ 网络扫描完成，添加 {len(network_devices)} 个网络地址")
-                
-        except Exception as e:
-            print(f"❌ 扫描网络设备时出错: {e}")
-            
-        return network_devices
+    def discover_and_identify(self, on_partial=None):
+        """发现地址后对真实检测到的地址和配置地址并发发送 *IDN? 识别仪器
+        
+        返回 (地址列表, {地址: InstrumentIdentity})，应在后台线程中调用。
+        GPIB扫描补充的标准地址不一定存在，不参与识别。
+        """
+        result = self.run_discovery(on_partial)
+        candidates = (result.by_backend.get("visa", []) + result.by_backend.get("network", [])
+                      + list(self.config_store.get("device_addresses", {}).values()))
+        identities = identify_instruments(candidates)
+        self.discovery_cache.store(result.addresses, identities)
+        return result.addresses, identities
     
-    def scan_gpib_devices(self):
-        """扫描GPIB设备"""
-        gpib_devices = []
-        try:
-            # 尝试使用pyvisa扫描GPIB设备
-            try:
-                import pyvisa
-                rm = pyvisa.ResourceManager()
-                resources = rm.list_resources()
-                
-                for resource in resources:
-                    if 'GPIB' in resource:
-                        gpib_devices.append(resource)
-                        print(f"✅ VISA发现GPIB: {resource}")
-                        
-            except ImportError:
-                print("⚠️ pyvisa未安装，使用默认GPIB地址")
-            except Exception as e:
-                print(f"❌ VISA扫描GPIB失败: {e}")
-            
-            # 添加标准GPIB地址格式
-            for i in range(1, 31):
-                standard_gpib = f"GPIB0::{i}::INSTR"
-                simple_gpib = f"GPIB::{i}"
-                if standard_gpib not in gpib_devices:
-                    gpib_devices.append(standard_gpib)
-                if simple_gpib not in gpib_devices:
-                    gpib_devices.append(simple_gpib)
-            
-            print(f"✅ GPIB扫描完成，共 {len(gpib_devices)} 个GPIB地址")
-                    
-        except Exception as e:
-            print(f"❌ 扫描GPIB设备时出错: {e}")
-            # 添加默认GPIB地址
-            for i in range(1, 31):
-                gpib_devices.append(f"GPIB0::{i}::INSTR")
-                gpib_devices.append(f"GPIB::{i}")
-                
-        return gpib_devices
+    def start_address_discovery(self, device_keys, on_finished):
+        """在后台执行设备发现和仪器识别，每类扫描完成后把已发现的地址实时填入正在检测的下拉框
+        
+        已有发现在进行时不会重复扫描，而是等待同一次结果。
+        on_finished(addresses) 在主线程中回调，此时 instrument_identities 已更新；
+        检测失败时addresses为None。
+        """
+        self._detecting_keys.update(device_keys)
+        if self._discovery_callbacks is not None:
+            self._discovery_callbacks.append(on_finished)
+            return
+        self._discovery_callbacks = [on_finished]
+        
+        loader = get_data_loader(self.parent_frame)
+        
+        def on_partial(backend_name, addresses):
+            loader.call_in_ui(self.show_partial_addresses, addresses)
+        
+        def finish(addresses):
+            callbacks = self._discovery_callbacks
+            self._discovery_callbacks = None
+            self._detecting_keys.clear()
+            for callback in callbacks:
+                callback(addresses)
+        
+        def on_success(found):
+            addresses, identities = found
+            self.instrument_identities = identities
+            finish(addresses)
+        
+        loader.submit(
+            lambda: self.discover_and_identify(on_partial=on_partial),
+            on_success=on_success,
+            on_error=lambda e: finish(None),
+            name="设备发现")
     
-    def scan_lpt_devices(self):
-        """扫描LPT并口设备"""
-        lpt_devices = []
-        try:
-            import os
-            if os.name == 'nt':  # Windows系统
-                # 常见的LPT端口
-                common_lpt = ["LPT1", "LPT2", "LPT3"]
-                for lpt in common_lpt:
-                    lpt_devices.append(lpt)
-                    print(f"✅ 添加LPT端口: {lpt}")
-                
-                print(f"✅ LPT扫描完成，共 {len(lpt_devices)} 个LPT端口")
-            else:
-                print("ℹ️ 非Windows系统，跳过LPT扫描")
-        except Exception as e:
-            print(f"❌ 扫描LPT设备时出错: {e}")
-            
-        return lpt_devices
+    def show_partial_addresses(self, addresses):
+        """检测过程中更新正在检测的下拉框选项（保留"正在检测"提示）"""
+        for device_key in self._detecting_keys:
+            if device_key in self.address_combos:
+                self.address_combos[device_key]['values'] = addresses
     
-    def refresh_all_addresses(self):
-        """刷新所有设备的地址列表"""
-        try:
-            print("🔍 开始检测所有设备端口...")
-            
-            # 显示所有设备为检测中状态
-            for device_key in self.device_keys:
-                if device_key in self.address_combos:
+    def get_cached_addresses(self):
+        """从发现缓存获取地址列表（同时恢复识别结果），没有缓存时返回None
+        
+        缓存已过期时仍返回缓存的地址，并在后台重新检测。
+        """
+        cached = self.discovery_cache.get()
+        if cached is None:
+            return None
+        addresses, identities = cached
+        if self._discovery_callbacks is None:
+            self.instrument_identities = identities
+        if self.discovery_cache.is_stale():
+            self.revalidate_addresses()
+        return addresses
+    
+    def show_cached_addresses(self):
+        """启动时用缓存的地址填充所有下拉框选项（不进行检测）"""
+        cached = self.discovery_cache.get()
+        if cached is None:
+            return
+        addresses, self.instrument_identities = cached
+        for combo in self.address_combos.values():
+            combo['values'] = addresses
+        print(f"📋 已从设备发现缓存加载 {len(addresses)} 个地址")
+    
+    def revalidate_addresses(self):
+        """在后台重新检测以更新过期的缓存，完成后只更新下拉框选项，不改变当前选择"""
+        if self._discovery_callbacks is not None:
+            return
+        print("♻️ 设备发现缓存已过期，后台重新检测...")
+        
+        def on_finished(new_addresses):
+            if new_addresses is None:
+                return
+            for combo in self.address_combos.values():
+                combo['values'] = new_addresses
+        
+        self.start_address_discovery([], on_finished)
+    
+    def refresh_all_addresses(self, force=False):
+        """刷新所有设备的地址列表
+        
+        缓存有效时直接使用缓存；force=True时忽略缓存重新检测并识别所有仪器。
+        """
+        print("🔍 开始检测所有设备端口...")
+        
+        previous_values = {}
+        for device_key in self.device_keys:
+            if device_key in self.address_combos:
+                previous_values[device_key] = self.address_combos[device_key].get()
+        
+        def on_finished(new_addresses):
+            if new_addresses is None:
+                # 错误时恢复默认状态
+                print("❌ 全局刷新失败")
+                default_addresses = self.get_default_addresses()
+                for device_key in previous_values:
                     combo = self.address_combos[device_key]
-                    combo['values'] = ["🔍 正在检测..."]
-                    combo.set("🔍 正在检测...")
-                    combo.update()
-            
-            # 获取真实设备地址
-            new_addresses = self.get_available_addresses()
+                    combo['values'] = default_addresses
+                    combo.set("❌ 检测失败")
+                return
             
             # 更新所有设备的下拉框
-            for device_key in self.device_keys:
-                if device_key in self.address_combos:
-                    combo = self.address_combos[device_key]
-                    current_value = combo.get()
-                    
-                    # 更新选项
-                    combo['values'] = new_addresses
-                    
-                    # 智能选择地址
-                    if current_value in new_addresses:
-                        combo.set(current_value)  # 保持原选择
-                    else:
-                        # 根据设备类型智能选择默认地址
-                        default_addr = self.get_smart_default_address(device_key, new_addresses)
-                        combo.set(default_addr if default_addr else (new_addresses[0] if new_addresses else "❌ 未检测到设备"))
+            for device_key, current_value in previous_values.items():
+                combo = self.address_combos[device_key]
+                
+                # 更新选项
+                combo['values'] = new_addresses
+                
+                combo.set(self.choose_address(device_key, current_value, new_addresses))
             
             # 保存配置
             self.save_config()
             
             print(f"✅ 所有设备端口检测完成，发现 {len(new_addresses)} 个可用地址")
-            
-        except Exception as e:
-            print(f"❌ 全局刷新失败: {e}")
-            # 错误时恢复默认状态
-            default_addresses = self.get_default_addresses()
-            for device_key in self.device_keys:
-                if device_key in self.address_combos:
-                    combo = self.address_combos[device_key]
-                    combo['values'] = default_addresses
-                    combo.set("❌ 检测失败")
+        
+        cached_addresses = None if force else self.get_cached_addresses()
+        if cached_addresses is not None:
+            on_finished(cached_addresses)
+            return
+        
+        # 显示所有设备为检测中状态
+        for device_key in previous_values:
+            combo = self.address_combos[device_key]
+            combo['values'] = ["🔍 正在检测..."]
+            combo.set("🔍 正在检测...")
+        
+        self.start_address_discovery(list(previous_values), on_finished)
     
     def get_smart_default_address(self, device_key, available_addresses):
-        """根据设备类型智能选择默认地址"""
-        # 定义设备与IP地址的映射
-        device_ip_mapping = {
-            "oscilloscope": ["192.168.1.100", "192.168.0.100"],
-            "ac_source": ["192.168.1.101", "192.168.0.101"],
-            "electronic_load": ["192.168.1.102", "192.168.0.102"],
-            "control_box": ["192.168.1.103", "192.168.0.103"]
-        }
-        
-        # 查找匹配的地址
-        preferred_ips = device_ip_mapping.get(device_key, [])
-        for ip in preferred_ips:
-            for addr in available_addresses:
-                if ip in addr:
-                    return addr
-        
-        # 如果没有找到匹配的IP，返回None
+        """根据 *IDN? 识别结果选择属于该设备类型的地址，未识别到时返回None"""
+        for addr in available_addresses:
+            identity = self.instrument_identities.get(addr)
+            if identity is not None and identity.role == device_key:
+                return addr
         return None
     
-    def refresh_addresses(self, device_key):
-        """刷新指定设备的地址列表（进行真实设备检测）"""
-        try:
-            print(f"🔄 开始刷新 {device_key} 的地址列表...")
+    def choose_address(self, device_key, current_value, available_addresses):
+        """选择下拉框地址：当前地址已识别为该类型时保持不变，否则优先使用识别出的地址，
+        其次保持原选择，最后使用第一个检测到的地址"""
+        identity = self.instrument_identities.get(current_value)
+        if identity is not None and identity.role == device_key and current_value in available_addresses:
+            return current_value
+        default_addr = self.get_smart_default_address(device_key, available_addresses)
+        if default_addr:
+            return default_addr
+        if current_value in available_addresses:
+            return current_value
+        return available_addresses[0] if available_addresses else "❌ 未检测到设备"
+    
+    def refresh_addresses(self, device_key, force=False):
+        """刷新指定设备的地址列表
+        
+        缓存有效时直接使用缓存的检测结果（过期时后台重新检测）；没有缓存或force=True时进行真实设备检测。
+        """
+        print(f"🔄 开始刷新 {device_key} 的地址列表...")
+        
+        # 获取对应的下拉框
+        if device_key not in self.address_combos:
+            print(f"❌ 未找到 {device_key} 的下拉框")
+            return
             
-            # 获取对应的下拉框
-            if device_key not in self.address_combos:
-                print(f"❌ 未找到 {device_key} 的下拉框")
+        combo = self.address_combos[device_key]
+        current_value = combo.get()
+        
+        def on_finished(new_addresses):
+            if new_addresses is None:
+                # 错误时恢复默认状态
+                print("❌ 刷新地址列表失败")
+                combo['values'] = self.get_default_addresses()
+                combo.set("❌ 检测失败")
                 return
-                
-            combo = self.address_combos[device_key]
-            current_value = combo.get()
             
-            # 显示检测中状态
-            combo['values'] = ["🔍 正在检测设备..."]
-            combo.set("🔍 正在检测设备...")
-            combo.update()  # 强制更新界面
-            
-            # 获取新的地址列表（真实检测）
-            new_addresses = self.get_available_addresses()
             # 合并配置文件中的设备地址，防止配置地址未被检测到时丢失
-            saved_addr = self.config.get("device_addresses", {}).get(device_key)
+            new_addresses = list(new_addresses)
+            saved_addr = self.config_store.get_device_address(device_key)
             if saved_addr and saved_addr not in new_addresses:
                 new_addresses.insert(0, saved_addr)
             
             # 更新下拉框的选项
             combo['values'] = new_addresses
             
-            # 如果当前值仍在新列表中，保持选中；否则使用第一个地址或清空
-            if current_value in new_addresses:
-                combo.set(current_value)
-            elif new_addresses:
-                combo.set(new_addresses[0])  # 使用第一个检测到的地址
-            else:
-                combo.set("❌ 未检测到设备")
+            # 优先使用 *IDN? 识别出的该类型仪器，其次保持原选择，最后使用第一个地址
+            combo.set(self.choose_address(device_key, current_value, new_addresses))
                 
             print(f"✅ 已刷新 {device_key} 的地址列表，发现 {len(new_addresses)} 个可用地址")
-            
-        except Exception as e:
-            print(f"❌ 刷新地址列表失败: {e}")
-            # 错误时恢复默认状态
-            if device_key in self.address_combos:
-                combo = self.address_combos[device_key]
-                combo['values'] = self.get_default_addresses()
-                combo.set("❌ 检测失败")
         
+        cached_addresses = None if force else self.get_cached_addresses()
+        if cached_addresses is not None:
+            on_finished(cached_addresses)
+            return
+        
+        # 显示检测中状态（检测在后台进行，界面不会卡住）
+        combo['values'] = ["🔍 正在检测设备..."]
+        combo.set("🔍 正在检测设备...")
+        
+        self.start_address_discovery([device_key], on_finished)
@@ -12,11 +12,24 @@ import re
 # 添加父目录到路径以导入数据库模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from ConnectDatabase import ReadDataBase
+from instrument_command_cache import get_instrument_command_cache
+from visa_session_manager import get_visa_session_manager
+from scpi_socket_transport import get_scpi_socket_transport
+from scpi_template import parameter_template, render_command, parse_parameter_input
+from lazy_import import lazy_import
+from config_store import get_config_store
 
 # 导入圆角矩形按钮组件
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from rounded_rect_button import RoundedRectButton
 
+from ..data_loader import get_data_loader, LOADING_TEXT
+from ..command_index import CommandIndex, FILTER_ALL
+from ..virtual_table import VirtualTable
+
+# pyserial只在通过串口发送指令时使用
+serial = lazy_import("serial")
+
 
 class InstrumentCommandTab:
     """仪器指令选项卡"""
@@ -165,44 +178,37 @@ class InstrumentCommandTab:
         table_frame = tk.Frame(data_frame, bg='#ffffff')
         table_frame.pack(fill=tk.BOTH, expand=True)
         
-        # 创建Treeview表格
+        # 创建虚拟化表格（只为可见行创建表格项，点击列标题排序，单击参数输入列可直接编辑）
         columns = ('仪器分类', '仪器型号', '功能分类', '指令', '指令参数提醒', '更新时间', '参数输入')
-        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=12)
+        self.table = VirtualTable(table_frame, columns, height=12,
+                                  editable_columns=('参数输入',),
+                                  on_edit=self.on_parameter_edited,
+                                  horizontal_scroll=True)
         
-        # 设置列标题
+        # 设置列宽
         for col in columns:
-            self.tree.heading(col, text=col)
             if col == '指令' or col == '指令参数提醒':
-                self.tree.column(col, width=150, minwidth=150)
+                self.table.column(col, width=150, minwidth=150)
             elif col == '更新时间':
-                self.tree.column(col, width=120, minwidth=120)
+                self.table.column(col, width=120, minwidth=120)
             elif col == '参数输入':
-                self.tree.column(col, width=120, minwidth=120)
+                self.table.column(col, width=120, minwidth=120)
             else:
-                self.tree.column(col, width=100, minwidth=100)
-        
-        # 创建滚动条
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        # 布局表格和滚动条
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        # 配置权重
-        table_frame.grid_rowconfigure(0, weight=1)
-        table_frame.grid_columnconfigure(0, weight=1)
+                self.table.column(col, width=100, minwidth=100)
         
-        # 绑定单击事件用于编辑参数输入列
-        self.tree.bind('<Button-1>', self.on_item_click)
+        self.table.pack(fill=tk.BOTH, expand=True)
         
         # 初始化数据和编辑相关变量
         self.all_data = []  # 存储所有数据
+        self.command_index = CommandIndex()  # 按筛选列建立的索引
         self.parameter_inputs = {}  # 存储每行的参数输入内容
-        self.current_edit_item = None  # 当前编辑的项目
-        self.current_edit_entry = None  # 当前编辑的输入框
+        
+        # 其他选项卡触发的缓存同步拿到新数据时，也刷新本表格
+        # （缓存是进程内共享的，表格销毁时注销监听，避免切换选项卡后残留）
+        loader = get_data_loader(self.parent_frame)
+        self.cache_listener = lambda cache: loader.call_in_ui(self.on_cache_synced)
+        get_instrument_command_cache().add_listener(self.cache_listener)
+        self.table.bind('<Destroy>', self.on_table_destroy, add='+')
         self.load_initial_data()
     
     def create_filter_area(self, parent):
@@ -222,7 +228,7 @@ class InstrumentCommandTab:
                                          width=12)
         self.device_filter.set("全部")
         self.device_filter.grid(row=0, column=1, padx=(0, 10), pady=5, sticky='w')
-        self.device_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+        self.device_filter.bind('<<ComboboxSelected>>', self.on_filter_changed)
         
         # 仪器型号筛选
         model_filter_label = tk.Label(filter_frame, text="仪器型号:", bg='#ffffff', fg='#000000',
@@ -236,7 +242,7 @@ class InstrumentCommandTab:
                                         width=15)
         self.model_filter.set("全部")
         self.model_filter.grid(row=0, column=3, padx=(0, 10), pady=5, sticky='w')
-        self.model_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+        self.model_filter.bind('<<ComboboxSelected>>', self.on_filter_changed)
         
         # 功能分类筛选
         function_filter_label = tk.Label(filter_frame, text="功能分类:", bg='#ffffff', fg='#000000',
@@ -250,7 +256,7 @@ class InstrumentCommandTab:
                                            width=12)
         self.function_filter.set("全部")
         self.function_filter.grid(row=0, column=5, padx=(0, 10), pady=5, sticky='w')
-        self.function_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+        self.function_filter.bind('<<ComboboxSelected>>', self.on_filter_changed)
         
         # 清除筛选按钮容器
         clear_button_container = tk.Frame(filter_frame, bg='#ffffff', width=100, height=40)
@@ -338,230 +344,101 @@ class InstrumentCommandTab:
             
         regenerate_button.bind('<Enter>', on_regenerate_button_enter)
         regenerate_button.bind('<Leave>', on_regenerate_button_leave)
-    
-    def update_filter_options(self):
-        """更新筛选选项"""
-        if not self.all_data:
-            return
         
-        # 获取所有唯一值
-        device_types = sorted(set(cmd['device_type'] for cmd in self.all_data if cmd['device_type']))
-        device_models = sorted(set(cmd['device_model'] for cmd in self.all_data if cmd['device_model']))
-        function_types = sorted(set(cmd['function_type'] for cmd in self.all_data if cmd['function_type']))
-        
-        # 更新下拉框选项
-        self.device_filter['values'] = ["全部"] + device_types
-        self.model_filter['values'] = ["全部"] + device_models
-        self.function_filter['values'] = ["全部"] + function_types
+        # 通信方式选择：VISA 或 原始Socket（快速通道）
+        transport_label = tk.Label(filter_frame, text="通信方式:", bg='#ffffff', fg='#000000',
+                                   font=('Microsoft YaHei', 10))
+        transport_label.grid(row=0, column=9, padx=(10, 5), pady=5, sticky='w')
+        
+        self.transport_combo = ttk.Combobox(filter_frame,
+                                            values=["VISA", "Socket"],
+                                            state="readonly",
+                                            style="Orange.TCombobox",
+                                            width=8)
+        self.transport_combo.set("VISA")
+        self.transport_combo.grid(row=0, column=10, padx=(0, 5), pady=5, sticky='w')
     
-    def apply_filters(self, event=None):
-        """应用筛选条件"""
-        # 获取筛选条件
-        device_filter = self.device_filter.get()
-        model_filter = self.model_filter.get()
-        function_filter = self.function_filter.get()
-        
-        # 清空表格
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # 筛选数据并显示
-        for cmd in self.all_data:
-            # 检查是否匹配筛选条件
-            device_match = (device_filter == "全部" or cmd['device_type'] == device_filter)
-            model_match = (model_filter == "全部" or cmd['device_model'] == model_filter)
-            function_match = (function_filter == "全部" or cmd['function_type'] == function_filter)
-            
-            if device_match and model_match and function_match:
-                # 创建行标识
-                row_key = f"{cmd['device_type']}|{cmd['device_model']}|{cmd['function_type']}"
-                
-                # 获取参数输入值，如果没有则生成默认模板
-                param_input = self.parameter_inputs.get(row_key, "")
-                if not param_input:
-                    # 根据指令内容生成默认模板
-                    default_template = self.generate_parameter_template(cmd['command'])
-                    param_input = default_template
-                    # 保存默认模板到字典中
-                    self.parameter_inputs[row_key] = param_input
-                    print(f"🔄 为行 {row_key} 生成新模板: {param_input}")
-                else:
-                    print(f"📋 使用已有模板 {row_key}: {param_input}")
-                
-                self.tree.insert('', 'end', values=(
-                    cmd['device_type'],
-                    cmd['device_model'],
-                    cmd['function_type'],
-                    cmd['command'],
-                    cmd['params_reminder'],
-                    cmd['update_time'],
-                    param_input  # 添加参数输入列
-                ))
+    def update_filter_options(self):
+        """更新筛选选项（级联：型号选项限定在所选仪器分类内，功能选项限定在所选分类和型号内）
+        
+        同步后已不存在的筛选值重置为"全部"，避免表格为空而所选的值又不在下拉列表中
+        """
+        index = self.command_index
+        
+        device_types = index.values('device_type')
+        if self.device_filter.get() not in device_types:
+            self.device_filter.set(FILTER_ALL)
+        self.device_filter['values'] = [FILTER_ALL] + device_types
+        
+        device_models = index.values('device_model', device_type=self.device_filter.get())
+        if self.model_filter.get() not in device_models:
+            self.model_filter.set(FILTER_ALL)
+        self.model_filter['values'] = [FILTER_ALL] + device_models
+        
+        function_types = index.values('function_type', device_type=self.device_filter.get(),
+                                      device_model=self.model_filter.get())
+        if self.function_filter.get() not in function_types:
+            self.function_filter.set(FILTER_ALL)
+        self.function_filter['values'] = [FILTER_ALL] + function_types
     
-    def on_item_click(self, event):
-        """处理表格单击事件"""
-        # 获取点击的项目和列
-        item = self.tree.identify('item', event.x, event.y)
-        column = self.tree.identify('column', event.x, event.y)
-        
-        if not item:
-            return
-        
-        # 检查是否点击了参数输入列（第7列，索引为#7）
-        if column == '#7':
-            self.start_inline_edit(item, event.x, event.y)
+    def on_filter_changed(self, event=None):
+        """筛选条件变化时先收窄下级筛选选项，再刷新表格"""
+        self.update_filter_options()
+        self.apply_filters()
     
-    def start_inline_edit(self, item, x, y):
-        """开始行内编辑"""
-        # 如果已有编辑框在编辑，先结束之前的编辑
-        self.end_current_edit()
-        
-        # 获取单元格的位置和大小
-        bbox = self.tree.bbox(item, '#7')
-        if not bbox:
-            return
-        
-        # 获取当前行的数据
-        values = self.tree.item(item, 'values')
-        if not values:
-            return
-        
-        # 创建数据行的唯一标识（使用前三列组合）
-        row_key = f"{values[0]}|{values[1]}|{values[2]}"
-        
-        # 获取指令内容来生成默认模板
-        command_content = values[3] if len(values) > 3 else ""
-        default_template = self.generate_parameter_template(command_content)
-        
-        # 获取当前参数输入值，如果为空则使用默认模板
-        current_value = self.parameter_inputs.get(row_key, "")
-        if not current_value:
-            current_value = default_template
-        
-        # 创建输入框
-        self.current_edit_entry = tk.Entry(self.tree, font=('Consolas', 9))
-        self.current_edit_entry.place(x=bbox[0], y=bbox[1], width=bbox[2], height=bbox[3])
-        self.current_edit_entry.insert(0, current_value)
-        self.current_edit_entry.focus_set()
-        self.current_edit_entry.select_range(0, tk.END)
-        
-        # 保存当前编辑的项目信息
-        self.current_edit_item = item
-        self.current_edit_row_key = row_key
-        
-        # 绑定事件
-        self.current_edit_entry.bind('<Return>', self.save_inline_edit)
-        self.current_edit_entry.bind('<Escape>', self.cancel_inline_edit)
-        self.current_edit_entry.bind('<FocusOut>', self.save_inline_edit)
+    def apply_filters(self, event=None, on_done=None):
+        """应用筛选条件（结果在空闲时分片填充，筛选再次变化时未完成的填充自动取消）"""
+        # 通过索引求交得到满足筛选条件的数据
+        filtered = self.command_index.query(device_type=self.device_filter.get(),
+                                            device_model=self.model_filter.get(),
+                                            function_type=self.function_filter.get())
+        
+        # 显示筛选结果（以 仪器分类|型号|功能分类 作为行key）
+        self.table.set_rows_chunked(self.iter_filtered_rows(filtered), on_done=on_done)
     
-    def generate_parameter_template(self, command_text):
-        """根据指令内容生成参数模板"""
-        if not command_text:
-            return ""
-        
-        # 查找参数名称，专门处理 value + 数字的格式
-        import re
-        
-        # 查找 "value" 后跟数字的模式，如 value1, value2 等
-        # 改进的正则表达式，不要求前面有单词边界，但要求后面有边界或者结尾
-        value_pattern = r'value\d*(?=\b|:|;|$|\s)'
-        value_matches = re.findall(value_pattern, command_text, re.IGNORECASE)
-        
-        params = []
-        if value_matches:
-            # 去重并排序参数，保持value1, value2的顺序
-            unique_params = list(set(value_matches))
+    def iter_filtered_rows(self, filtered):
+        """逐行生成表格数据（在填充片段中按需生成参数模板）"""
+        for cmd in filtered:
+            # 创建行标识
+            row_key = f"{cmd['device_type']}|{cmd['device_model']}|{cmd['function_type']}"
             
-            # 自定义排序：value (不带数字) 排在最前，然后按数字排序
-            def sort_key(param):
-                if param.lower() == 'value':
-                    return (0, 0)  # value排在最前
-                else:
-                    # 提取数字部分进行排序
-                    match = re.search(r'(\d+)$', param)
-                    if match:
-                        return (1, int(match.group(1)))
-                    else:
-                        return (2, 0)  # 其他情况
+            # 获取参数输入值，如果没有则生成默认模板
+            param_input = self.parameter_inputs.get(row_key, "")
+            if not param_input:
+                # 根据指令内容生成默认模板
+                default_template = self.generate_parameter_template(cmd['command'])
+                param_input = default_template
+                # 保存默认模板到字典中
+                self.parameter_inputs[row_key] = param_input
             
-            params = sorted(unique_params, key=sort_key)
-            print(f"🔍 从指令 '{command_text}' 中提取到参数: {params}")
-        else:
-            # 如果没有找到 value 参数，返回空字符串
-            print(f"ℹ️ 指令 '{command_text}' 中未找到value参数")
-            return ""
-        
-        # 生成模板，格式为 value1=?;value2=?;
-        template_parts = []
-        for param in params:
-            template_parts.append(f"{param}=?")
-        
-        # 用分号连接并在最后添加分号
-        result = ";".join(template_parts) + ";" if template_parts else ""
-        print(f"✅ 生成参数模板: {result}")
-        return result
+            yield (row_key, (
+                cmd['device_type'],
+                cmd['device_model'],
+                cmd['function_type'],
+                cmd['command'],
+                cmd['params_reminder'],
+                cmd['update_time'],
+                param_input  # 添加参数输入列
+            ))
     
-    def replace_command_parameters(self, command, params):
-        """将参数值替换到指令中"""
-        import re
-        
-        final_command = command
-        print(f"🔧 开始替换参数...")
-        print(f"原始指令: {command}")
-        print(f"参数字典: {params}")
-        
-        # 按照参数在指令中出现的顺序进行替换
-        for param_name, param_value in params.items():
-            if param_value and param_value != '?':
-                print(f"🔄 正在替换参数 {param_name} -> {param_value}")
-                # 改进的正则表达式，确保能匹配像 CHvalue1 这样的情况
-                # 不要求前面有单词边界，但要求后面有边界或特定字符
-                pattern = r'(' + re.escape(param_name) + r')(?=\b|:|;|$|\s)'
-                old_command = final_command
-                final_command = re.sub(pattern, param_value, final_command)
-                print(f"   替换前: {old_command}")
-                print(f"   替换后: {final_command}")
-        
-        print(f"✅ 最终指令: {final_command}")
-        return final_command
-    
-    def save_inline_edit(self, event=None):
-        """保存行内编辑"""
-        if not self.current_edit_entry or not self.current_edit_item:
-            return
-        
-        # 获取新值
-        new_value = self.current_edit_entry.get()
-        
-        # 保存到参数输入字典
-        self.parameter_inputs[self.current_edit_row_key] = new_value
-        
-        # 更新表格显示
-        values = list(self.tree.item(self.current_edit_item, 'values'))
-        values[6] = new_value  # 参数输入列是第7列（索引6）
-        self.tree.item(self.current_edit_item, values=values)
-        
-        # 结束编辑
-        self.end_current_edit()
+    def on_parameter_edited(self, row_key, column, value):
+        """参数输入列行内编辑保存后，记录该行的参数输入"""
+        self.parameter_inputs[row_key] = value
     
-    def cancel_inline_edit(self, event=None):
-        """取消行内编辑"""
-        self.end_current_edit()
+    def generate_parameter_template(self, command_text):
+        """根据指令内容生成参数模板，如 value1=?;value2=?;（只列出valueN参数）"""
+        return parameter_template(command_text, brackets=False)
     
-    def end_current_edit(self):
-        """结束当前编辑"""
-        if self.current_edit_entry:
-            self.current_edit_entry.destroy()
-            self.current_edit_entry = None
-        self.current_edit_item = None
-        self.current_edit_row_key = None
+    def replace_command_parameters(self, command, params):
+        """将参数值替换到指令中"""
+        return render_command(command, params)
     
     def clear_filters(self):
         """清除所有筛选条件"""
-        self.device_filter.set("全部")
-        self.model_filter.set("全部")
-        self.function_filter.set("全部")
-        self.apply_filters()
+        self.device_filter.set(FILTER_ALL)
+        self.model_filter.set(FILTER_ALL)
+        self.function_filter.set(FILTER_ALL)
+        self.on_filter_changed()
     
     def regenerate_parameter_templates(self):
         """重新生成所有参数模板"""
@@ -571,9 +448,11 @@ class InstrumentCommandTab:
         self.parameter_inputs.clear()
         
         # 重新应用筛选，这会触发参数模板的重新生成
-        self.apply_filters()
-        
-        print("✅ 参数模板重新生成完成")
+        self.apply_filters(on_done=self.on_parameter_templates_regenerated)
+    
+    def on_parameter_templates_regenerated(self, row_count):
+        """参数模板重新生成（表格填充）完成后提示"""
+        print(f"✅ 参数模板重新生成完成，共 {row_count} 行")
         
         # 显示提示信息
         from tkinter import messagebox
@@ -582,7 +461,7 @@ class InstrumentCommandTab:
     def send_selected_command(self):
         """发送选中的指令"""
         # 获取当前选中的项目
-        selected_items = self.tree.selection()
+        selected_items = self.table.selection()
         
         if not selected_items:
             messagebox.showwarning("提示", "请先选择要发送的指令行")
@@ -594,7 +473,7 @@ class InstrumentCommandTab:
         
         # 获取选中行的数据
         selected_item = selected_items[0]
-        values = self.tree.item(selected_item, 'values')
+        values = self.table.get_values(selected_item)
         
         if not values or len(values) < 7:
             messagebox.showerror("错误", "选中行数据不完整")
@@ -617,13 +496,7 @@ class InstrumentCommandTab:
         if param_input and param_input.strip():
             try:
                 # 解析参数输入 (格式: value1=?;value2=?; 或 value1=2;value2=3;)
-                params = {}
-                # 移除末尾的分号并按分号分割
-                param_pairs = param_input.strip().rstrip(';').split(';')
-                for pair in param_pairs:
-                    if '=' in pair:
-                        key, value = pair.split('=', 1)
-                        params[key.strip()] = value.strip()
+                params = parse_parameter_input(param_input)
                 
                 # 检查是否所有参数都有实际值（不是'?'）
                 has_actual_values = all(value != '?' for value in params.values())
@@ -691,22 +564,48 @@ class InstrumentCommandTab:
                 print(f"❌ 指令发送失败: {e}")
     
     def load_initial_data(self):
-        """加载初始数据"""
+        """加载初始数据：先显示本地缓存，再在后台从数据库增量同步"""
         try:
-            # 从数据库获取数据
-            db = ReadDataBase()
-            self.all_data = db.get_all_instrument_commands()
-            
-            # 更新筛选选项
-            self.update_filter_options()
-            
-            # 应用当前筛选条件显示数据
-            self.apply_filters()
+            self.show_cached_data()
+            self.start_cache_sync()
                 
         except Exception as e:
             messagebox.showerror("错误", f"加载数据时发生错误：{str(e)}")
             print(f"Error loading data: {e}")
     
+    def show_cached_data(self):
+        """从本地缓存读取数据并刷新表格"""
+        cache = get_instrument_command_cache()
+        self.cache_version = cache.version
+        self.all_data = cache.get_all()
+        self.command_index = CommandIndex(self.all_data)
+        # 更新筛选选项
+        self.update_filter_options()
+        
+        # 应用当前筛选条件显示数据
+        self.apply_filters()
+    
+    def start_cache_sync(self):
+        """在后台线程中从数据库增量同步，不阻塞界面"""
+        if not self.all_data:
+            self.table.set_placeholder(LOADING_TEXT)
+        get_data_loader(self.parent_frame).submit(
+            get_instrument_command_cache().sync,
+            on_success=lambda changed: self.on_cache_synced(),
+            on_error=lambda e: self.on_cache_synced(),
+            name="同步仪器指令")
+    
+    def on_table_destroy(self, event):
+        """表格销毁时注销缓存监听"""
+        if event.widget is self.table:
+            get_instrument_command_cache().remove_listener(self.cache_listener)
+
+    def on_cache_synced(self):
+        """后台同步完成（主线程回调），缓存有新数据时刷新表格"""
+        self.table.set_placeholder(None)
+        if get_instrument_command_cache().version != self.cache_version:
+            self.show_cached_data()
+    
     def on_device_changed(self, event):
         """仪器分类变化时更新仪器型号选项"""
         selected_device = self.device_combo.get()
@@ -807,16 +706,11 @@ class InstrumentCommandTab:
     def get_oscilloscope_address(self):
         """获取示波器地址"""
         try:
-            config_path = r"D:\Power Test Integrate System\System Information.json"
-            
-            # 读取配置文件
-            if os.path.exists(config_path):
-                import json
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    
+            # 从共享的内存配置读取（文件修改后才重新解析）
+            config_store = get_config_store()
+            if config_store.exists():
                 # 获取示波器地址
-                oscilloscope_address = config.get("device_addresses", {}).get("oscilloscope")
+                oscilloscope_address = config_store.get_device_address("oscilloscope")
                 if oscilloscope_address:
                     print(f"📍 获取示波器地址: {oscilloscope_address}")
                     return oscilloscope_address
@@ -863,9 +757,10 @@ class InstrumentCommandTab:
             print(f"📍 设备地址: {device_address}")
             print(f"📋 指令内容: {command}")
             
-            # 解析TCPIP地址格式: TCPIP0::172.19.71.22::inst0::INSTR 或 TCPIP::192.168.1.100::INSTR
+            # 解析TCPIP地址格式: TCPIP0::172.19.71.22::inst0::INSTR、TCPIP::192.168.1.100::INSTR、
+            # TCPIP0::172.19.71.22::hislip0::INSTR 或 TCPIP0::172.19.71.22::5025::SOCKET
             import re
-            match = re.match(r'TCPIP\d*::(.+?)::(?:inst\d+::)?INSTR', device_address)
+            match = re.match(r'TCPIP\d*::([^:]+)::(?:(?:inst|hislip)\d+::INSTR|\d+::SOCKET|INSTR)$', device_address)
             if not match:
                 print(f"❌ 无效的TCPIP地址格式: {device_address}")
                 return False
@@ -873,26 +768,25 @@ class InstrumentCommandTab:
             ip_address = match.group(1)
             print(f"🔍 解析出IP地址: {ip_address}")
             
-            # 尝试使用VISA进行通信（如果可用）
+            # 选择Socket快速通道时直接使用原始Socket通信
+            if self.transport_combo.get() == "Socket":
+                return self.send_socket_command(command, ip_address, device_type)
+            
+            # 尝试使用VISA进行通信（如果可用），复用已打开的会话
             try:
-                import pyvisa
                 print("🔍 尝试使用PyVISA进行通信...")
-                rm = pyvisa.ResourceManager()
-                instrument = rm.open_resource(device_address)
+                session_manager = get_visa_session_manager()
+                response = session_manager.send(device_address, command)
                 
-                # 发送指令
                 if command.endswith('?'):
                     # 查询指令
-                    response = instrument.query(command)
                     print(f"📤 发送查询: {command}")
                     print(f"📥 设备响应: {response}")
                 else:
                     # 控制指令
-                    instrument.write(command)
                     print(f"📤 发送指令: {command}")
                 
-                instrument.close()
-                print("✅ VISA通信成功完成")
+                print(f"✅ VISA通信成功完成 {session_manager.get_stats()}")
                 return True
                 
             except ImportError:
@@ -911,36 +805,26 @@ class InstrumentCommandTab:
             return False
     
     def send_socket_command(self, command, ip_address, device_type):
-        """使用Socket发送指令（备用方案）"""
+        """使用Socket发送指令（快速通道，或VISA失败时的备用方案）"""
         try:
-            import socket
-            
-            # 常用的仪器端口
-            ports = [5025, 23, 5024, 9999]  # SCPI标准端口和其他常用端口
-            
-            for port in ports:
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                        sock.settimeout(3)  # 3秒超时
-                        sock.connect((ip_address, port))
-                        
-                        # 发送指令
-                        sock.sendall((command + '\n').encode('utf-8'))
-                        
-                        if command.endswith('?'):
-                            # 查询指令，等待响应
-                            response = sock.recv(1024).decode('utf-8').strip()
-                            print(f"📤 Socket发送查询到 {ip_address}:{port}: {command}")
-                            print(f"📥 设备响应: {response}")
-                        else:
-                            print(f"📤 Socket发送指令到 {ip_address}:{port}: {command}")
-                        
-                        return True
-                        
-                except (socket.timeout, ConnectionRefusedError, OSError):
-                    continue  # 尝试下一个端口
+            # 复用保持打开的连接，端口探测结果按IP缓存
+            transport = get_scpi_socket_transport()
+            try:
+                response = transport.send(ip_address, command)
+                port = transport.get_port(ip_address)
+                
+                if command.endswith('?'):
+                    # 查询指令
+                    print(f"📤 Socket发送查询到 {ip_address}:{port}: {command}")
+                    print(f"📥 设备响应: {response}")
+                else:
+                    print(f"📤 Socket发送指令到 {ip_address}:{port}: {command}")
+                
+                return True
+                
+            except OSError as socket_error:
+                print(f"⚠️ {socket_error}")
             
-            print(f"⚠️ 无法连接到设备 {ip_address}，尝试的端口: {ports}")
             # 即使连接失败也返回True，表示指令已尝试发送
             print(f"📤 指令已发送（模拟）: {command}")
             return True
@@ -952,10 +836,8 @@ class InstrumentCommandTab:
     def send_serial_command(self, command, device_address, device_type):
         """通过串口发送指令"""
         try:
-            # 尝试使用pyserial
+            # 尝试使用pyserial（未安装时访问属性抛出ImportError）
             try:
-                import serial
-                
                 # 解析COM口地址
                 com_port = device_address
                 
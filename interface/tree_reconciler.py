@@ -0,0 +1,131 @@
+"""
+Treeview差异更新
+每条记录使用固定的项目ID，刷新时只插入新记录、用 detach/move 隐藏或重新排列记录、
+只更新内容变化的单元格，避免每次清空后全部重新插入（同时保留滚动位置和选中状态）
+"""
+import time
+
+
+class ReconcileStats:
+    """一次刷新的统计"""
+
+    __slots__ = ('inserted', 'reattached', 'moved', 'updated', 'detached', 'unchanged', 'elapsed')
+
+    def __init__(self):
+        self.inserted = 0      # 新插入的行
+        self.reattached = 0    # 之前隐藏、重新显示的行
+        self.moved = 0         # 调整了位置的行
+        self.updated = 0       # 内容或标签变化的行
+        self.detached = 0      # 隐藏的行
+        self.unchanged = 0     # 位置和内容都没有变化的行
+        self.elapsed = 0.0     # 耗时（毫秒）
+
+    def __str__(self):
+        return (f"插入 {self.inserted}，重新显示 {self.reattached}，移动 {self.moved}，"
+                f"更新 {self.updated}，隐藏 {self.detached}，未变 {self.unchanged}，"
+                f"耗时 {self.elapsed:.1f}ms")
+
+
+def _longest_increasing_run(sequence):
+    """返回最长递增子序列中元素在sequence里的下标集合（O(n log n)）"""
+    tails = []          # tails[k]: 长度为k+1的递增子序列结尾元素在sequence中的下标
+    previous = [-1] * len(sequence)
+    for i, value in enumerate(sequence):
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if sequence[tails[mid]] < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low > 0:
+            previous[i] = tails[low - 1]
+        if low == len(tails):
+            tails.append(i)
+        else:
+            tails[low] = i
+
+    result = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        result.add(i)
+        i = previous[i]
+    return result
+
+
+class TreeReconciler:
+    """让Treeview根节点下的行与给定的记录列表保持一致"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._items = {}        # 项目ID -> (values, tags)，包括已隐藏的行
+        self._attached = []     # 当前显示的项目ID（按显示顺序）
+
+    def reconcile(self, rows):
+        """rows: 按显示顺序排列的 (项目ID, values, tags) 列表，返回ReconcileStats"""
+        start_time = time.perf_counter()
+        tree = self.tree
+        stats = ReconcileStats()
+        rows = list(rows)
+        positions = {item_id: index for index, (item_id, _, _) in enumerate(rows)}
+
+        # 仍然显示的行中，保持相对顺序的最长子序列不需要移动，其余行先隐藏再放到新位置
+        remaining = [item_id for item_id in self._attached if item_id in positions]
+        stable_indexes = _longest_increasing_run([positions[item_id] for item_id in remaining])
+        stable = {item_id for i, item_id in enumerate(remaining) if i in stable_indexes}
+
+        to_detach = [item_id for item_id in self._attached if item_id not in stable]
+        if to_detach:
+            tree.detach(*to_detach)
+        stats.detached = len(self._attached) - len(remaining)
+        previously_attached = set(remaining)
+
+        # 此时显示的只有stable中的行，且顺序正确；按目标顺序逐个放入其余行
+        for index, (item_id, values, tags) in enumerate(rows):
+            values = tuple(values)
+            tags = tuple(tags)
+            known = self._items.get(item_id)
+            if known is None:
+                tree.insert('', index, iid=item_id, values=values, tags=tags)
+                stats.inserted += 1
+                self._items[item_id] = (values, tags)
+                continue
+
+            if known != (values, tags):
+                tree.item(item_id, values=values, tags=tags)
+                self._items[item_id] = (values, tags)
+                stats.updated += 1
+
+            if item_id in stable:
+                if known == (values, tags):
+                    stats.unchanged += 1
+            else:
+                tree.move(item_id, '', index)
+                if item_id in previously_attached:
+                    stats.moved += 1
+                else:
+                    stats.reattached += 1
+
+        self._attached = [item_id for item_id, _, _ in rows]
+        stats.elapsed = (time.perf_counter() - start_time) * 1000
+        return stats
+
+    def prune(self, valid_ids):
+        """删除已不在valid_ids中的行（数据源删除记录后调用，避免隐藏的行越积越多）"""
+        valid_ids = set(valid_ids)
+        obsolete = [item_id for item_id in self._items if item_id not in valid_ids]
+        if not obsolete:
+            return 0
+        self.tree.delete(*obsolete)
+        for item_id in obsolete:
+            del self._items[item_id]
+        obsolete_set = set(obsolete)
+        self._attached = [item_id for item_id in self._attached if item_id not in obsolete_set]
+        return len(obsolete)
+
+    def clear(self):
+        """删除所有由本对象管理的行"""
+        if self._items:
+            self.tree.delete(*self._items)
+        self._items.clear()
+        self._attached = []
@@ -0,0 +1,463 @@
+"""
+虚拟化表格
+只为可见区域（加少量预留行）创建Treeview行，滚动时复用这些行显示列式存储中的数据；
+支持点击列标题按任意列排序、单元格行内编辑，数万行数据也不会拖慢界面
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from .chunked_populator import ChunkedPopulator
+
+DEFAULT_ROW_HEIGHT = 20      # 无法测量时使用的行高（像素）
+DEFAULT_HEADER_HEIGHT = 25   # 无法测量时使用的表头高度（像素）
+WHEEL_ROWS = 3               # 鼠标滚轮每格滚动的行数
+
+# Shift / Control 修饰键的 event.state 位
+_MODIFIER_MASK = 0x0001 | 0x0004
+
+
+def _sort_value(value):
+    """排序键：None排在最前，其余按字符串比较（避免不同类型无法比较）"""
+    return "" if value is None else str(value)
+
+
+class ColumnStore:
+    """列式数据存储：每列一个列表，每行有一个唯一的key"""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.clear()
+
+    def clear(self):
+        self.keys = []
+        self.data = {column: [] for column in self.columns}
+        self._positions = {}
+
+    def load(self, rows):
+        """rows: (key, values) 序列，values按columns顺序排列"""
+        self.clear()
+        self.append(rows)
+
+    def append(self, rows):
+        """在末尾追加行（key已存在的行会重复，调用方需保证key唯一）"""
+        keys = self.keys
+        column_lists = [self.data[column] for column in self.columns]
+        for key, values in rows:
+            self._positions[key] = len(keys)
+            keys.append(key)
+            for column_values, value in zip(column_lists, values):
+                column_values.append(value)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def position(self, key):
+        return self._positions.get(key)
+
+    def row(self, position):
+        return tuple(self.data[column][position] for column in self.columns)
+
+    def get(self, key, column):
+        return self.data[column][self._positions[key]]
+
+    def set(self, key, column, value):
+        self.data[column][self._positions[key]] = value
+
+
+class VirtualTable(tk.Frame):
+    """窗口化表格：Treeview中只保留 可见行数+overscan 个项目，按滚动位置填充数据
+
+    行用key标识（selection()、see() 等接口均使用key），数据通过 set_rows() 整体替换。
+    """
+
+    def __init__(self, parent, columns, headings=None, height=12, overscan=3,
+                 editable_columns=(), on_edit=None, striped=False, horizontal_scroll=False,
+                 selectmode='extended', edit_font=('Consolas', 9)):
+        super().__init__(parent, bg='#ffffff')
+        self.columns = tuple(columns)
+        self.headings = dict(zip(self.columns, headings or self.columns))
+        self.store = ColumnStore(self.columns)
+        self.overscan = overscan
+        self.editable_columns = set(editable_columns)
+        self.on_edit = on_edit          # on_edit(key, column, value)：行内编辑保存后回调
+        self.striped = striped
+        self.edit_font = edit_font
+
+        self._order = []                # 视图顺序（排序后）中每一行在store中的位置
+        self._view_index = None         # store位置 -> 视图下标（懒计算）
+        self._top = 0                   # 第一个可见行的视图下标
+        self._visible_rows = height     # 当前高度能显示的行数
+        self._row_height = DEFAULT_ROW_HEIGHT
+        self._header_height = DEFAULT_HEADER_HEIGHT
+        self._pool = []                 # 复用的Treeview项目ID
+        self._rendered = {}             # 项目ID -> 当前显示的 (key, values, tags)
+        self._slot_keys = {}            # 项目ID -> 显示的行key
+        self._selected = set()          # 选中的行key（包括滚出可见区域的行）
+        self._cursor = None             # 键盘焦点所在行的key
+        self._sort_column = None
+        self._sort_descending = False
+        self._placeholder = None        # 没有数据时显示的提示文字
+        self._edit_entry = None
+        self._edit_key = None
+        self._edit_column = None
+        self._populator = ChunkedPopulator(self)
+        self._staging = None            # 分片填充中尚未显示的新数据
+        self._progress_label = None
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings',
+                                 height=height, selectmode=selectmode)
+        for column in self.columns:
+            self.tree.heading(column, text=self.headings[column],
+                              command=lambda c=column: self.toggle_sort(c))
+        if striped:
+            self.tree.tag_configure('even', background='#f0f0f0')
+            self.tree.tag_configure('odd', background='#ffffff')
+
+        self.v_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        if horizontal_scroll:
+            h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+            self.tree.configure(xscrollcommand=h_scrollbar.set)
+            h_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize, add='+')
+        self.tree.bind('<Button-1>', self._on_click, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select, add='+')
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_rows(-WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_rows(WHEEL_ROWS))
+        self.tree.bind('<Up>', lambda e: self._move_cursor(-1))
+        self.tree.bind('<Down>', lambda e: self._move_cursor(1))
+        self.tree.bind('<Prior>', lambda e: self._move_cursor(-self._visible_rows))
+        self.tree.bind('<Next>', lambda e: self._move_cursor(self._visible_rows))
+        self.tree.bind('<Home>', lambda e: self._move_cursor(-len(self._order)))
+        self.tree.bind('<End>', lambda e: self._move_cursor(len(self._order)))
+
+    # ---- 数据 ----
+
+    def set_rows(self, rows):
+        """替换全部数据：rows为 (key, values) 序列；保留排序方式、滚动位置和仍存在的选中行"""
+        self.cancel_population()
+        store = ColumnStore(self.columns)
+        store.load(rows)
+        self._replace_store(store)
+
+    def set_rows_chunked(self, rows, on_progress=None, on_done=None):
+        """分片替换全部数据：rows（可以是生成器）在多个空闲片段中读取，读完后一次性显示
+
+        填充期间表格继续显示旧数据并提示进度；再次调用 set_rows / set_rows_chunked
+        会取消尚未完成的填充。返回本次填充的代号。
+        """
+        self.cancel_population()
+        self._staging = ColumnStore(self.columns)
+
+        def progress(done, total):
+            text = f"正在填充 {done}/{total} 行" if total else f"正在填充 {done} 行"
+            self._show_progress(text)
+            if on_progress:
+                on_progress(done, total)
+
+        def finished(done):
+            store, self._staging = self._staging, None
+            self._show_progress(None)
+            self._replace_store(store)
+            if on_done:
+                on_done(done)
+
+        return self._populator.start(rows, self._staging.append, progress, finished)
+
+    def cancel_population(self):
+        """取消尚未完成的分片填充（表格保持原有数据）"""
+        if self._staging is not None:
+            self._populator.cancel()
+            self._staging = None
+            self._show_progress(None)
+
+    def _replace_store(self, store):
+        self.end_edit(save=True)
+        self.store = store
+        self._selected = {key for key in self._selected if key in self.store}
+        if self._cursor not in self.store:
+            self._cursor = None
+        self._apply_sort()
+        self._render()
+
+    def set_placeholder(self, text):
+        """设置没有数据时显示的提示（如"正在加载"），text为None时取消"""
+        self._placeholder = text
+        self._render()
+
+    def get_values(self, key):
+        """返回一行的值（按columns顺序）"""
+        return self.store.row(self.store.position(key))
+
+    def get_value(self, key, column):
+        return self.store.get(key, column)
+
+    def set_value(self, key, column, value):
+        self.store.set(key, column, value)
+        self._render()
+
+    def __len__(self):
+        return len(self._order)
+
+    # ---- 选择与滚动 ----
+
+    def selection(self):
+        """返回选中行的key（按显示顺序）"""
+        view_index = self._get_view_index()
+        positions = [self.store.position(key) for key in self._selected]
+        return [self.store.keys[position]
+                for position in sorted(positions, key=view_index.__getitem__)]
+
+    def selection_set(self, keys):
+        self._selected = {key for key in keys if key in self.store}
+        self._render()
+
+    def see(self, key):
+        """滚动到能看见该行"""
+        position = self.store.position(key)
+        if position is None:
+            return
+        index = self._get_view_index()[position]
+        if index < self._top:
+            self.scroll_to(index)
+        elif index >= self._top + self._visible_rows:
+            self.scroll_to(index - self._visible_rows + 1)
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self._order) - self._visible_rows))
+        if top != self._top:
+            self.end_edit(save=True)
+            self._top = top
+            self._render()
+
+    def scroll_rows(self, delta):
+        self.scroll_to(self._top + delta)
+        return 'break'
+
+    def key_at(self, y):
+        """返回y坐标处的行key（没有行时返回None）"""
+        return self._slot_keys.get(self.tree.identify_row(y))
+
+    def bind_rows(self, sequence, callback):
+        """在表格上绑定事件（不覆盖表格自身的绑定）"""
+        self.tree.bind(sequence, callback, add='+')
+
+    def column(self, column, **options):
+        return self.tree.column(column, **options)
+
+    # ---- 排序 ----
+
+    def toggle_sort(self, column):
+        """点击列标题：同一列再次点击时切换升序/降序"""
+        descending = not self._sort_descending if column == self._sort_column else False
+        self.sort_by(column, descending)
+
+    def sort_by(self, column, descending=False):
+        self.end_edit(save=True)
+        if self._sort_column and self._sort_column != column:
+            self.tree.heading(self._sort_column, text=self.headings[self._sort_column])
+        self._sort_column = column
+        self._sort_descending = descending
+        arrow = " ▼" if descending else " ▲"
+        self.tree.heading(column, text=self.headings[column] + arrow)
+        self._apply_sort()
+        self._render()
+
+    def _apply_sort(self):
+        order = list(range(len(self.store)))
+        if self._sort_column is not None:
+            column_values = self.store.data[self._sort_column]
+            order.sort(key=lambda position: _sort_value(column_values[position]),
+                       reverse=self._sort_descending)
+        self._order = order
+        self._view_index = None
+        self._top = max(0, min(self._top, len(order) - self._visible_rows))
+
+    def _get_view_index(self):
+        if self._view_index is None:
+            self._view_index = {position: index for index, position in enumerate(self._order)}
+        return self._view_index
+
+    # ---- 行内编辑 ----
+
+    def start_edit(self, key, column):
+        """在单元格上打开输入框编辑（回车/失去焦点保存，Esc取消）"""
+        self.end_edit(save=True)
+        self.see(key)
+        item_id = next((item_id for item_id, slot_key in self._slot_keys.items()
+                        if slot_key == key), None)
+        if item_id is None:
+            return
+        bbox = self.tree.bbox(item_id, column)
+        if not bbox:
+            return
+
+        entry = tk.Entry(self.tree, font=self.edit_font)
+        entry.place(x=bbox[0], y=bbox[1], width=bbox[2], height=bbox[3])
+        value = self.store.get(key, column)
+        entry.insert(0, "" if value is None else str(value))
+        entry.focus_set()
+        entry.select_range(0, tk.END)
+        entry.bind('<Return>', lambda e: self.end_edit(save=True))
+        entry.bind('<KP_Enter>', lambda e: self.end_edit(save=True))
+        entry.bind('<Escape>', lambda e: self.end_edit(save=False))
+        entry.bind('<FocusOut>', lambda e: self.end_edit(save=True))
+        self._edit_entry = entry
+        self._edit_key = key
+        self._edit_column = column
+
+    def end_edit(self, save=True):
+        """结束当前编辑；save为True时保存输入框内容并回调on_edit"""
+        entry = self._edit_entry
+        if entry is None:
+            return
+        key, column = self._edit_key, self._edit_column
+        value = entry.get()
+        self._edit_entry = self._edit_key = self._edit_column = None
+        entry.destroy()
+        if save and key in self.store:
+            self.store.set(key, column, value)
+            if self._staging is not None and key in self._staging:
+                self._staging.set(key, column, value)
+            self._render()
+            if self.on_edit:
+                self.on_edit(key, column, value)
+
+    # ---- 绘制 ----
+
+    def _render(self):
+        """把视图中从_top开始的行填入复用的Treeview项目"""
+        tree = self.tree
+        total = len(self._order)
+        if total == 0 and self._placeholder:
+            slots = [(None, (self._placeholder,) + ("",) * (len(self.columns) - 1), ())]
+        else:
+            count = max(0, min(total - self._top, self._visible_rows + self.overscan))
+            slots = []
+            for index in range(self._top, self._top + count):
+                position = self._order[index]
+                tags = ('even' if index % 2 == 0 else 'odd',) if self.striped else ()
+                slots.append((self.store.keys[position], self.store.row(position), tags))
+
+        # 调整复用项目的数量
+        while len(self._pool) < len(slots):
+            item_id = tree.insert('', 'end')
+            self._pool.append(item_id)
+        while len(self._pool) > len(slots):
+            item_id = self._pool.pop()
+            tree.delete(item_id)
+            self._rendered.pop(item_id, None)
+            self._slot_keys.pop(item_id, None)
+
+        selected_items = []
+        focus_item = None
+        for item_id, (key, values, tags) in zip(self._pool, slots):
+            if self._rendered.get(item_id) != (key, values, tags):
+                tree.item(item_id, values=values, tags=tags)
+                self._rendered[item_id] = (key, values, tags)
+            self._slot_keys[item_id] = key
+            if key is not None and key in self._selected:
+                selected_items.append(item_id)
+            if key is not None and key == self._cursor:
+                focus_item = item_id
+
+        if set(tree.selection()) != set(selected_items):
+            tree.selection_set(selected_items)
+        if focus_item is not None:
+            tree.focus(focus_item)
+        # 预留行超出可见区域，Treeview自身不应滚动
+        tree.yview_moveto(0)
+
+        if total:
+            self.v_scrollbar.set(self._top / total,
+                                 min(1.0, (self._top + self._visible_rows) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+
+    def _show_progress(self, text):
+        """在表格右下角显示填充进度，text为None时隐藏"""
+        if text is None:
+            if self._progress_label is not None:
+                self._progress_label.place_forget()
+            return
+        if self._progress_label is None:
+            self._progress_label = tk.Label(self, bg='#fff8dc', fg='#666666',
+                                            font=('Microsoft YaHei', 8))
+        self._progress_label.config(text=text)
+        self._progress_label.place(relx=1.0, rely=1.0, x=-20, y=-4, anchor='se')
+
+    def _measure_rows(self):
+        """从第一个项目的位置测量表头高度和行高"""
+        if self._pool:
+            bbox = self.tree.bbox(self._pool[0])
+            if bbox:
+                self._header_height = bbox[1]
+                self._row_height = max(1, bbox[3])
+
+    # ---- 事件 ----
+
+    def _on_resize(self, event):
+        self._measure_rows()
+        visible_rows = max(1, (event.height - self._header_height) // self._row_height)
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._top = max(0, min(self._top, len(self._order) - visible_rows))
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self._order)))
+        elif action == 'scroll':
+            step = self._visible_rows if unit == 'pages' else 1
+            self.scroll_to(self._top + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self.scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _on_click(self, event):
+        region = self.tree.identify_region(event.x, event.y)
+        if region not in ('cell', 'tree'):
+            return
+        # 不按Shift/Ctrl单击行时，之前选中（包括已滚出可见区域）的行都取消选中
+        if not event.state & _MODIFIER_MASK:
+            self._selected.clear()
+        key = self.key_at(event.y)
+        if key is None:
+            return
+        self._cursor = key
+        if region != 'cell':
+            return
+        column_id = self.tree.identify_column(event.x)
+        column_index = int(column_id.lstrip('#')) - 1
+        if 0 <= column_index < len(self.columns) and self.columns[column_index] in self.editable_columns:
+            self.start_edit(key, self.columns[column_index])
+
+    def _on_tree_select(self, event=None):
+        """同步Treeview中可见行的选择到_selected"""
+        visible = {key for key in self._slot_keys.values() if key is not None}
+        selected_now = {self._slot_keys.get(item_id) for item_id in self.tree.selection()}
+        selected_now.discard(None)
+        self._selected = (self._selected - visible) | selected_now
+
+    def _move_cursor(self, delta):
+        """键盘上下移动选中行（超出可见区域时滚动）"""
+        if not self._order:
+            return 'break'
+        view_index = self._get_view_index()
+        position = self.store.position(self._cursor) if self._cursor is not None else None
+        current = view_index[position] if position is not None else self._top - (1 if delta > 0 else 0)
+        index = max(0, min(len(self._order) - 1, current + delta))
+        key = self.store.keys[self._order[index]]
+        self._cursor = key
+        self._selected = {key}
+        self.see(key)
+        self._render()
+        return 'break'
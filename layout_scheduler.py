@@ -0,0 +1,91 @@
+"""
+窗口布局调度
+窗口缩放、最大化/还原时会连续产生多个<Configure>事件，这里只记录最新尺寸，
+每帧最多执行一次布局（在after回调中，不调用update()/update_idletasks()）
+"""
+
+FRAME_MS = 16   # 两次布局之间的最短间隔（约60帧/秒）
+
+
+class LayoutScheduler:
+    """合并尺寸变化事件，每帧调用一次 layout(width, height)
+
+    widget 为尺寸决定布局的控件（通常是铺满窗口的背景画布），
+    只处理它自己的<Configure>事件，尺寸没有变化（如移动窗口）时不重新布局。
+    """
+
+    def __init__(self, widget, layout, frame_ms=FRAME_MS, default_size=(1200, 800)):
+        self.widget = widget
+        self.layout = layout
+        self.frame_ms = frame_ms
+        self.default_size = default_size
+        self._size = None           # 最新的尺寸
+        self._applied_size = None   # 最近一次布局使用的尺寸
+        self._pending = None        # 已安排的after
+        self._forced = False
+        self._in_layout = False
+        self.event_count = 0
+        self.pass_count = 0
+        widget.bind('<Configure>', self._on_configure, add='+')
+
+    @property
+    def size(self):
+        """最新已知的控件尺寸（还没有收到尺寸事件时使用控件当前尺寸或默认尺寸）"""
+        if self._size is not None:
+            return self._size
+        width, height = self.widget.winfo_width(), self.widget.winfo_height()
+        if width <= 1 or height <= 1:
+            return self.default_size
+        return width, height
+
+    def _on_configure(self, event):
+        if event.widget is not self.widget:
+            return
+        self.event_count += 1
+        self._size = (event.width, event.height)
+        self._schedule()
+
+    def request(self, immediate=False):
+        """要求重新布局（即使尺寸没有变化）；immediate为True时立即执行，否则在下一帧执行"""
+        self._forced = True
+        if immediate and not self._in_layout:
+            self.cancel()
+            self._run()
+        else:
+            self._schedule()
+
+    def flush(self):
+        """立即执行尚未执行的布局"""
+        if self._pending is not None:
+            self.cancel()
+            self._run()
+
+    def cancel(self):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _schedule(self):
+        if self._pending is None and not self._in_layout:
+            self._pending = self.widget.after(self.frame_ms, self._run)
+
+    def _run(self):
+        self._pending = None
+        size = self.size
+        if size == self._applied_size and not self._forced:
+            return
+        self._forced = False
+        self._in_layout = True
+        try:
+            self.layout(*size)
+        except Exception as e:
+            print(f"❌ 布局失败: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self._in_layout = False
+        self._applied_size = size
+        self.pass_count += 1
+        # 布局期间又有新的尺寸或布局请求（例如布局本身改变了控件大小）时再安排一次
+        if self._forced or (self._size is not None and self._size != size):
+            self._schedule()
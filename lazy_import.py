@@ -0,0 +1,89 @@
+"""
+延迟导入
+mysql.connector、pyserial、PyVISA、PIL 等较重的模块在第一次使用时才导入，
+不拖慢第一个窗口的显示；界面显示后可以在后台线程中预先导入，第一次使用时不再等待
+"""
+import importlib
+import threading
+
+# 界面显示后可以在后台预先导入的模块
+PREWARM_MODULES = ("mysql.connector", "serial.tools.list_ports", "pyvisa")
+
+_import_lock = threading.Lock()
+_lazy_modules = {}
+
+
+class LazyModule:
+    """模块代理：第一次访问属性时才真正导入模块；模块不存在时访问属性抛出ImportError"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_error'] = None      # 导入失败时的异常（不重复尝试导入）
+        self.__dict__['_lock'] = threading.Lock()
+
+    def load(self):
+        """导入并返回真正的模块（多个线程同时调用时只导入一次）"""
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    if self.__dict__['_error'] is not None:
+                        raise self.__dict__['_error']
+                    try:
+                        module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        self.__dict__['_error'] = e
+                        raise
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def available(self):
+        """模块能否导入（不能导入时返回False，不抛出异常）"""
+        try:
+            self.load()
+            return True
+        except ImportError:
+            return False
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self.load(), attribute, value)
+
+    def __repr__(self):
+        state = "已导入" if self.loaded else "未导入"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """返回模块name的延迟导入代理（同名模块共享一个代理）"""
+    with _import_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+        return module
+
+
+def prewarm_imports(names=PREWARM_MODULES, on_done=None):
+    """在后台守护线程中依次导入模块，返回线程；on_done(已导入的模块名列表) 在后台线程中回调"""
+    def worker():
+        loaded = []
+        for name in names:
+            try:
+                lazy_import(name).load()
+                loaded.append(name)
+            except Exception as e:
+                print(f"⚠️ 预先导入 {name} 失败: {e}")
+        if on_done:
+            on_done(loaded)
+
+    thread = threading.Thread(target=worker, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
@@ -2,6 +2,7 @@
 电源测试设备集成控制系统 - 主程序入口
 重构后的模块化版本
 """
+from startup_profiler import get_startup_profiler
 import tkinter as tk
 from tkinter import messagebox
 
@@ -24,38 +25,57 @@ def get_build_date():
 
 def main():
     """主程序入口"""
+    profiler = get_startup_profiler()
+    
     # 在函数内部导入，避免循环导入
-    from interface.main_interface import MainInterface
-    from ConnectDatabase import ReadDataBase
+    with profiler.phase("导入界面模块"):
+        from interface.main_interface import MainInterface
+        from interface.data_loader import get_data_loader
+        from ConnectDatabase import ReadDataBase
+        from enable_gate import EnableGate, EnableStatusCache, GATE_ALLOWED
     
-    # 创建数据库连接对象
+    # 启用状态优先使用本地缓存，数据库查询在后台进行，不阻塞界面创建
     db = ReadDataBase()
+    gate = EnableGate(db.query_system_enable_status, EnableStatusCache(VERSION_STRING))
+    cached_decision = gate.check_cached()
     
-    # 查询系统启用状态
-    enable_status = db.get_system_enable_status()
-    
-    if enable_status == '启用':
-        # 系统已启用，打开界面
-        print("系统已启用，正在启动界面...")
+    with profiler.phase("创建根窗口"):
         root = tk.Tk()
-        app = MainInterface(root)
-        root.mainloop()
+    if cached_decision is None:
+        # 没有有效的启用缓存：先在隐藏状态下创建界面，等数据库查询结果再决定是否显示
+        root.withdraw()
     else:
-        # 系统未启用或查询失败，显示错误消息
-        print(f"系统状态检查失败，状态: {enable_status}")
-        
-        # 创建临时窗口用于显示消息框
-        temp_root = tk.Tk()
-        temp_root.withdraw()  # 隐藏主窗口
+        print("系统已启用（本地缓存），正在启动界面...")
+    profiler.watch_first_paint(root)
+    
+    def on_live_status(live_result):
+        if cached_decision is not None:
+            # 已按缓存放行，查询结果只用于刷新缓存
+            return
+        if gate.decide(live_result) == GATE_ALLOWED:
+            print("系统已启用，正在启动界面...")
+            root.deiconify()
+            profiler.mark_interactive(root)
+            return
         
-        # 显示错误消息
+        # 系统未启用或查询失败，显示错误消息
+        print(f"系统状态检查失败，状态: {live_result[1]}")
         messagebox.showerror(
             "系统启动失败", 
-            f"当前版本已禁用或者电脑未联网\n\n{VERSION_STRING}\n\n请联系系统管理员或检查网络连接。"
+            f"当前版本已禁用或者电脑未联网\n\n{VERSION_STRING}\n\n请联系系统管理员或检查网络连接。",
+            parent=root
         )
-        
-        temp_root.destroy()
+        root.destroy()
         print("程序已退出")
+    
+    get_data_loader(root).submit(gate.check_live, on_success=on_live_status,
+                                 name="查询系统启用状态")
+    
+    with profiler.phase("创建主界面"):
+        app = MainInterface(root)
+    if cached_decision is not None:
+        profiler.mark_interactive(root)
+    root.mainloop()
 
 
 if __name__ == "__main__":
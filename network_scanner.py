@@ -0,0 +1,112 @@
+"""
+网络仪器扫描
+使用asyncio并发探测子网内主机的仪器端口（5025 SCPI Socket、111 VXI-11端口映射、
+4880 HiSLIP），只返回真正有端口应答的主机
+"""
+import asyncio
+import ipaddress
+import socket
+import time
+
+# LXI仪器常用端口
+SCPI_RAW_PORT = 5025
+VXI11_PORTMAP_PORT = 111
+HISLIP_PORT = 4880
+LXI_PORTS = (SCPI_RAW_PORT, VXI11_PORTMAP_PORT, HISLIP_PORT)
+
+DEFAULT_CONCURRENCY = 256       # 同时进行的连接尝试数
+DEFAULT_CONNECT_TIMEOUT = 0.3   # 单次连接超时（秒），局域网内仪器通常在几毫秒内应答
+MAX_HOSTS_PER_SUBNET = 1024     # 单个子网最多探测的主机数，防止误配置成大网段
+
+
+async def _probe_port(ip, port, timeout, semaphore):
+    """尝试连接一个端口，连接成功返回True"""
+    async with semaphore:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+
+async def _probe_host(ip, ports, timeout, semaphore):
+    results = await asyncio.gather(*(_probe_port(ip, port, timeout, semaphore) for port in ports))
+    return ip, [port for port, is_open in zip(ports, results) if is_open]
+
+
+async def scan_hosts_async(ips, ports=LXI_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                           timeout=DEFAULT_CONNECT_TIMEOUT):
+    """并发探测一组主机，返回 {ip: [开放端口]}（只包含至少一个端口应答的主机）"""
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(_probe_host(ip, ports, timeout, semaphore) for ip in ips))
+    return {ip: open_ports for ip, open_ports in results if open_ports}
+
+
+def scan_hosts(ips, ports=LXI_PORTS, concurrency=DEFAULT_CONCURRENCY,
+               timeout=DEFAULT_CONNECT_TIMEOUT):
+    """同步接口：在当前线程中运行事件循环探测一组主机（应在后台线程中调用）"""
+    return asyncio.run(scan_hosts_async(list(ips), ports, concurrency, timeout))
+
+
+def expand_subnet(subnet):
+    """将 "172.19.71.0/24" 形式的子网展开为主机IP列表"""
+    network = ipaddress.ip_network(subnet, strict=False)
+    hosts = [str(ip) for ip in network.hosts()]
+    if len(hosts) > MAX_HOSTS_PER_SUBNET:
+        print(f"⚠️ 子网 {subnet} 主机数过多，只探测前 {MAX_HOSTS_PER_SUBNET} 个")
+        hosts = hosts[:MAX_HOSTS_PER_SUBNET]
+    return hosts
+
+
+def get_local_subnets():
+    """获取本机所在的/24网段（用于未配置扫描子网时的默认值）"""
+    subnets = []
+    try:
+        candidates = socket.gethostbyname_ex(socket.gethostname())[2]
+    except OSError:
+        candidates = []
+
+    # 通过UDP"连接"获取默认路由对应的本机地址（不会真正发送数据）
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("10.255.255.255", 1))
+            candidates.append(sock.getsockname()[0])
+    except OSError:
+        pass
+
+    for ip in candidates:
+        if ip.startswith("127."):
+            continue
+        subnet = str(ipaddress.ip_network(f"{ip}/24", strict=False))
+        if subnet not in subnets:
+            subnets.append(subnet)
+    return subnets
+
+
+def scan_subnets(subnets=None, ports=LXI_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=DEFAULT_CONNECT_TIMEOUT):
+    """探测一组子网（默认为本机所在/24网段），返回 {ip: [开放端口]}"""
+    subnets = subnets or get_local_subnets()
+    # 子网可能重叠：用dict去重并保持顺序
+    ips = list(dict.fromkeys(ip for subnet in subnets for ip in expand_subnet(subnet)))
+
+    start_time = time.perf_counter()
+    found = scan_hosts(ips, ports, concurrency, timeout)
+    elapsed = (time.perf_counter() - start_time) * 1000
+    print(f"🌐 子网扫描完成: {', '.join(subnets)}，探测 {len(ips)} 个主机，"
+          f"{len(found)} 个应答，耗时 {elapsed:.0f}ms")
+    return found
+
+
+def to_visa_address(ip, open_ports):
+    """根据开放的端口生成VISA地址：优先VXI-11，其次HiSLIP，最后原始Socket"""
+    if VXI11_PORTMAP_PORT in open_ports:
+        return f"TCPIP0::{ip}::inst0::INSTR"
+    if HISLIP_PORT in open_ports:
+        return f"TCPIP0::{ip}::hislip0::INSTR"
+    return f"TCPIP0::{ip}::{open_ports[0]}::SOCKET"
@@ -0,0 +1,125 @@
+"""
+界面重绘调度
+组件内容或尺寸变化时调用 invalidate(名称) 标记需要重绘，同一轮事件处理结束后
+由一个after_idle统一重绘被标记的组件（每个组件只重绘一次）；没有变化时不做任何工作，
+不再需要定时强制刷新
+"""
+import time
+
+SLOW_FLUSH_MS = 50      # 超过该耗时的重绘打印提示
+
+
+class RenderScheduler:
+    """失效驱动的重绘调度
+
+    register(名称, 重绘函数) 登记组件；invalidate(名称, ...) 标记组件需要重绘；
+    stats() 返回重绘次数、每次重绘的组件数和耗时等计数。
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._renderers = {}        # 名称 -> 重绘函数（按登记顺序重绘）
+        self._dirty = set()
+        self._pending = None
+        self._flushing = False
+        # 计数
+        self.invalidate_count = 0
+        self.flush_count = 0
+        self.render_count = 0
+        self.last_dirty = ()
+        self.last_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def register(self, name, render):
+        """登记组件的重绘函数（同名时替换）"""
+        self._renderers[name] = render
+
+    def unregister(self, name):
+        self._renderers.pop(name, None)
+        self._dirty.discard(name)
+
+    def invalidate(self, *names):
+        """标记组件需要重绘（不指定名称时标记全部组件）"""
+        names = names or tuple(self._renderers)
+        for name in names:
+            if name not in self._renderers:
+                continue
+            self.invalidate_count += 1
+            self._dirty.add(name)
+        if self._dirty and self._pending is None and not self._flushing:
+            self._pending = self.widget.after_idle(self._flush)
+
+    def is_dirty(self, name):
+        return name in self._dirty
+
+    def flush(self):
+        """立即重绘被标记的组件"""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+        self._flush()
+
+    def cancel(self):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+        self._dirty.clear()
+
+    def _flush(self):
+        self._pending = None
+        if not self._dirty:
+            return
+        dirty = [name for name in self._renderers if name in self._dirty]
+        self._dirty.clear()
+        start = time.perf_counter()
+        self._flushing = True
+        try:
+            for name in dirty:
+                try:
+                    self._renderers[name]()
+                except Exception as e:
+                    print(f"❌ 重绘 {name} 失败: {e}")
+                self.render_count += 1
+        finally:
+            self._flushing = False
+        elapsed = (time.perf_counter() - start) * 1000
+        self.flush_count += 1
+        self.last_dirty = tuple(dirty)
+        self.last_flush_ms = elapsed
+        self.total_flush_ms += elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+        if elapsed > SLOW_FLUSH_MS:
+            print(f"⚠️ 重绘耗时 {elapsed:.1f} ms: {', '.join(dirty)}")
+        # 重绘过程中又被标记的组件在下一轮空闲时重绘
+        if self._dirty and self._pending is None:
+            self._pending = self.widget.after_idle(self._flush)
+
+    def stats(self):
+        """重绘计数"""
+        return {
+            "components": len(self._renderers),
+            "invalidations": self.invalidate_count,
+            "flushes": self.flush_count,
+            "renders": self.render_count,
+            "pending": sorted(self._dirty),
+            "last_dirty": list(self.last_dirty),
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self.total_flush_ms / self.flush_count, 2) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+    def describe(self):
+        stats = self.stats()
+        return (f"重绘 {stats['flushes']} 次（组件重绘 {stats['renders']} 次，标记 {stats['invalidations']} 次），"
+                f"平均 {stats['avg_flush_ms']} ms，最长 {stats['max_flush_ms']} ms，"
+                f"最近一次: {', '.join(stats['last_dirty']) or '无'}")
+
+
+def get_render_scheduler(widget):
+    """获取控件所属根窗口共享的重绘调度"""
+    root = widget._root()
+    scheduler = getattr(root, '_render_scheduler', None)
+    if scheduler is None:
+        scheduler = RenderScheduler(root)
+        root._render_scheduler = scheduler
+    return scheduler
@@ -0,0 +1,256 @@
+"""
+原始Socket SCPI通信
+记住每个IP可用的端口并保持TCP连接，按行缓冲读取响应（支持超过1024字节的响应
+和IEEE 488.2定长二进制块），支持在一次发送中流水线化多条写指令和查询
+"""
+import atexit
+import socket
+import threading
+
+# 常用的仪器端口，按优先级排列（5025为SCPI标准端口）
+SCPI_PORTS = (5025, 23, 5024, 9999)
+
+CONNECT_TIMEOUT = 1.0   # 探测/建立连接的超时（秒）
+IO_TIMEOUT = 3.0        # 读写超时（秒）
+RECV_SIZE = 65536
+
+
+class ScpiProtocolError(ConnectionError):
+    """响应格式错误（例如定长块头无效），连接中剩余的数据已无法对齐，必须丢弃连接"""
+
+
+class ScpiSocketConnection:
+    """一条保持打开的SCPI TCP连接"""
+
+    def __init__(self, ip_address, port, sock):
+        self.ip_address = ip_address
+        self.port = port
+        self._sock = sock
+        self._buffer = bytearray()
+
+    def write(self, command):
+        """发送一条指令"""
+        self._sock.sendall((command + '\n').encode('utf-8'))
+
+    def write_many(self, commands):
+        """流水线发送多条指令（合并为一次sendall，不等待设备响应）"""
+        if commands:
+            self._sock.sendall(''.join(cmd + '\n' for cmd in commands).encode('utf-8'))
+
+    def query(self, command):
+        """发送查询并读取一条响应"""
+        self.write(command)
+        return self.read_response().decode('utf-8', errors='replace').strip()
+
+    def read_response(self):
+        """读取一条完整响应（字节）：普通响应读到换行为止，#开头的定长块按长度读取"""
+        first = self._read_exact(1)
+        if first == b'\n':
+            # 空响应
+            return b''
+        if first != b'#':
+            return (first + self._read_line()).rstrip(b'\r')
+
+        digits = self._read_exact(1)
+        if not digits.isdigit():
+            raise ScpiProtocolError(f"{self.ip_address}:{self.port} 定长块头无效: #{digits!r}")
+        digits = int(digits)
+        if digits == 0:
+            # 不定长块，以换行结束
+            return b'#0' + self._read_line()
+        length = self._read_exact(digits)
+        if not length.isdigit():
+            raise ScpiProtocolError(f"{self.ip_address}:{self.port} 定长块长度无效: {length!r}")
+        data = self._read_exact(int(length))
+        # 丢弃块后的结束符
+        self._read_line()
+        return data
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def _fill(self):
+        chunk = self._sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError(f"{self.ip_address}:{self.port} 连接已被设备关闭")
+        self._buffer.extend(chunk)
+
+    def _read_exact(self, size):
+        while len(self._buffer) < size:
+            self._fill()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _read_line(self):
+        while True:
+            index = self._buffer.find(b'\n')
+            if index >= 0:
+                line = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                return line.rstrip(b'\r')
+            self._fill()
+
+
+class ScpiSocketTransport:
+    """按IP保持SCPI Socket连接，并缓存每个IP可用的端口"""
+
+    def __init__(self, ports=SCPI_PORTS, connect_timeout=CONNECT_TIMEOUT, io_timeout=IO_TIMEOUT):
+        self.ports = tuple(ports)
+        self.connect_timeout = connect_timeout
+        self.io_timeout = io_timeout
+        self._port_cache = {}       # IP -> 上次可用的端口
+        self._connections = {}      # IP -> ScpiSocketConnection
+        self._ip_locks = {}         # IP -> 该设备的访问锁
+        self._lock = threading.Lock()
+        self.stats = {
+            "connects": 0,          # 新建TCP连接数
+            "reused": 0,            # 复用已有连接的次数
+            "port_probes": 0,       # 端口探测次数
+            "reconnected": 0,       # 通信失败后重连的次数
+        }
+
+    def send(self, ip_address, command):
+        """发送一条指令，查询指令（以?结尾）返回响应文本，其余返回None"""
+        def action(conn):
+            if command.endswith('?'):
+                return conn.query(command)
+            conn.write(command)
+            return None
+        return self._call(ip_address, action)
+
+    def pipeline(self, ip_address, commands):
+        """流水线发送多条指令：连续的写指令与其后的查询合并为一次发送，
+        返回各查询响应组成的列表"""
+        def action(conn):
+            responses = []
+            pending = []
+            for command in commands:
+                pending.append(command)
+                if command.endswith('?'):
+                    conn.write_many(pending)
+                    pending = []
+                    responses.append(conn.read_response().decode('utf-8', errors='replace').strip())
+            conn.write_many(pending)
+            return responses
+        return self._call(ip_address, action)
+
+    def get_port(self, ip_address):
+        """获取IP缓存的可用端口（未探测过时返回None）"""
+        with self._lock:
+            return self._port_cache.get(ip_address)
+
+    def close(self, ip_address):
+        with self._get_ip_lock(ip_address):
+            with self._lock:
+                conn = self._connections.pop(ip_address, None)
+            if conn:
+                conn.close()
+
+    def close_all(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["open_connections"] = len(self._connections)
+            stats["cached_ports"] = dict(self._port_cache)
+        return stats
+
+    def _call(self, ip_address, action):
+        """在该设备的锁内执行操作；连接失效时重连一次再试
+
+        读取超时不重试（设备可能已执行指令），只丢弃连接避免残留响应错位。
+        """
+        with self._get_ip_lock(ip_address):
+            conn = self._get_connection(ip_address)
+            try:
+                return action(conn)
+            except (socket.timeout, ScpiProtocolError):
+                self._drop_connection(ip_address)
+                raise
+            except OSError as e:
+                print(f"⚠️ Socket连接 {ip_address}:{conn.port} 通信失败，尝试重新连接: {e}")
+                self._drop_connection(ip_address)
+
+            conn = self._get_connection(ip_address)
+            # 重新连接成功后才计入重连次数
+            with self._lock:
+                self.stats["reconnected"] += 1
+            try:
+                return action(conn)
+            except OSError:
+                self._drop_connection(ip_address)
+                raise
+
+    def _get_connection(self, ip_address):
+        """获取已打开的连接，没有时优先连接缓存端口，失败再依次探测其他端口"""
+        with self._lock:
+            conn = self._connections.get(ip_address)
+            if conn is not None:
+                self.stats["reused"] += 1
+                return conn
+            cached_port = self._port_cache.get(ip_address)
+
+        # 缓存的端口排在最前面，其余端口按默认顺序
+        ports = [port for port in self.ports if port != cached_port]
+        if cached_port is not None:
+            ports.insert(0, cached_port)
+
+        for port in ports:
+            with self._lock:
+                self.stats["port_probes"] += 1
+            try:
+                sock = socket.create_connection((ip_address, port), timeout=self.connect_timeout)
+            except OSError:
+                continue
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.settimeout(self.io_timeout)
+            conn = ScpiSocketConnection(ip_address, port, sock)
+            with self._lock:
+                self._connections[ip_address] = conn
+                self._port_cache[ip_address] = port
+                self.stats["connects"] += 1
+            print(f"🔗 已建立SCPI Socket连接: {ip_address}:{port}")
+            return conn
+
+        with self._lock:
+            self._port_cache.pop(ip_address, None)
+        raise ConnectionError(f"无法连接到设备 {ip_address}，尝试的端口: {ports}")
+
+    def _drop_connection(self, ip_address):
+        with self._lock:
+            conn = self._connections.pop(ip_address, None)
+        if conn:
+            conn.close()
+
+    def _get_ip_lock(self, ip_address):
+        with self._lock:
+            lock = self._ip_locks.get(ip_address)
+            if lock is None:
+                lock = threading.RLock()
+                self._ip_locks[ip_address] = lock
+            return lock
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_scpi_socket_transport():
+    """获取进程内共享的SCPI Socket通信实例"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = ScpiSocketTransport()
+                atexit.register(_transport.close_all)
+    return _transport
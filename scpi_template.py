@@ -0,0 +1,124 @@
+"""
+SCPI指令模板引擎
+指令文本只解析一次，拆分为文字片段和参数占位符（valueN 或 <param>），
+编译结果按指令文本缓存在有界LRU中，生成参数模板和替换参数时只需拼接片段
+"""
+import re
+import time
+from functools import lru_cache
+
+TEMPLATE_CACHE_SIZE = 16384  # 最多缓存的已编译指令数（需大于指令库条数，否则顺序遍历时LRU会反复失效）
+
+# valueN 不要求前面有单词边界（如 CHvalue1），但后面必须是边界或结尾；<param> 为尖括号参数
+_PLACEHOLDER_PATTERN = re.compile(r'(value\d*)(?=\b|:|;|$|\s)|<(\w+)>', re.IGNORECASE)
+_VALUE_NUMBER_PATTERN = re.compile(r'(\d+)$')
+
+
+def _value_sort_key(name):
+    """value（不带数字）排在最前，然后按数字排序"""
+    match = _VALUE_NUMBER_PATTERN.search(name)
+    return (1, int(match.group(1))) if match else (0, 0)
+
+
+class CompiledTemplate:
+    """已编译的指令：parts 中偶数位置为文字片段，奇数位置为参数名"""
+
+    __slots__ = ('text', 'parts', 'raw', 'value_names', 'bracket_names', 'placeholders')
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        self.raw = {}           # 参数名 -> 指令中的原始写法（如 <ch> 的原始写法为 "<ch>"）
+        value_names = []
+        bracket_names = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(text):
+            value_name, bracket_name = match.groups()
+            name = value_name or bracket_name
+            self.parts.append(text[position:match.start()])
+            self.parts.append(name)
+            position = match.end()
+            if name not in self.raw:
+                self.raw[name] = match.group(0)
+                (value_names if value_name else bracket_names).append(name)
+        self.parts.append(text[position:])
+        # 参数顺序：valueN按数字排序，<param>按出现顺序排在后面
+        self.value_names = tuple(sorted(value_names, key=_value_sort_key))
+        self.bracket_names = tuple(bracket_names)
+        self.placeholders = self.value_names + self.bracket_names
+
+    def parameter_template(self, fill='?', brackets=True):
+        """生成参数输入模板，如 value1=?;value2=?;（没有参数时返回空字符串）
+
+        模板只列出valueN参数；指令中没有valueN时，brackets为True才列出<param>参数
+        """
+        names = self.value_names or (self.bracket_names if brackets else ())
+        return ''.join(f"{name}={fill};" for name in names)
+
+    def render(self, params):
+        """用参数值替换占位符；没有值或值为?的参数保持原样"""
+        if len(self.parts) == 1:
+            return self.text
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            value = params.get(name)
+            parts[i] = value if value and value != '?' else self.raw[name]
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text):
+    """编译指令文本（结果按文本缓存）"""
+    return CompiledTemplate(text or "")
+
+
+def parameter_template(text, fill='?', brackets=True):
+    """根据指令内容生成参数模板，如 value1=?;value2=?;"""
+    return compile_template(text or "").parameter_template(fill, brackets)
+
+
+def render_command(text, params):
+    """将参数值替换到指令中"""
+    return compile_template(text or "").render(params)
+
+
+def parse_parameter_input(param_input):
+    """解析参数输入 "value1=2;value2=3;" 为 {参数名: 值}"""
+    params = {}
+    for pair in param_input.strip().rstrip(';').split(';'):
+        if '=' in pair:
+            key, value = pair.split('=', 1)
+            params[key.strip()] = value.strip()
+    return params
+
+
+def get_cache_info():
+    """模板缓存命中统计"""
+    return compile_template.cache_info()
+
+
+def benchmark(count=10000):
+    """渲染 count 条不同指令，返回 (首次编译+渲染, 命中缓存后渲染) 的每条耗时（微秒）"""
+    commands = [f":CH{i % 8}:SCAle value1;:CH{i % 8}:OFFSet value2;:MEAS<meas{i}>:STATE ON"
+                for i in range(count)]
+    params = {"value1": "1.0", "value2": "0.5"}
+
+    compile_template.cache_clear()
+    start_time = time.perf_counter()
+    for command in commands:
+        parameter_template(command)
+        render_command(command, params)
+    cold = (time.perf_counter() - start_time) * 1e6 / count
+
+    start_time = time.perf_counter()
+    for command in commands:
+        parameter_template(command)
+        render_command(command, params)
+    warm = (time.perf_counter() - start_time) * 1e6 / count
+    return cold, warm
+
+
+if __name__ == "__main__":
+    cold_us, warm_us = benchmark()
+    print(f"10000条指令: 首次 {cold_us:.2f} µs/条，缓存命中 {warm_us:.2f} µs/条，{get_cache_info()}")
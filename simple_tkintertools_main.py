@@ -8,6 +8,12 @@ from datetime import datetime
 import math
 import sys
 import os
+from startup_profiler import get_startup_profiler
+from lazy_import import prewarm_imports
+from gradient_background import GradientBackground
+from layout_scheduler import LayoutScheduler
+from render_scheduler import get_render_scheduler
+from clock_ticker import get_clock_ticker, DATETIME_FORMAT
 
 class SimpleTkinterToolsInterface:
     def __init__(self):
@@ -17,6 +23,14 @@ class SimpleTkinterToolsInterface:
         self.content_frame = None
         self.content_window = None
         self.current_tab = 0
+        self.background = None  # 渐变背景（GradientBackground，第一次绘制背景时创建）
+        self.use_gradient_background = False   # 布局时是否重绘渐变背景（否则只调整纯色背景）
+        self.layout_scheduler = None    # 窗口尺寸变化时统一布局（LayoutScheduler）
+        self.render_scheduler = None    # 标记需要重绘的组件，空闲时统一重绘（RenderScheduler）
+        self.tab_windows = []           # 左侧按钮对应的画布窗口项目
+        self._title_time_token = None   # 标题栏时间、状态栏时间在共享时钟中的订阅
+        self._status_time_token = None
+        self.content_geometry = self.simple_content_geometry
         
         # 图标显示配置
         self.use_icons = True  # 设置为False可关闭图标，使用纯文本
@@ -38,6 +52,9 @@ class SimpleTkinterToolsInterface:
         self.LAYOUT_LEFT_MARGIN = 20      # 按钮距离左边的边距
         self.BUTTON_WIDTH = 140           # 按钮宽度
         self.BUTTON_AREA_WIDTH = self.LAYOUT_LEFT_MARGIN + self.BUTTON_WIDTH+20  # 按钮区域总宽度 = 20 + 140 = 160
+        self.TAB_BUTTON_HEIGHT = 50       # 单个按钮高度
+        self.TAB_BUTTON_SPACING = 60      # 按钮间距
+        self.TITLE_HEIGHT = 80            # 标题背景高度
         
         self.setup_styles()
     
@@ -66,50 +83,27 @@ class SimpleTkinterToolsInterface:
         self.style.configure('Modern.TFrame',
                            background='#ffffff',
                            bordercolor='#dee2e6')
-    def draw_background(self):
-        """绘制优化的渐变背景（防止卡顿）"""
-        # 如果开启窗口优化模式，跳过重绘逻辑，仅绘制简单背景
-        import os
+    def draw_background(self, width=None, height=None):
+        """绘制渐变背景（按尺寸档位缓存的图片，缩放时只替换一个画布项目）"""
+        if width is None or height is None:
+            width, height = self.get_layout_size()
+        # 如果开启窗口优化模式，仅绘制简单背景
         if os.environ.get('WINDOW_OPTIMIZE') == '1':
-            width = self.bg_canvas.winfo_width() or 1200
-            height = self.bg_canvas.winfo_height() or 800
             self.bg_canvas.delete("bg")
+            self.background = None
             self.create_simple_background(width, height)
             return
         try:
-            # 如果处于窗口优化模式，使用最简背景
-            import os
-            if os.environ.get('WINDOW_OPTIMIZE') == '1':
-                width = self.bg_canvas.winfo_width() or 1200
-                height = self.bg_canvas.winfo_height() or 800
+            if self.background is None:
+                # 删除旧的背景元素（如初始的纯色矩形）
                 self.bg_canvas.delete("bg")
-                self.create_simple_background(width, height)
-                return
-            self.root.update_idletasks()
-            width = self.bg_canvas.winfo_width()
-            height = self.bg_canvas.winfo_height()
-            if width <= 1:
-                width = 1200
-            if height <= 1:
-                height = 800
-            
-            # 删除旧的背景元素
-            self.bg_canvas.delete("bg")
-            
-            # 检查是否需要简化绘制（窗口很大时）
-            is_large_window = width > 1400 or height > 900
-            
-            if is_large_window:
-                # 大窗口时使用超简化背景
-                self.create_simple_background(width, height)
-            else:
-                # 普通窗口使用优化渐变
-                self.create_optimized_gradient(width, height)
-                self.add_simple_grid(width, height)
-                
+                self.background = GradientBackground(self.bg_canvas)
+            self.background.render(width, height)
         except Exception as e:
             print(f"❌ 背景绘制错误: {e}")
             # 如果渐变绘制失败，使用简单背景
+            self.bg_canvas.delete("bg")
+            self.background = None
             self.create_simple_background(width, height)
             
     def create_simple_background(self, width, height):
@@ -118,36 +112,13 @@ class SimpleTkinterToolsInterface:
             0, 0, width, height,
             fill="#99CCFF", outline="", tags="bg"
         )
-    
-    def create_optimized_gradient(self, width, height):
-        """创建优化的渐变背景（减少步骤数）"""
-        # 减少渐变步骤数，从100步减少到20步，提高性能
-        steps = 20  # 大幅减少步骤数
-        for i in range(steps):
-            ratio = i / steps
-            # 使用更现代的色彩搭配
-            r1, g1, b1 = 0x66, 0x99, 0xCC  # 起始色 #6699CC
-            r2, g2, b2 = 0xB8, 0xD4, 0xF0  # 结束色 #B8D4F0
-            
-            r = int(r1 + (r2 - r1) * ratio)
-            g = int(g1 + (g2 - g1) * ratio)  
-            b = int(b1 + (b2 - b1) * ratio)
-            
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            
-            y1 = int(height * i / steps)
-            y2 = int(height * (i + 1) / steps)
-            
-            self.bg_canvas.create_rectangle(
-                0, y1, width, y2,
-                fill=color, outline=color, tags="bg"
-            )
+        self.bg_canvas.tag_lower("bg")
     
     def create_simplified_interface(self):
         """创建简化的界面，专注于功能而非复杂效果"""
         print("🚀 创建简化界面...")
         
-        # 创建简单背景
+        # 创建简单背景（布局时调整为窗口大小）
         self.bg_canvas.create_rectangle(0, 0, 2000, 2000, fill="#e3f2fd", outline="", tags="bg")
         
         # 创建标题底色背景 - 动态宽度（延迟创建确保窗口已初始化）
@@ -162,75 +133,110 @@ class SimpleTkinterToolsInterface:
         # 创建内容区域
         self.create_simple_content_area()
         
-        # 启动定时刷新机制
-        self.start_refresh_timer()
-        
-        # 绑定窗口大小变化事件来更新标题背景 - 使用add='+'允许多个事件处理器
-        self.root.bind('<Configure>', self.on_window_resize, add='+')
-        
-        # 添加初始化完成后的刷新机制，确保界面大小正确
-        self.root.after(300, self.refresh_initial_layout)
+        # 窗口大小变化时由布局调度统一调整背景、标题栏、按钮和内容区域
+        # （只在需要时重绘，不再定时强制刷新）
+        self.setup_layout_scheduler().request()
         
         print("✅ 简化界面创建完成")
     
-    def refresh_initial_layout(self):
-        """初始化完成后刷新界面布局，确保尺寸正确"""
-        try:
-            print("🔄 执行初始化后的界面刷新...")
-            
-            # 强制更新所有几何信息
-            self.root.update_idletasks()
-            self.bg_canvas.update_idletasks()
-            
-            # 获取实际窗口尺寸
-            actual_width = self.bg_canvas.winfo_width()
-            actual_height = self.bg_canvas.winfo_height()
-            
-            print(f"📏 实际窗口尺寸: {actual_width} x {actual_height}")
-            
-            # 如果尺寸有效，重新创建所有组件以确保正确布局
-            if actual_width > 100 and actual_height > 100:
-                # 重新创建标题背景
-                self.create_dynamic_title_background()
-                
-                # 重新创建标题
-                self.create_centered_title()
-                
-                # 重新创建按钮
-                if hasattr(self, 'create_responsive_tab_buttons'):
-                    self.create_responsive_tab_buttons()
-                
-                # 重新创建内容区域
-                if hasattr(self, 'create_responsive_content_layout'):
-                    self.create_responsive_content_layout()
-                
-                # 强制刷新显示
-                self.force_refresh_display()
-                
-                print("✅ 初始化后界面刷新完成")
-            else:
-                print(f"⚠️ 窗口尺寸异常，延迟重试...")
-                # 如果尺寸还是异常，再次延迟刷新
-                self.root.after(200, self.refresh_initial_layout)
-                
-        except Exception as e:
-            print(f"❌ 初始化后刷新失败: {e}")
-            import traceback
-            traceback.print_exc()
+    def setup_layout_scheduler(self):
+        """创建布局调度和重绘调度（只创建一次）"""
+        if self.layout_scheduler is None:
+            self.render_scheduler = get_render_scheduler(self.root)
+            self.render_scheduler.register(
+                "background", lambda: self.layout_background(*self.get_layout_size()))
+            self.render_scheduler.register(
+                "title_bar", lambda: self.layout_title_bar(self.get_layout_size()[0]))
+            self.render_scheduler.register("tabs", self.layout_tabs)
+            self.render_scheduler.register(
+                "content", lambda: self.layout_content(*self.get_layout_size()))
+            self.layout_scheduler = LayoutScheduler(self.bg_canvas, self.apply_layout)
+            # Ctrl+F12 打印重绘计数（空闲时计数不应增加）
+            self.root.bind('<Control-F12>', self.print_render_stats, add='+')
+        return self.layout_scheduler
+    
+    def invalidate(self, *components):
+        """标记组件需要重绘（background、title_bar、tabs、content），空闲时统一重绘"""
+        if self.render_scheduler is not None:
+            self.render_scheduler.invalidate(*components)
+    
+    def print_render_stats(self, event=None):
+        if self.render_scheduler is not None:
+            print(f"📊 {self.render_scheduler.describe()}")
+            width, height = self.get_layout_size()
+            print(f"   布局: 尺寸事件 {self.layout_scheduler.event_count} 次，"
+                  f"布局 {self.layout_scheduler.pass_count} 次，当前尺寸 {width}x{height}")
+    
+    def get_layout_size(self):
+        """当前布局使用的画布尺寸（不强制刷新几何信息，尺寸未知时使用1200x800）"""
+        if self.layout_scheduler is not None:
+            return self.layout_scheduler.size
+        width = self.bg_canvas.winfo_width()
+        height = self.bg_canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return 1200, 800
+        return width, height
+    
+    def refresh_layout(self):
+        """立即按当前尺寸重新布局一次"""
+        self.setup_layout_scheduler().request(immediate=True)
+        self.render_scheduler.flush()
+    
+    def apply_layout(self, width, height):
+        """尺寸变化后标记所有尺寸相关的组件：背景、标题栏、左侧按钮、内容区域
+        
+        由LayoutScheduler在窗口尺寸变化后每帧最多调用一次；重绘在同一次空闲时一起完成，
+        只修改已有画布项目的坐标和尺寸。
+        """
+        self.invalidate("background", "title_bar", "tabs", "content")
+    
+    def layout_background(self, width, height):
+        """背景铺满画布"""
+        if self.use_gradient_background or self.background is not None:
+            self.draw_background(width, height)
+        else:
+            self.bg_canvas.coords("bg", 0, 0, width, height)
+    
+    def layout_title_bar(self, width):
+        """标题背景随窗口宽度伸缩，标题居中，时间靠右"""
+        self.bg_canvas.coords("title_bg", 0, 0, width, self.TITLE_HEIGHT)
+        self.bg_canvas.coords("title", width // 2, self.TITLE_HEIGHT // 2)
+        self.bg_canvas.coords("title_time", width - 15, self.TITLE_HEIGHT - 10)
+    
+    def layout_tabs(self):
+        """左侧按钮位置"""
+        for i, item in enumerate(self.tab_windows):
+            self.bg_canvas.coords(item, self.LAYOUT_LEFT_MARGIN,
+                                  self.LAYOUT_TOP_MARGIN + i * self.TAB_BUTTON_SPACING)
+            self.bg_canvas.itemconfig(item, width=self.BUTTON_WIDTH, height=self.TAB_BUTTON_HEIGHT)
+    
+    def layout_content(self, width, height):
+        """内容区域位置和尺寸"""
+        if not self.content_window:
+            return
+        x, y, content_width, content_height = self.content_geometry(width, height)
+        self.bg_canvas.coords(self.content_window, x, y)
+        self.bg_canvas.itemconfig(self.content_window, width=content_width, height=content_height)
+    
+    def simple_content_geometry(self, width, height):
+        """简化界面内容区域的 (x, y, 宽, 高)：左侧为按钮区域，上右下保持统一边距"""
+        content_x = self.BUTTON_AREA_WIDTH
+        content_y = self.LAYOUT_TOP_MARGIN
+        content_width = max(400, width - self.BUTTON_AREA_WIDTH - self.LAYOUT_RIGHT_MARGIN)
+        content_height = max(300, height - self.LAYOUT_TOP_MARGIN - self.LAYOUT_BOTTOM_MARGIN)
+        return content_x, content_y, content_width, content_height
+    
+    def enlarged_content_geometry(self, width, height):
+        """放大版内容区域（create_content_area）的 (x, y, 宽, 高)"""
+        content_width = max(600, width - 160)
+        content_height = max(400, height - 120)
+        return 140 + 5, 90 + 5, content_width - 10, content_height - 10
     
     def create_dynamic_title_background(self):
         """创建动态宽度的标题背景"""
         try:
-            # 强制更新窗口布局
-            self.root.update_idletasks()
-            self.bg_canvas.update_idletasks()
-            
-            # 获取当前窗口宽度
-            window_width = self.bg_canvas.winfo_width()
-            
-            # 如果窗口宽度无效，使用默认值
-            if window_width <= 1:
-                window_width = 1200
+            # 当前窗口宽度（之后的宽度变化由 layout_title_bar 调整）
+            window_width, _ = self.get_layout_size()
             
             # 删除旧的标题背景、logo和时间
             self.bg_canvas.delete("title_bg")
@@ -238,7 +244,7 @@ class SimpleTkinterToolsInterface:
             self.bg_canvas.delete("title_time")
             
             # 创建全宽度的标题背景（无边框）
-            self.bg_canvas.create_rectangle(0, 0, window_width, 80, 
+            self.bg_canvas.create_rectangle(0, 0, window_width, self.TITLE_HEIGHT, 
                                            fill="#99CCFF", 
                                            outline="",
                                            tags="title_bg")
@@ -249,9 +255,6 @@ class SimpleTkinterToolsInterface:
             # 在右下角显示当前时间
             self.create_title_time(window_width)
             
-            # 强制刷新显示
-            self.bg_canvas.update()
-            
             print(f"🎨 创建动态标题背景: 宽度 {window_width}px")
             
         except Exception as e:
@@ -363,38 +366,18 @@ class SimpleTkinterToolsInterface:
             
             print(f"🕒 时间显示创建成功: {current_time} 位置({time_x}, {time_y})")
             
-            # 启动时间更新（如果还没启动）
-            if not hasattr(self, '_time_update_started'):
-                self._time_update_started = True
-                self.update_title_time()
+            # 由共享时钟每秒更新（按标签更新，重新创建时间文字后仍然有效）
+            if self._title_time_token is None:
+                self._title_time_token = get_clock_ticker(self.root).subscribe_canvas_text(
+                    self.bg_canvas, "title_time")
                 
         except Exception as e:
             print(f"❌ 创建时间显示失败: {e}")
     
-    def update_title_time(self):
-        """更新标题区域的时间显示"""
-        try:
-            from datetime import datetime
-            
-            # 获取当前时间
-            current_time = datetime.now().strftime("%H:%M:%S")
-            
-            # 更新时间文本
-            self.bg_canvas.itemconfig("title_time", text=current_time)
-            
-            # 每秒更新一次
-            self.root.after(1000, self.update_title_time)
-            
-        except Exception as e:
-            print(f"❌ 更新时间失败: {e}")
-            # 如果更新失败，重新启动时间更新
-            self.root.after(5000, self.update_title_time)
-    
     def create_centered_title(self):
         """创建居中的标题文字"""
-        # 获取当前窗口宽度
-        self.root.update_idletasks()
-        window_width = self.bg_canvas.winfo_width() or 1200
+        # 获取当前窗口宽度（之后的宽度变化由 layout_title_bar 调整）
+        window_width, _ = self.get_layout_size()
         title_x = window_width // 2  # 标题居中
         
         # 删除旧标题（如果存在）
@@ -407,43 +390,6 @@ class SimpleTkinterToolsInterface:
         
         print(f"🎯 创建居中标题: 位置 x={title_x}")
     
-    def on_window_resize(self, event=None):
-        """统一的窗口大小变化处理函数"""
-        if event and event.widget == self.root:
-            print(f"🔄 检测到窗口大小变化事件: {event.width}x{event.height}")
-            # 延迟处理以避免频繁调用
-            if hasattr(self, '_main_resize_timer'):
-                self.root.after_cancel(self._main_resize_timer)
-            self._main_resize_timer = self.root.after(150, self.handle_unified_window_resize)
-    
-    def handle_unified_window_resize(self):
-        """处理统一的窗口大小变化"""
-        try:
-            print("🔄 处理统一窗口大小变化...")
-            
-            # 重新创建标题背景以适应新的窗口宽度
-            self.create_dynamic_title_background()
-            
-            # 重新创建居中的标题
-            self.create_centered_title()
-            
-            # 更新响应式按钮布局
-            if hasattr(self, 'update_responsive_tabs'):
-                print("   - 更新响应式按钮布局")
-                self.update_responsive_tabs()
-            
-            # 更新响应式内容区域布局
-            if hasattr(self, 'update_responsive_content_layout'):
-                print("   - 更新响应式内容区域布局")
-                self.update_responsive_content_layout()
-            
-            print("✅ 统一窗口大小变化处理完成")
-            
-        except Exception as e:
-            print(f"❌ 处理统一窗口大小变化失败: {e}")
-            import traceback
-            traceback.print_exc()
-    
     def create_simple_tabs(self):
         """创建响应式左侧按钮"""
         print("📐 创建响应式左侧按钮...")
@@ -451,8 +397,7 @@ class SimpleTkinterToolsInterface:
         # 初始创建按钮区域
         self.create_responsive_tab_buttons()
         
-        # 注意：不再单独绑定事件，使用统一的窗口事件处理
-        # 统一的事件处理在 handle_unified_window_resize 中调用 update_responsive_tabs
+        # 注意：不单独绑定事件，窗口大小变化时由 apply_layout 中的 layout_tabs 调整位置
         
         print(f"✅ 响应式左侧按钮创建完成")
     
@@ -461,13 +406,7 @@ class SimpleTkinterToolsInterface:
         tab_names = self.get_tab_names()
         
         # 获取窗口尺寸
-        self.root.update_idletasks()
-        window_width = self.bg_canvas.winfo_width() or 1200
-        window_height = self.bg_canvas.winfo_height() or 800
-        
-        # 使用统一的布局常量
-        button_height = 50        # 单个按钮高度
-        button_spacing = 60       # 按钮间距
+        window_width, window_height = self.get_layout_size()
         
         # 计算可用高度和按钮布局
         available_height = window_height - self.LAYOUT_TOP_MARGIN - self.LAYOUT_BOTTOM_MARGIN
@@ -481,16 +420,18 @@ class SimpleTkinterToolsInterface:
         print(f"   边距约束: 上{self.LAYOUT_TOP_MARGIN}px 下{self.LAYOUT_BOTTOM_MARGIN}px 左{self.LAYOUT_LEFT_MARGIN}px")
         
         # 清除旧按钮
-        if hasattr(self, 'tab_buttons'):
-            for btn in self.tab_buttons:
-                btn.destroy()
+        for item in self.tab_windows:
+            self.bg_canvas.delete(item)
+        for btn in self.tab_buttons:
+            btn.destroy()
         
         self.tab_buttons = []
+        self.tab_windows = []
         start_x = self.LAYOUT_LEFT_MARGIN
         start_y = self.LAYOUT_TOP_MARGIN
         
         for i, name in enumerate(tab_names):
-            y_pos = start_y + i * button_spacing
+            y_pos = start_y + i * self.TAB_BUTTON_SPACING
             
             # 创建响应式按钮
             btn = tk.Button(self.bg_canvas, text=name, 
@@ -502,81 +443,15 @@ class SimpleTkinterToolsInterface:
             
             # 放置按钮
             btn_window = self.bg_canvas.create_window(start_x, y_pos, window=btn, anchor='nw',
-                                                     width=self.BUTTON_WIDTH, height=button_height)
+                                                     width=self.BUTTON_WIDTH, height=self.TAB_BUTTON_HEIGHT)
             
             self.tab_buttons.append(btn)
+            self.tab_windows.append(btn_window)
         
         self.current_tab = 0
         
         print(f"✅ 创建了 {len(self.tab_buttons)} 个响应式按钮，按钮区域总宽度: {self.BUTTON_AREA_WIDTH}px")
     
-    def on_tabs_window_resize(self, event=None):
-        """按钮区域窗口大小变化处理"""
-        if event and event.widget == self.root:
-            # 延迟更新以避免频繁调用
-            if hasattr(self, '_tabs_resize_timer'):
-                self.root.after_cancel(self._tabs_resize_timer)
-            self._tabs_resize_timer = self.root.after(100, self.update_responsive_tabs)
-    
-    def update_responsive_tabs(self):
-        """更新响应式按钮布局（不重新创建按钮，只更新位置）"""
-        try:
-            # 只更新按钮位置，不重新创建按钮
-            if hasattr(self, 'tab_buttons') and self.tab_buttons:
-                self.update_tab_buttons_position()
-                print(f"📐 响应式按钮位置更新完成")
-            else:
-                # 如果按钮不存在，才重新创建
-                self.create_responsive_tab_buttons()
-                print(f"📐 响应式按钮重新创建完成")
-            
-        except Exception as e:
-            print(f"❌ 更新响应式按钮布局失败: {e}")
-    
-    def update_tab_buttons_position(self):
-        """只更新按钮位置，不重新创建按钮"""
-        try:
-            # 获取窗口尺寸
-            self.root.update_idletasks()
-            window_width = self.bg_canvas.winfo_width() or 1200
-            window_height = self.bg_canvas.winfo_height() or 800
-            
-            # 使用统一的布局常量
-            button_height = 50        # 单个按钮高度
-            button_spacing = 60       # 按钮间距
-            
-            # 计算新的按钮位置
-            start_x = self.LAYOUT_LEFT_MARGIN
-            start_y = self.LAYOUT_TOP_MARGIN
-            
-            print(f"📐 更新按钮位置参数:")
-            print(f"   窗口尺寸: {window_width} x {window_height}")
-            print(f"   按钮起始位置: ({start_x}, {start_y})")
-            print(f"   现有按钮数量: {len(self.tab_buttons)}")
-            
-            # 更新每个按钮的位置
-            for i, btn in enumerate(self.tab_buttons):
-                y_pos = start_y + i * button_spacing
-                
-                # 查找按钮对应的canvas窗口对象
-                canvas_items = self.bg_canvas.find_all()
-                for item in canvas_items:
-                    if self.bg_canvas.type(item) == 'window':
-                        widget = self.bg_canvas.itemcget(item, 'window')
-                        if widget == str(btn):
-                            # 更新按钮位置
-                            self.bg_canvas.coords(item, start_x, y_pos)
-                            # 更新按钮大小
-                            self.bg_canvas.itemconfig(item, width=self.BUTTON_WIDTH, height=button_height)
-                            break
-            
-            print(f"✅ 已更新 {len(self.tab_buttons)} 个按钮的位置")
-            
-        except Exception as e:
-            print(f"❌ 更新按钮位置失败: {e}")
-            # 如果更新位置失败，回退到重新创建
-            self.create_responsive_tab_buttons()
-    
     def create_simple_content_area(self):
         """创建响应式内容区域"""
         print("📐 创建响应式内容区域...")
@@ -584,34 +459,20 @@ class SimpleTkinterToolsInterface:
         # 初始创建内容区域
         self.create_responsive_content_layout()
         
-        # 注意：不再单独绑定事件，使用统一的窗口事件处理
-        # 统一的事件处理在 handle_unified_window_resize 中调用 update_responsive_content_layout
+        # 注意：不单独绑定事件，窗口大小变化时由 apply_layout 中的 layout_content 调整尺寸
         
         print(f"✅ 响应式内容区域创建完成")
     
     def create_responsive_content_layout(self):
         """创建响应式内容布局"""
-        # 获取窗口尺寸，如果获取失败使用更合理的默认值
-        self.root.update_idletasks()
-        window_width = self.bg_canvas.winfo_width()
-        window_height = self.bg_canvas.winfo_height()
-        
-        # 如果窗口尺寸无效，使用默认值但仍然保持正确的布局比例
-        if not window_width or window_width < 100:
-            window_width = 1200
-            print("⚠️ 窗口宽度无效，使用默认值1200")
-        if not window_height or window_height < 100:
-            window_height = 800
-            print("⚠️ 窗口高度无效，使用默认值800")
+        # 获取窗口尺寸（尺寸未知时使用默认值，窗口显示后由布局调度修正）
+        window_width, window_height = self.get_layout_size()
         
         # 使用统一的布局常量
         # 精确计算内容区域位置和尺寸
-        content_x = self.BUTTON_AREA_WIDTH
-        content_y = self.LAYOUT_TOP_MARGIN
-        # 确保右边距严格为40px
-        content_width = max(400, window_width - self.BUTTON_AREA_WIDTH - self.LAYOUT_RIGHT_MARGIN)
-        # 确保下边距严格为40px  
-        content_height = max(300, window_height - self.LAYOUT_TOP_MARGIN - self.LAYOUT_BOTTOM_MARGIN)
+        self.content_geometry = self.simple_content_geometry
+        content_x, content_y, content_width, content_height = self.content_geometry(
+            window_width, window_height)
         
         print(f"📐 响应式内容区域参数:")
         print(f"   窗口尺寸: {window_width} x {window_height}")
@@ -619,8 +480,6 @@ class SimpleTkinterToolsInterface:
         print(f"   内容尺寸: {content_width} x {content_height}")
         print(f"   统一边距: 上{self.LAYOUT_TOP_MARGIN}px 右{self.LAYOUT_RIGHT_MARGIN}px 下{self.LAYOUT_BOTTOM_MARGIN}px")
         print(f"   左侧按钮区域: {self.BUTTON_AREA_WIDTH}px (左边距{self.LAYOUT_LEFT_MARGIN}px + 按钮宽度{self.BUTTON_WIDTH}px)")
-        print(f"   验证计算: 右边缘={content_x + content_width}, 窗口宽度={window_width}, 右边距={window_width - (content_x + content_width)}px")
-        print(f"   验证计算: 下边缘={content_y + content_height}, 窗口高度={window_height}, 下边距={window_height - (content_y + content_height)}px")
         
         # 删除旧的内容区域
         if hasattr(self, 'content_window') and self.content_window:
@@ -631,7 +490,7 @@ class SimpleTkinterToolsInterface:
         # 创建新的内容框架
         self.content_frame = tk.Frame(self.bg_canvas, bg='white', relief='raised', bd=1)
         
-        # 放置内容区域 - 确保精确的40px右边距和下边距
+        # 放置内容区域 - 确保精确的右边距和下边距
         self.content_window = self.bg_canvas.create_window(
             content_x, content_y, window=self.content_frame, anchor='nw',
             width=content_width, height=content_height
@@ -639,99 +498,7 @@ class SimpleTkinterToolsInterface:
         
         # 添加默认内容
         self.show_simple_welcome_content()
-        
-        # 强制刷新显示
-        self.force_refresh_display()
-    
-    def on_content_area_resize(self, event=None):
-        """内容区域窗口大小变化处理"""
-        if event and event.widget == self.root:
-            print(f"🔄 检测到窗口大小变化: {event.width}x{event.height}")
-            # 延迟更新以避免频繁调用
-            if hasattr(self, '_content_area_resize_timer'):
-                self.root.after_cancel(self._content_area_resize_timer)
-            self._content_area_resize_timer = self.root.after(100, self.update_responsive_content_layout)
-    
-    def update_responsive_content_layout(self):
-        """更新响应式内容布局"""
-        try:
-            # 强制更新所有几何信息
-            self.root.update_idletasks()
-            self.bg_canvas.update_idletasks()
-            
-            window_width = self.bg_canvas.winfo_width() or 1200
-            window_height = self.bg_canvas.winfo_height() or 800
-            
-            # 使用统一的布局常量
-            # 精确计算新的内容区域尺寸和位置
-            content_x = self.BUTTON_AREA_WIDTH
-            content_y = self.LAYOUT_TOP_MARGIN
-            # 确保右边距严格为40px
-            new_width = max(400, window_width - self.BUTTON_AREA_WIDTH - self.LAYOUT_RIGHT_MARGIN)
-            # 确保下边距严格为40px
-            new_height = max(300, window_height - self.LAYOUT_TOP_MARGIN - self.LAYOUT_BOTTOM_MARGIN)
-            
-            # 更新内容窗口位置和尺寸
-            if hasattr(self, 'content_window') and self.content_window:
-                self.bg_canvas.coords(self.content_window, content_x, content_y)
-                self.bg_canvas.itemconfig(self.content_window, width=new_width, height=new_height)
-            
-            # 强制刷新显示
-            self.force_refresh_display()
-            
-            print(f"📐 响应式内容区域更新: {new_width}x{new_height} 位置({content_x}, {content_y})")
-            print(f"   统一边距验证: 右边距={window_width - (content_x + new_width)}px, 下边距={window_height - (content_y + new_height)}px")
-            print(f"   左侧按钮区域: {self.BUTTON_AREA_WIDTH}px")
-            
-        except Exception as e:
-            print(f"❌ 更新响应式内容布局失败: {e}")
-    
-    def force_refresh_display(self):
-        """强制刷新界面显示"""
-        try:
-            print("🔄 强制刷新界面显示...")
-            
-            # 多层刷新确保立即生效
-            if hasattr(self, 'content_frame') and self.content_frame:
-                self.content_frame.update_idletasks()
-                self.content_frame.update()
-            
-            if hasattr(self, 'bg_canvas') and self.bg_canvas:
-                self.bg_canvas.update_idletasks()
-                self.bg_canvas.update()
-            
-            if hasattr(self, 'root') and self.root:
-                self.root.update_idletasks()
-                self.root.update()
-            
-            print("✅ 界面刷新完成")
-            
-        except Exception as e:
-            print(f"❌ 刷新失败: {e}")
-    
-    def start_refresh_timer(self):
-        """启动定时刷新机制"""
-        print("⏰ 启动定时刷新机制...")
-        self.refresh_display_periodically()
     
-    def refresh_display_periodically(self):
-        """定期刷新显示"""
-        try:
-            # 轻量级刷新，只更新必要组件
-            if hasattr(self, 'content_frame') and self.content_frame:
-                self.content_frame.update_idletasks()
-            
-            if hasattr(self, 'bg_canvas') and self.bg_canvas:
-                self.bg_canvas.update_idletasks()
-            
-        except Exception as e:
-            print(f"定时刷新错误: {e}")
-        
-        # 每1秒刷新一次
-        if hasattr(self, 'root') and self.root:
-            self.root.after(1000, self.refresh_display_periodically)
-    
-
     def show_simple_welcome_content(self):
         """显示简单的欢迎内容"""
         # 清除之前的内容
@@ -760,8 +527,10 @@ class SimpleTkinterToolsInterface:
                                          bg='white', fg='#666666')
         self.window_info_label.pack(pady=10)
         
-        # 开始更新窗口信息
-        self.update_window_info()
+        # 由共享时钟每秒更新窗口信息（标签销毁后自动停止）
+        label = self.window_info_label
+        get_clock_ticker(self.root).subscribe(
+            self.get_window_info_text, lambda text: label.config(text=text), label)
     
     def simple_switch_tab(self, tab_index):
         """简单的选项卡切换"""
@@ -1057,29 +826,13 @@ class SimpleTkinterToolsInterface:
                             justify='center')
         info_label.pack(pady=20)
     
-    def update_simple_time(self):
-        """更新简单时间显示"""
-        try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.bg_canvas.itemconfig(self.time_text_id, text=current_time)
-            self.root.after(1000, self.update_simple_time)
-        except Exception as e:
-            print(f"时间更新错误: {e}")
-    
-    def update_window_info(self):
-        """更新窗口信息显示"""
-        try:
-            width = self.root.winfo_width()
-            height = self.root.winfo_height()
-            state = self.root.state()
-            resizable = self.root.resizable()
-            
-            info_text = f"窗口信息: {width}×{height} | 状态: {state} | 可调整: {resizable}"
-            self.window_info_label.config(text=info_text)
-            
-            self.root.after(1000, self.update_window_info)
-        except Exception as e:
-            print(f"窗口信息更新错误: {e}")
+    def get_window_info_text(self, now=None):
+        """窗口信息显示的文字"""
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        state = self.root.state()
+        resizable = self.root.resizable()
+        return f"窗口信息: {width}×{height} | 状态: {state} | 可调整: {resizable}"
 
     def create_interface(self):
         """创建选项卡界面（优化版本，防止卡顿）"""
@@ -1090,8 +843,7 @@ class SimpleTkinterToolsInterface:
         
         # 分步骤创建界面，避免一次性创建导致卡顿
         self.root.after(100, self.step1_create_header)
-        # 绑定根窗口变化时整体刷新（已使用 _perform_resize 管理）
-        # self.root.bind('<Configure>', self.on_window_resize)
+        # 窗口大小变化由布局调度统一处理（create_content_area 中启用）
 
     def show_loading_message(self):
         """显示加载提示"""
@@ -1106,7 +858,8 @@ class SimpleTkinterToolsInterface:
         """步骤1：创建头部"""
         print("📋 创建头部区域...")
         try:
-            self.create_header()
+            with get_startup_profiler().phase("创建头部"):
+                self.create_header()
             self.root.after(50, self.step2_create_tabs)
         except Exception as e:
             print(f"❌ 创建头部失败: {e}")
@@ -1116,7 +869,8 @@ class SimpleTkinterToolsInterface:
         """步骤2：创建选项卡"""
         print("🔘 创建选项卡按钮...")
         try:
-            self.create_tabs()
+            with get_startup_profiler().phase("创建选项卡按钮"):
+                self.create_tabs()
             self.root.after(50, self.step3_create_content)
         except Exception as e:
             print(f"❌ 创建选项卡失败: {e}")
@@ -1126,7 +880,8 @@ class SimpleTkinterToolsInterface:
         """步骤3：创建内容区域"""
         print("📱 创建内容区域...")
         try:
-            self.create_content_area()
+            with get_startup_profiler().phase("创建内容区域"):
+                self.create_content_area()
             self.root.after(50, self.step4_create_status)
         except Exception as e:
             print(f"❌ 创建内容区域失败: {e}")
@@ -1136,7 +891,8 @@ class SimpleTkinterToolsInterface:
         """步骤4：创建状态栏"""
         print("📊 创建状态栏...")
         try:
-            self.create_status_bar()
+            with get_startup_profiler().phase("创建状态栏"):
+                self.create_status_bar()
             self.root.after(50, self.step5_finalize)
         except Exception as e:
             print(f"❌ 创建状态栏失败: {e}")
@@ -1155,6 +911,8 @@ class SimpleTkinterToolsInterface:
         # 默认选择第一个选项卡
         if self.tab_buttons:
             self.switch_tab(0)
+        
+        get_startup_profiler().mark_interactive(self.root)
     
     def create_tab_interface(self):
         """创建选项卡界面（在渐变背景上）- 已废弃，使用分步骤创建"""
@@ -1304,15 +1062,7 @@ class SimpleTkinterToolsInterface:
     def create_content_area(self):
         """创建放大的清爽整洁的内容区域"""
         # 获取当前窗口尺寸
-        self.root.update_idletasks()
-        window_width = self.root.winfo_width()
-        window_height = self.root.winfo_height()
-        
-        # 如果窗口尺寸无效，使用默认值
-        if window_width <= 1:
-            window_width = 1200
-        if window_height <= 1:
-            window_height = 800
+        window_width, window_height = self.get_layout_size()
         
         # 放大的布局参数 - 与create_simple_content_area保持一致
         content_x = 140   # 减少左边距 (180 -> 140)
@@ -1355,21 +1105,10 @@ class SimpleTkinterToolsInterface:
         # 默认显示欢迎内容
         self.show_welcome_content()
         
-        # 绑定窗口变化时动态调整内容区大小 - 使用放大参数
-        def _resize_content(event=None):
-            if hasattr(self, 'content_window') and event and event.widget == self.root:
-                win_w = self.bg_canvas.winfo_width()
-                win_h = self.bg_canvas.winfo_height()
-                # 使用与create_simple_content_area相同的放大参数
-                new_w = max(600, win_w - 160)  # 更大的内容区域
-                new_h = max(400, win_h - 120)  # 更大的内容区域
-                self.bg_canvas.itemconfig(self.content_window, width=new_w, height=new_h)
-                print(f"📐 放大内容区域自动调整: {new_w}x{new_h}")
-                
-                # 同时重绘背景
-                self.draw_background()
-        
-        self.root.bind('<Configure>', _resize_content)
+        # 窗口变化时由布局调度调整内容区大小并重绘背景 - 使用放大参数
+        self.content_geometry = self.enlarged_content_geometry
+        self.use_gradient_background = True
+        self.setup_layout_scheduler().request()
     
     def create_clean_background(self, x, y, width, height):
         """创建清爽简洁的背景效果"""
@@ -1650,11 +1389,8 @@ class SimpleTkinterToolsInterface:
             
             # 确保内容区域尺寸一致
             if hasattr(self, 'content_window') and self.content_window:
-                self.root.update_idletasks()
-                
                 # 获取当前窗口尺寸
-                win_w = self.bg_canvas.winfo_width() if self.bg_canvas else 1200
-                win_h = self.bg_canvas.winfo_height() if self.bg_canvas else 800
+                win_w, win_h = self.get_layout_size()
                 
                 # 固定的布局参数 - 关键在于保持一致
                 SIDEBAR_WIDTH = 220
@@ -2002,29 +1738,24 @@ class SimpleTkinterToolsInterface:
         pass
     
     def update_time(self):
-        """更新时间显示"""
-        try:
-            if hasattr(self, 'time_label') and self.time_label and self.time_label.winfo_exists():
-                current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.time_label.config(text=current_time)
-        except tk.TclError:
-            # 时间标签可能已被删除，尝试重新创建状态栏
-            print("⚠️ 时间标签丢失，重新创建状态栏")
-            try:
-                self.create_status_bar()
-            except:
-                pass
-        except Exception as e:
-            print(f"❌ 背景绘制错误: {e}")
-            self.bg_canvas.config(bg='#CCCCCC')
+        """状态栏时间由共享时钟每秒更新（状态栏重新创建后立即刷新一次）"""
+        ticker = get_clock_ticker(self.root)
+        if self._status_time_token is None:
+            self._status_time_token = ticker.subscribe_canvas_text(
+                self.bg_canvas, lambda: getattr(self, 'time_text', None), DATETIME_FORMAT)
+        else:
+            ticker.refresh(self._status_time_token)
 
 
 def main():
     """简化的主函数，强制使用放大版界面"""
     print("🚀 启动电源测试设备集成控制系统...")
+    profiler = get_startup_profiler()
     
     # 创建根窗口
-    root = tk.Tk()
+    with profiler.phase("创建根窗口"):
+        root = tk.Tk()
+    profiler.watch_first_paint(root)
     root.title("电源测试设备集成控制系统")
     
     # 强制设置窗口可调整大小
@@ -2069,14 +1800,18 @@ def main():
     
     # 强制使用简化界面（确保使用放大版本）
     print("🎯 强制使用放大版简化界面...")
-    interface.create_simplified_interface()
+    with profiler.phase("创建简化界面"):
+        interface.create_simplified_interface()
     
     # 确保窗口布局完全初始化后进行一次手动刷新
     def final_layout_refresh():
         print("🔄 执行最终布局刷新...")
-        # 强制触发一次窗口调整事件，确保所有组件都正确布局
-        root.update_idletasks()
-        interface.handle_unified_window_resize()
+        # 按当前窗口尺寸执行一次布局，确保所有组件都正确布局
+        with profiler.phase("最终布局刷新"):
+            interface.refresh_layout()
+        profiler.mark_interactive(root)
+        # 界面可以操作后，在后台预先导入数据库、串口等模块
+        prewarm_imports()
     
     # 延迟执行最终刷新，确保所有初始化都完成
     root.after(500, final_layout_refresh)
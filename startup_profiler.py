@@ -0,0 +1,200 @@
+"""
+启动过程计时
+记录各启动阶段的耗时、重量级模块（mysql.connector、PIL.Image/ImageTk、pyvisa、pyserial）的导入耗时、
+首次绘制时间和可交互时间，启动完成后写入JSON报告，便于比较不同版本的启动速度
+"""
+import importlib.abc
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config_store import atomic_write
+
+# 需要单独统计导入耗时的模块（按程序实际导入的完整模块名：顶层包本身很轻，
+# 耗时在子模块上，例如 from PIL import Image, ImageTk 的主要耗时是PIL.Image和PIL.ImageTk）
+HEAVY_MODULES = ("mysql.connector", "PIL.Image", "PIL.ImageTk", "pyvisa",
+                 "serial", "serial.tools.list_ports")
+
+STARTUP_REPORT_FILENAME = "Startup Report.json"
+MAX_REPORTS = 20    # 报告文件中保留的最近启动次数
+
+_origin = time.perf_counter()   # 计时起点：入口脚本第一次导入本模块的时间
+
+
+def _elapsed_ms(since=None):
+    return round((time.perf_counter() - (_origin if since is None else since)) * 1000, 1)
+
+
+class _TimedLoader:
+    """包装模块的加载器，记录exec_module的耗时（包含该模块导入的其他模块）"""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start_time = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.imports[self._name] = {
+                "status": "imported",
+                "start_ms": round((start_time - _origin) * 1000, 1),
+                "duration_ms": _elapsed_ms(start_time),
+            }
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """在sys.meta_path最前面拦截需要统计的模块，其余模块不受影响"""
+
+    def __init__(self, profiler, names):
+        self._profiler = profiler
+        self._names = set(names)
+
+    def find_spec(self, name, path=None, target=None):
+        if name not in self._names:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, name, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """启动计时器（整个进程共享一个实例，见 get_startup_profiler）"""
+
+    def __init__(self, modules=HEAVY_MODULES):
+        self.phases = []            # [{"name", "start_ms", "duration_ms"}]
+        self.marks = {}             # 名称 -> 距离起点的毫秒数
+        self.imports = {}           # 模块名 -> 导入统计
+        self.modules = tuple(modules)
+        self.entry = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+        self.report_written = False
+        self._root = None
+
+        for name in self.modules:
+            if name in sys.modules:
+                self.imports[name] = {"status": "preloaded"}
+        sys.meta_path.insert(0, _ImportTimer(self, self.modules))
+
+    @contextmanager
+    def phase(self, name):
+        """统计一个启动阶段的耗时：with profiler.phase("名称"): ..."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "name": name,
+                "start_ms": round((start_time - _origin) * 1000, 1),
+                "duration_ms": _elapsed_ms(start_time),
+            })
+
+    def mark(self, name):
+        """记录一个时间点（同名时间点只记录第一次）"""
+        if name not in self.marks:
+            self.marks[name] = _elapsed_ms()
+        return self.marks[name]
+
+    def watch_first_paint(self, root):
+        """根窗口第一次显示并处理完等待中的绘制后，记录 first_paint"""
+        self._root = root
+
+        def on_map(event):
+            if event.widget is root:
+                root.after_idle(lambda: self.mark("first_paint"))
+
+        root.bind('<Map>', on_map, add='+')
+
+    def mark_interactive(self, root=None, path=None):
+        """界面创建完成后调用：在下一次空闲时记录 interactive 并写入报告"""
+        root = root or self._root
+
+        def finish():
+            self.mark("interactive")
+            self.write_report(path)
+
+        if root is None:
+            finish()
+        else:
+            root.after_idle(finish)
+
+    def build_report(self):
+        imports = {}
+        for name in self.modules:
+            imports[name] = self.imports.get(name, {"status": "not_imported"})
+        return {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "version": _get_version(),
+            "entry": self.entry,
+            "python": sys.version.split()[0],
+            "phases": list(self.phases),
+            "imports": imports,
+            "time_to_first_paint_ms": self.marks.get("first_paint"),
+            "time_to_interactive_ms": self.marks.get("interactive"),
+            "marks": dict(self.marks),
+        }
+
+    def write_report(self, path=None):
+        """把本次启动的统计追加到报告文件（只保留最近MAX_REPORTS次），返回本次的报告"""
+        if self.report_written:
+            return None
+        self.report_written = True
+        report = self.build_report()
+        path = path or get_startup_report_path()
+        try:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    reports = json.load(f)
+                if not isinstance(reports, list):
+                    reports = []
+            except (OSError, ValueError):
+                reports = []
+            reports = (reports + [report])[-MAX_REPORTS:]
+            atomic_write(path, json.dumps(reports, ensure_ascii=False, indent=2))
+        except Exception as e:
+            print(f"⚠️ 写入启动报告失败: {e}")
+            return report
+
+        print(f"⏱️ 启动完成：首次绘制 {report['time_to_first_paint_ms']} ms，"
+              f"可交互 {report['time_to_interactive_ms']} ms（报告: {path}）")
+        return report
+
+
+def _get_version():
+    """读取main_new中的版本信息（已导入或作为入口运行时），用于区分不同版本的报告"""
+    for name in ('main_new', '__main__'):
+        module = sys.modules.get(name)
+        if module is not None and hasattr(module, 'VERSION'):
+            return f"{module.VERSION}({getattr(module, 'BUILD_DATE', '')})"
+    return None
+
+
+def get_startup_report_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), STARTUP_REPORT_FILENAME)
+
+
+_profiler = None
+
+
+def get_startup_profiler():
+    """返回进程共享的启动计时器（第一次调用时开始拦截重量级模块的导入）"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
@@ -6,8 +6,14 @@
 """
 import tkinter as tk
 from datetime import datetime
-import time
-import threading
+from clock_ticker import get_clock_ticker, DATETIME_FORMAT
+
+STATUS_MESSAGES = [
+    "系统运行正常 | 准备就绪",
+    "设备检测中 | 状态良好", 
+    "数据传输正常 | 连接稳定",
+    "性能监控中 | 运行流畅"
+]
 
 class StatusBarEnhancedInterface:
     def __init__(self):
@@ -134,36 +140,17 @@ class StatusBarEnhancedInterface:
         print(f"   - 底部边距: 15像素")
         print(f"   - 时间位置: x={canvas_width-20}")
         
-    def update_time_display(self):
-        """更新时间显示"""
-        if hasattr(self, 'time_text'):
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.canvas.itemconfig(self.time_text, text=current_time)
-            
-        # 更新状态文本（演示动态状态）
-        if hasattr(self, 'status_text'):
-            status_messages = [
-                "系统运行正常 | 准备就绪",
-                "设备检测中 | 状态良好", 
-                "数据传输正常 | 连接稳定",
-                "性能监控中 | 运行流畅"
-            ]
-            status_index = int(time.time()) % len(status_messages)
-            self.canvas.itemconfig(self.status_text, text=status_messages[status_index])
-            
     def start_time_update(self):
-        """启动时间更新线程"""
-        def update_thread():
-            while True:
-                try:
-                    self.root.after(0, self.update_time_display)
-                    time.sleep(1)
-                except:
-                    break
-                    
-        thread = threading.Thread(target=update_thread, daemon=True)
-        thread.start()
-        
+        """订阅共享时钟：时间和状态文本每秒更新（状态栏重建后按新的项目编号更新）"""
+        ticker = get_clock_ticker(self.root)
+        ticker.subscribe_canvas_text(self.canvas, lambda: getattr(self, 'time_text', None),
+                                     DATETIME_FORMAT)
+        # 演示动态状态
+        ticker.subscribe(
+            lambda now: STATUS_MESSAGES[int(now.timestamp()) % len(STATUS_MESSAGES)],
+            lambda text: self.canvas.itemconfig(self.status_text, text=text),
+            self.canvas)
+            
     def on_window_resize(self, event=None):
         """响应窗口大小改变"""
         if event and event.widget == self.root:
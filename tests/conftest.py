@@ -0,0 +1,10 @@
+"""
+测试公共设置：把项目根目录和interface目录加入导入路径（与程序运行时相同）
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "interface")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
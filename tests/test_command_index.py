@@ -0,0 +1,92 @@
+"""
+仪器指令索引：多列求交、级联筛选选项和"全部"
+"""
+import types
+
+from command_index import FILTER_ALL, CommandIndex
+from interface.tabs.instrument_command import InstrumentCommandTab
+
+
+def row(device_type, device_model, function_type):
+    return {'device_type': device_type, 'device_model': device_model,
+            'function_type': function_type}
+
+
+ROWS = [
+    row("示波器", "MSO46B", "测量"),
+    row("示波器", "MDO3034", "截图"),
+    row("电子负载", "IT8512", "测量"),
+    row("示波器", "MSO46B", "截图"),
+    row("电子负载", "", "复位"),
+]
+
+
+def test_query_intersects_columns_in_original_order():
+    index = CommandIndex(ROWS)
+    assert index.query(device_type="示波器", function_type="截图") == [ROWS[1], ROWS[3]]
+    assert index.query(device_type="电子负载", device_model="MSO46B") == []
+    assert index.query(device_type="示波器", device_model="不存在") == []
+
+
+def test_filter_all_and_none_are_ignored():
+    index = CommandIndex(ROWS)
+    assert index.query() == ROWS
+    assert index.query(device_type=FILTER_ALL, device_model=None) == ROWS
+    assert index.query(device_type=FILTER_ALL, function_type="测量") == [ROWS[0], ROWS[2]]
+
+
+def test_values_cascade_and_skip_empty():
+    index = CommandIndex(ROWS)
+    assert index.values('device_type') == ["电子负载", "示波器"]
+    assert index.values('device_model', device_type="电子负载") == ["IT8512"]
+    assert index.values('device_model', device_type=FILTER_ALL) == ["IT8512", "MDO3034", "MSO46B"]
+    assert index.values('function_type', device_type="示波器", device_model="MDO3034") == ["截图"]
+
+
+def test_find_by_key():
+    index = CommandIndex(ROWS)
+    assert index.find("示波器", "MSO46B", "截图") is ROWS[3]
+    assert index.find("示波器", "MSO46B", "复位") is None
+
+
+class FakeCombobox:
+    def __init__(self, value):
+        self.value = value
+        self.options = {}
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+
+def test_update_filter_options_resets_removed_selections():
+    tab = types.SimpleNamespace(
+        command_index=CommandIndex(ROWS[2:3]),
+        device_filter=FakeCombobox("示波器"),
+        model_filter=FakeCombobox("MSO46B"),
+        function_filter=FakeCombobox("截图"),
+    )
+    InstrumentCommandTab.update_filter_options(tab)
+    assert tab.device_filter.get() == FILTER_ALL
+    assert tab.device_filter.options['values'] == [FILTER_ALL, "电子负载"]
+    assert tab.model_filter.get() == FILTER_ALL
+    assert tab.function_filter.get() == FILTER_ALL
+
+
+def test_update_filter_options_keeps_valid_selections():
+    tab = types.SimpleNamespace(
+        command_index=CommandIndex(ROWS),
+        device_filter=FakeCombobox("示波器"),
+        model_filter=FakeCombobox("MSO46B"),
+        function_filter=FakeCombobox("测量"),
+    )
+    InstrumentCommandTab.update_filter_options(tab)
+    assert (tab.device_filter.get(), tab.model_filter.get(), tab.function_filter.get()) == \
+        ("示波器", "MSO46B", "测量")
+    assert tab.model_filter.options['values'] == [FILTER_ALL, "MDO3034", "MSO46B"]
+    assert tab.function_filter.options['values'] == [FILTER_ALL, "截图", "测量"]
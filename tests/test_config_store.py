@@ -0,0 +1,64 @@
+"""
+原子写入与使用它的配置/缓存文件
+"""
+import json
+import os
+
+import pytest
+
+import config_store
+from config_store import ConfigStore, atomic_write
+from discovery_cache import DiscoveryCache
+from instrument_identifier import InstrumentIdentity
+from startup_profiler import StartupProfiler
+
+
+def test_atomic_write_creates_and_replaces(tmp_path):
+    path = tmp_path / "sub" / "data.json"
+    atomic_write(str(path), "第一版")
+    atomic_write(str(path), b"second")
+    assert path.read_bytes() == b"second"
+    assert os.listdir(path.parent) == ["data.json"]
+
+
+def test_atomic_write_failure_keeps_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_store.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        atomic_write(str(path), "new")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_config_store_flush_and_reload(tmp_path):
+    path = str(tmp_path / "System Information.json")
+    store = ConfigStore(path, default={"device_addresses": {}}, save_delay=60)
+    assert store.set_device_addresses({"oscilloscope": "TCPIP::1::INSTR"})
+    store.flush()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)["device_addresses"] == {"oscilloscope": "TCPIP::1::INSTR"}
+    other = ConfigStore(path, save_delay=60)
+    assert other.get_device_address("oscilloscope") == "TCPIP::1::INSTR"
+
+
+def test_discovery_cache_round_trip(tmp_path):
+    path = str(tmp_path / "Device Discovery Cache.json")
+    identity = InstrumentIdentity("TCPIP::1::INSTR", idn="TEKTRONIX,MSO46B,C0001,FV:1.0")
+    DiscoveryCache(path).store(["TCPIP::1::INSTR", "ASRL3::INSTR"], {"TCPIP::1::INSTR": identity})
+    addresses, identities = DiscoveryCache(path).get()
+    assert addresses == ["TCPIP::1::INSTR", "ASRL3::INSTR"]
+    assert identities["TCPIP::1::INSTR"].model == "MSO46B"
+
+
+def test_startup_report_keeps_previous_runs(tmp_path):
+    path = str(tmp_path / "Startup Report.json")
+    for _ in range(2):
+        profiler = StartupProfiler(modules=())
+        assert profiler.write_report(path) is not None
+    with open(path, encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
@@ -0,0 +1,101 @@
+"""
+MySQL连接池：复用、健康检查、空闲回收和等待超时（使用假连接，不需要数据库）
+"""
+import threading
+import types
+
+import pytest
+
+import ConnectDatabase
+from ConnectDatabase import MySQLConnectionPool
+
+
+class PoolError(Exception):
+    pass
+
+
+class FakeConnection:
+    def __init__(self, pool_holder):
+        self.pool_holder = pool_holder
+        self.closed = False
+        self.healthy = True
+        self.closed_under_lock = None
+
+    def ping(self, reconnect=False, attempts=1):
+        if not self.healthy:
+            raise OSError("gone")
+
+    def close(self):
+        self.closed = True
+        pool = self.pool_holder.get("pool")
+        if pool is not None:
+            self.closed_under_lock = pool._cond._is_owned()
+
+
+@pytest.fixture
+def pool_factory(monkeypatch):
+    created = []
+    holder = {}
+
+    def connect(**config):
+        conn = FakeConnection(holder)
+        created.append(conn)
+        return conn
+
+    monkeypatch.setattr(ConnectDatabase, "mysql_connector", types.SimpleNamespace(
+        connect=connect, errors=types.SimpleNamespace(PoolError=PoolError)))
+
+    def make(**kwargs):
+        pool = MySQLConnectionPool({}, **kwargs)
+        holder["pool"] = pool
+        return pool, created
+    return make
+
+
+def test_released_connection_is_reused(pool_factory):
+    pool, created = pool_factory()
+    pool.get_connection().close()
+    pool.get_connection().close()
+    stats = pool.get_stats()
+    assert len(created) == 1
+    assert (stats["hits"], stats["misses"], stats["idle"], stats["in_use"]) == (1, 1, 1, 0)
+
+
+def test_unhealthy_connection_is_replaced(pool_factory):
+    pool, created = pool_factory()
+    pool.get_connection().close()
+    created[0].healthy = False
+    pool.get_connection()
+    assert len(created) == 2
+    assert created[0].closed
+    assert pool.get_stats()["health_check_failures"] == 1
+
+
+def test_expired_connections_are_closed_outside_lock(pool_factory):
+    pool, created = pool_factory(idle_timeout=-1)
+    pool.get_connection().close()
+    pool.get_connection()
+    assert created[0].closed
+    assert created[0].closed_under_lock is False
+    assert pool.get_stats()["evicted"] == 1
+
+
+def test_full_pool_times_out(pool_factory):
+    pool, created = pool_factory(max_size=1, checkout_timeout=0.05)
+    pool.get_connection()
+    with pytest.raises(PoolError):
+        pool.get_connection()
+    stats = pool.get_stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection(pool_factory):
+    pool, created = pool_factory(max_size=1, checkout_timeout=5)
+    conn = pool.get_connection()
+    timer = threading.Timer(0.05, conn.close)
+    timer.start()
+    pool.get_connection()
+    timer.join()
+    assert len(created) == 1
+    assert pool.get_stats()["waits"] == 1
@@ -0,0 +1,63 @@
+"""
+后台数据加载服务：call_in_ui 必须安排主线程取队列
+"""
+import threading
+import time
+
+from data_loader import BackgroundDataLoader
+
+
+class FakeRoot:
+    """记录after调用，run_pending模拟主线程事件循环"""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, func):
+        self.calls.append((ms, func))
+        return f"after#{len(self.calls)}"
+
+    def run_pending(self):
+        while self.calls:
+            _, func = self.calls.pop(0)
+            func()
+
+
+def test_call_in_ui_from_main_thread_runs_callback():
+    root = FakeRoot()
+    loader = BackgroundDataLoader(root, workers=0)
+    results = []
+    loader.call_in_ui(results.append, "ok")
+    assert root.calls
+    root.run_pending()
+    assert results == ["ok"]
+    # 队列取空且没有未完成任务后停止轮询
+    assert not root.calls
+    assert not loader._pump_scheduled
+
+
+def test_call_in_ui_from_worker_hops_to_main_thread():
+    root = FakeRoot()
+    loader = BackgroundDataLoader(root, workers=0)
+    results = []
+    worker = threading.Thread(target=loader.call_in_ui, args=(results.append, "ok"))
+    worker.start()
+    worker.join()
+    # 工作线程只请求主线程安排轮询，不直接修改轮询状态
+    assert root.calls == [(0, loader._schedule_pump)]
+    assert not loader._pump_scheduled
+    root.run_pending()
+    assert results == ["ok"]
+
+
+def test_submit_delivers_result():
+    root = FakeRoot()
+    loader = BackgroundDataLoader(root, workers=1)
+    results = []
+    loader.submit(lambda: 42, on_success=results.append)
+    deadline = time.monotonic() + 5
+    while loader._results.qsize() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    root.run_pending()
+    assert results == [42]
+    assert loader._pending == 0
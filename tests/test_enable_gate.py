@@ -0,0 +1,142 @@
+"""
+系统启用状态检查：数据库在线、离线使用缓存、缓存被篡改和数据库查询失败
+"""
+import json
+import time
+import types
+
+import pytest
+
+import ConnectDatabase
+from enable_gate import (ENABLED_STATUS, GATE_ALLOWED, GATE_BLOCKED, EnableGate,
+                         EnableStatusCache)
+
+VERSION = "电源测试设备集成控制系统 V1.0"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "System Enable Cache.json")
+
+
+def offline():
+    raise ConnectionError("无法连接数据库")
+
+
+def run_gate(query_status, cache):
+    gate = EnableGate(query_status, cache)
+    return gate, gate.check_cached(), gate.decide(gate.check_live())
+
+
+def test_online_result_is_cached(cache_path):
+    cache = EnableStatusCache(VERSION, cache_path)
+    gate, cached, decision = run_gate(lambda: ENABLED_STATUS, cache)
+    assert cached is None
+    assert decision == GATE_ALLOWED
+    status, timestamp = cache.get()
+    assert status == ENABLED_STATUS
+    assert cache.is_fresh(timestamp)
+
+    # 下次启动直接放行；数据库给出的"禁用"优先于缓存
+    gate, cached, decision = run_gate(lambda: "禁用", EnableStatusCache(VERSION, cache_path))
+    assert cached == GATE_ALLOWED
+    assert decision == GATE_BLOCKED
+    assert EnableStatusCache(VERSION, cache_path).get()[0] == "禁用"
+
+
+def test_offline_uses_cache_within_ttl(cache_path):
+    EnableStatusCache(VERSION, cache_path).store(ENABLED_STATUS)
+    gate, cached, decision = run_gate(offline, EnableStatusCache(VERSION, cache_path))
+    assert cached == GATE_ALLOWED
+    assert decision == GATE_ALLOWED
+
+
+def test_offline_with_expired_enabled_cache(cache_path):
+    EnableStatusCache(VERSION, cache_path).store(ENABLED_STATUS)
+    cache = EnableStatusCache(VERSION, cache_path, ttl=-1)
+    gate, cached, decision = run_gate(offline, cache)
+    # 过期缓存不能跳过数据库查询，但断网时仍然放行
+    assert cached is None
+    assert decision == GATE_ALLOWED
+
+
+def test_offline_without_cache_is_blocked(cache_path):
+    gate, cached, decision = run_gate(offline, EnableStatusCache(VERSION, cache_path))
+    assert cached is None
+    assert decision == GATE_BLOCKED
+
+
+def test_tampered_cache_is_rejected(cache_path):
+    EnableStatusCache(VERSION, cache_path).store("禁用")
+    with open(cache_path, encoding='utf-8') as f:
+        entry = json.load(f)
+    entry["status"] = ENABLED_STATUS
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+
+    cache = EnableStatusCache(VERSION, cache_path)
+    assert cache.get() is None
+    gate, cached, decision = run_gate(offline, cache)
+    assert decision == GATE_BLOCKED
+
+
+def test_cache_of_other_version_is_ignored(cache_path):
+    EnableStatusCache(VERSION, cache_path).store(ENABLED_STATUS)
+    assert EnableStatusCache("电源测试设备集成控制系统 V2.0", cache_path).get() is None
+
+
+def test_cache_signature_covers_timestamp(cache_path):
+    EnableStatusCache(VERSION, cache_path).store(ENABLED_STATUS)
+    with open(cache_path, encoding='utf-8') as f:
+        entry = json.load(f)
+    entry["timestamp"] = time.time() + 365 * 24 * 3600
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    assert EnableStatusCache(VERSION, cache_path).get() is None
+
+
+class MySQLError(Exception):
+    pass
+
+
+class FailingCursor:
+    def execute(self, query, params=None):
+        raise MySQLError("Lost connection to MySQL server during query")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def cursor(self):
+        return FailingCursor()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_mysql(monkeypatch):
+    monkeypatch.setattr(ConnectDatabase, "mysql_connector", types.SimpleNamespace(Error=MySQLError))
+    monkeypatch.setattr(ConnectDatabase, "get_version_from_main", lambda: "V1.0")
+
+
+def test_query_raises_connection_error_without_connection(fake_mysql, monkeypatch):
+    db = ConnectDatabase.ReadDataBase()
+    monkeypatch.setattr(db, "mysql_connection", lambda: None)
+    with pytest.raises(ConnectionError):
+        db.query_system_enable_status()
+    assert db.get_system_enable_status() is None
+
+
+def test_query_raises_connection_error_on_query_failure(fake_mysql, monkeypatch):
+    db = ConnectDatabase.ReadDataBase()
+    conn = FakeConnection()
+    monkeypatch.setattr(db, "mysql_connection", lambda: conn)
+    with pytest.raises(ConnectionError):
+        db.query_system_enable_status()
+    # 查询失败时连接同样归还
+    assert conn.closed
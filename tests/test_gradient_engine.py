@@ -0,0 +1,53 @@
+"""
+渐变引擎：与原来逐像素计算的三段式渐变（create_hd_gradient）结果完全一致
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import gradient_engine
+
+
+def reference_pixel(x, y, width, height):
+    """原 create_hd_gradient 中逐像素计算的公式"""
+    ratio = y / height
+    if ratio < 0.3:
+        local_ratio = ratio / 0.3
+        smooth_ratio = local_ratio * local_ratio * 0.5
+        start, end = (160, 220, 255), (100, 180, 240)
+    elif ratio < 0.7:
+        local_ratio = (ratio - 0.3) / 0.4
+        smooth_ratio = local_ratio * local_ratio
+        start, end = (100, 180, 240), (60, 120, 200)
+    else:
+        local_ratio = (ratio - 0.7) / 0.3
+        smooth_ratio = local_ratio * local_ratio * 1.5
+        start, end = (60, 120, 200), (20, 40, 80)
+    color = [int(s + (e - s) * smooth_ratio) for s, e in zip(start, end)]
+    light_factor = 1.0 + 0.05 * (1 - abs(x - width / 2) / (width / 2))
+    return tuple(max(0, min(255, int(c * light_factor))) for c in color)
+
+
+@pytest.mark.parametrize("width, height, step", [(1920, 1080, 7), (333, 211, 1)])
+def test_matches_reference_loop(width, height, step):
+    pixels = gradient_engine.render_gradient(width, height)
+    mismatches = [
+        (x, y)
+        for y in range(height)
+        for x in range(0, width, step)
+        if tuple(int(c) for c in pixels[y, x]) != reference_pixel(x, y, width, height)
+    ]
+    assert mismatches == []
+
+
+def test_without_light_columns_are_equal():
+    pixels = gradient_engine.render_gradient(64, 48, light=0)
+    assert (pixels == pixels[:, :1, :]).all()
+
+
+def test_png_and_ppm_headers():
+    pixels = gradient_engine.render_gradient(8, 4)
+    assert gradient_engine.to_ppm(pixels).startswith(b"P6\n8 4\n255\n")
+    png = gradient_engine.to_png(pixels, dpi=192)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert b"pHYs" in png
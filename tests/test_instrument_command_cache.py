@@ -0,0 +1,98 @@
+"""
+仪器指令本地缓存：全量/增量同步的变更计数与删除
+"""
+import pytest
+
+import instrument_command_cache
+from instrument_command_cache import InstrumentCommandCache
+
+
+def command(function_type, cmd, update_time="2024-01-01 00:00:00"):
+    return {
+        'device_type': "示波器", 'device_model': "MSO46B", 'function_type': function_type,
+        'command': cmd, 'params_reminder': None, 'update_time': update_time,
+    }
+
+
+class FakeDatabase:
+    def __init__(self, commands):
+        self.commands = commands
+        self.queries = []
+        self.error = None
+
+    def __call__(self):
+        return self
+
+    def query_instrument_commands(self, since_time=None):
+        self.queries.append(since_time)
+        if self.error:
+            raise self.error
+        if since_time is None:
+            return list(self.commands)
+        return [cmd for cmd in self.commands if cmd['update_time'] >= since_time]
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(commands):
+        db = FakeDatabase(commands)
+        cache = InstrumentCommandCache(str(tmp_path / "cache.db"), db_factory=db)
+        versions = []
+        cache.add_listener(lambda c: versions.append(c.version))
+        return cache, db, versions
+    return make
+
+
+def test_unchanged_full_sync_is_not_a_change(make_cache):
+    cache, db, versions = make_cache([command("测量", "MEAS?"), command("截图", "SAVE:IMAG")])
+    assert cache.sync() == 2
+    assert cache.sync(full=True) == 0
+    assert versions == [1]
+
+
+def test_full_sync_removes_deleted_rows(make_cache):
+    cache, db, versions = make_cache([command("测量", "MEAS?"), command("截图", "SAVE:IMAG")])
+    cache.sync()
+    db.commands = [command("测量", "MEAS?")]
+    assert cache.sync(full=True) == 1
+    assert [cmd['function_type'] for cmd in cache.get_all()] == ["测量"]
+
+
+def test_emptied_table_clears_cache(make_cache):
+    cache, db, versions = make_cache([command("测量", "MEAS?")])
+    cache.sync()
+    db.commands = []
+    assert cache.sync(full=True) == 1
+    assert cache.get_all() == []
+    assert versions == [1, 2]
+
+
+def test_incremental_sync_uses_watermark(make_cache):
+    cache, db, versions = make_cache([command("测量", "MEAS?")])
+    cache.sync()
+    db.commands.append(command("截图", "SAVE:IMAG", "2024-01-02 00:00:00"))
+    assert cache.sync() == 1
+    assert db.queries == [None, "2024-01-01 00:00:00"]
+    assert cache.get_watermark() == "2024-01-02 00:00:00"
+    # 水位线那一秒的记录会被重复拉到，内容未变化时不计入变更
+    assert cache.sync() == 0
+
+
+def test_full_sync_is_due_after_interval(make_cache, monkeypatch):
+    cache, db, versions = make_cache([command("测量", "MEAS?")])
+    cache.sync()
+    assert not cache.full_sync_due()
+    monkeypatch.setattr(instrument_command_cache, "FULL_SYNC_INTERVAL", 0)
+    assert cache.full_sync_due()
+    db.commands = []
+    assert cache.sync() == 1
+    assert db.queries[-1] is None
+
+
+def test_database_error_keeps_cache(make_cache):
+    cache, db, versions = make_cache([command("测量", "MEAS?")])
+    cache.sync()
+    db.error = ConnectionError("down")
+    with pytest.raises(ConnectionError):
+        cache.sync(full=True)
+    assert len(cache.get_all()) == 1
@@ -0,0 +1,48 @@
+"""
+仪器识别：*IDN? 解析和按型号分配设备角色
+"""
+import pytest
+
+from instrument_identifier import InstrumentIdentity, classify_instrument, parse_idn
+
+
+@pytest.mark.parametrize("manufacturer, model, role", [
+    ("TEKTRONIX", "MSO46B", "oscilloscope"),
+    ("KEYSIGHT TECHNOLOGIES", "DSOX1204G", "oscilloscope"),
+    ("RIGOL TECHNOLOGIES", "DS1054Z", "oscilloscope"),
+    ("RIGOL TECHNOLOGIES", "MSO5074", "oscilloscope"),
+    ("RIGOL TECHNOLOGIES", "DHO1074", "oscilloscope"),
+    ("RIGOL TECHNOLOGIES", "DSG830", None),
+    ("RIGOL TECHNOLOGIES", "DSA815", None),
+    ("RIGOL TECHNOLOGIES", "DL3021", "electronic_load"),
+    ("LECROY", "WAVERUNNER9254M", "oscilloscope"),
+    ("LECROY", "HDO6104A", "oscilloscope"),
+    ("LECROY", "WS3024Z", "oscilloscope"),
+    ("Teledyne LeCroy", "T3DSO1204", "oscilloscope"),
+    ("Teledyne LeCroy", "T3AFG80", None),
+    ("Teledyne Test Tools", "T3EL15060", "electronic_load"),
+    ("Teledyne Test Tools", "T3PS3000", None),
+    ("CHROMA", "61605", "ac_source"),
+    ("CHROMA", "63206A", "electronic_load"),
+    ("ITECH Ltd.", "IT8512+", "electronic_load"),
+    ("Agilent Technologies", "34970A", "control_box"),
+    ("UNKNOWN", "", None),
+])
+def test_classify_instrument(manufacturer, model, role):
+    assert classify_instrument(manufacturer, model) == role
+
+
+def test_parse_idn_keeps_commas_in_firmware():
+    fields = parse_idn("TEKTRONIX,MSO46B,C012345,CF:91.1CT FV:1.44.3.433,extra\n")
+    assert fields == {"manufacturer": "TEKTRONIX", "model": "MSO46B", "serial": "C012345",
+                      "firmware": "CF:91.1CT FV:1.44.3.433,extra"}
+
+
+def test_parse_idn_short_response():
+    assert parse_idn("FAKE")["model"] == ""
+
+
+def test_identity_without_response_has_no_role():
+    identity = InstrumentIdentity("TCPIP::1::INSTR", error="timeout")
+    assert identity.role is None
+    assert "无响应" in identity.describe()
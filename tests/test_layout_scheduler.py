@@ -0,0 +1,105 @@
+"""
+窗口布局调度：连续的尺寸事件每帧只布局一次（使用模拟控件，不需要显示器）
+"""
+import types
+
+from layout_scheduler import LayoutScheduler
+
+
+class FakeWidget:
+    def __init__(self, width=1, height=1):
+        self.width = width
+        self.height = height
+        self.bindings = {}
+        self.pending = {}
+        self._next_id = 0
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.pending[self._next_id] = func
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def configure_event(self, width, height, widget=None):
+        event = types.SimpleNamespace(widget=widget or self, width=width, height=height)
+        self.bindings['<Configure>'](event)
+
+    def run_frame(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+
+def make_scheduler(widget):
+    passes = []
+    scheduler = LayoutScheduler(widget, lambda width, height: passes.append((width, height)))
+    return scheduler, passes
+
+
+def test_resize_burst_is_laid_out_once_per_frame():
+    widget = FakeWidget()
+    scheduler, passes = make_scheduler(widget)
+    for width in range(800, 900, 10):
+        widget.configure_event(width, 600)
+    assert len(widget.pending) == 1
+    widget.run_frame()
+    assert passes == [(890, 600)]
+    assert (scheduler.event_count, scheduler.pass_count) == (10, 1)
+
+
+def test_same_size_is_not_laid_out_again():
+    widget = FakeWidget()
+    scheduler, passes = make_scheduler(widget)
+    widget.configure_event(800, 600)
+    widget.run_frame()
+    # 移动窗口时尺寸不变
+    widget.configure_event(800, 600)
+    widget.run_frame()
+    assert passes == [(800, 600)]
+
+
+def test_child_configure_events_are_ignored():
+    widget = FakeWidget()
+    scheduler, passes = make_scheduler(widget)
+    widget.configure_event(300, 200, widget=object())
+    assert not widget.pending
+    assert scheduler.event_count == 0
+
+
+def test_request_forces_layout_with_known_or_default_size():
+    widget = FakeWidget()
+    scheduler, passes = make_scheduler(widget)
+    scheduler.request(immediate=True)
+    assert passes == [(1200, 800)]
+    widget.width, widget.height = 1000, 700
+    scheduler.request()
+    scheduler.flush()
+    assert passes == [(1200, 800), (1000, 700)]
+    assert not widget.pending
+
+
+def test_resize_during_layout_schedules_another_pass():
+    widget = FakeWidget()
+    passes = []
+
+    def layout(width, height):
+        passes.append((width, height))
+        if len(passes) == 1:
+            widget.configure_event(width + 20, height)
+
+    LayoutScheduler(widget, layout)
+    widget.configure_event(800, 600)
+    widget.run_frame()
+    widget.run_frame()
+    assert passes == [(800, 600), (820, 600)]
@@ -0,0 +1,84 @@
+"""
+网络仪器扫描：对本机的模拟仪器做端口探测
+"""
+import socket
+import socketserver
+import threading
+
+import pytest
+
+import network_scanner
+from network_scanner import (HISLIP_PORT, VXI11_PORTMAP_PORT, scan_hosts, scan_subnets,
+                             to_visa_address)
+
+
+class FakeInstrumentHandler(socketserver.StreamRequestHandler):
+    """模拟仪器：按行接收SCPI指令，对*IDN?返回预设的标识字符串"""
+
+    def handle(self):
+        for line in self.rfile:
+            command = line.strip().decode('utf-8', errors='replace')
+            if command.upper() == '*IDN?':
+                self.wfile.write((self.server.idn + '\n').encode('utf-8'))
+            elif command.endswith('?'):
+                self.wfile.write(b'0\n')
+
+
+class FakeInstrumentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def fake_instrument():
+    server = FakeInstrumentServer(("127.0.0.1", 0), FakeInstrumentHandler)
+    server.idn = "TEKTRONIX,MSO46B,C012345,CF:91.1CT"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_port():
+    """一个当前没有监听的本机端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_fake_instrument_answers_idn(fake_instrument):
+    with socket.create_connection(fake_instrument.server_address, timeout=2) as sock:
+        sock.sendall(b"*IDN?\n")
+        assert sock.makefile('rb').readline() == b"TEKTRONIX,MSO46B,C012345,CF:91.1CT\n"
+
+
+def test_scan_hosts_reports_only_open_ports(fake_instrument, closed_port):
+    port = fake_instrument.server_address[1]
+    found = scan_hosts(["127.0.0.1"], ports=(port, closed_port), timeout=1)
+    assert found == {"127.0.0.1": [port]}
+
+
+def test_scan_hosts_skips_silent_hosts(closed_port):
+    assert scan_hosts(["127.0.0.1"], ports=(closed_port,), timeout=1) == {}
+
+
+def test_scan_subnets_probes_each_host_once(fake_instrument, monkeypatch):
+    port = fake_instrument.server_address[1]
+    probed = []
+    real_scan_hosts = network_scanner.scan_hosts
+
+    def record(ips, *args):
+        probed.extend(ips)
+        return real_scan_hosts(ips, *args)
+
+    monkeypatch.setattr(network_scanner, "scan_hosts", record)
+    found = scan_subnets(["127.0.0.1/32", "127.0.0.0/30"], ports=(port,), timeout=1)
+    assert found == {"127.0.0.1": [port]}
+    assert probed == ["127.0.0.1", "127.0.0.2"]
+
+
+def test_to_visa_address_prefers_vxi11_then_hislip():
+    assert to_visa_address("10.0.0.5", [5025, VXI11_PORTMAP_PORT]) == "TCPIP0::10.0.0.5::inst0::INSTR"
+    assert to_visa_address("10.0.0.5", [5025, HISLIP_PORT]) == "TCPIP0::10.0.0.5::hislip0::INSTR"
+    assert to_visa_address("10.0.0.5", [5025]) == "TCPIP0::10.0.0.5::5025::SOCKET"
@@ -0,0 +1,96 @@
+"""
+界面重绘调度：同一轮事件内多次标记只重绘一次（使用模拟控件，不需要显示器）
+"""
+from render_scheduler import RenderScheduler
+
+
+class FakeWidget:
+    def __init__(self):
+        self.idle = {}
+        self._next_id = 0
+
+    def after_idle(self, func):
+        self._next_id += 1
+        self.idle[self._next_id] = func
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.idle.pop(after_id, None)
+
+    def run_idle(self):
+        while self.idle:
+            after_id = min(self.idle)
+            self.idle.pop(after_id)()
+
+
+def make_scheduler(*names):
+    widget = FakeWidget()
+    scheduler = RenderScheduler(widget)
+    rendered = []
+    for name in names:
+        scheduler.register(name, lambda name=name: rendered.append(name))
+    return widget, scheduler, rendered
+
+
+def test_invalidations_are_coalesced_in_registration_order():
+    widget, scheduler, rendered = make_scheduler("background", "title_bar", "content")
+    scheduler.invalidate("content")
+    scheduler.invalidate("background", "content")
+    scheduler.invalidate("unknown")
+    assert len(widget.idle) == 1
+    widget.run_idle()
+    assert rendered == ["background", "content"]
+    stats = scheduler.stats()
+    assert (stats["flushes"], stats["renders"], stats["invalidations"]) == (1, 2, 3)
+
+
+def test_idle_without_invalidation_does_nothing():
+    widget, scheduler, rendered = make_scheduler("content")
+    widget.run_idle()
+    assert rendered == []
+    assert scheduler.stats()["flushes"] == 0
+
+
+def test_invalidate_without_names_marks_everything():
+    widget, scheduler, rendered = make_scheduler("background", "tabs")
+    scheduler.invalidate()
+    scheduler.flush()
+    assert rendered == ["background", "tabs"]
+    assert not widget.idle
+
+
+def test_invalidation_during_flush_runs_next_idle():
+    widget = FakeWidget()
+    scheduler = RenderScheduler(widget)
+    rendered = []
+
+    def render_tabs():
+        rendered.append("tabs")
+        scheduler.invalidate("content")
+
+    scheduler.register("tabs", render_tabs)
+    scheduler.register("content", lambda: rendered.append("content"))
+    scheduler.invalidate("tabs")
+    widget.run_idle()
+    assert rendered == ["tabs", "content"]
+    assert scheduler.stats()["flushes"] == 2
+
+
+def test_failing_renderer_does_not_stop_others():
+    widget, scheduler, rendered = make_scheduler("content")
+    scheduler.register("background", lambda: 1 / 0)
+    scheduler.invalidate("background", "content")
+    widget.run_idle()
+    assert rendered == ["content"]
+
+
+def test_cancel_and_unregister():
+    widget, scheduler, rendered = make_scheduler("background", "content")
+    scheduler.invalidate("background")
+    scheduler.cancel()
+    widget.run_idle()
+    scheduler.unregister("content")
+    scheduler.invalidate("content")
+    widget.run_idle()
+    assert rendered == []
+    assert scheduler.stats()["pending"] == []
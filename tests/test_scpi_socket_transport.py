@@ -0,0 +1,104 @@
+"""
+SCPI Socket响应解析：普通响应、空响应、定长块和无效块头
+"""
+import socket
+
+import pytest
+
+from scpi_socket_transport import ScpiProtocolError, ScpiSocketConnection, ScpiSocketTransport
+
+
+@pytest.fixture
+def pair():
+    device, host = socket.socketpair()
+    host.settimeout(1.0)
+    yield device, ScpiSocketConnection("127.0.0.1", 5025, host)
+    device.close()
+    host.close()
+
+
+def test_line_responses(pair):
+    device, conn = pair
+    device.sendall(b"1.234\r\n\nKEYSIGHT,DSOX1204G\n")
+    assert conn.read_response() == b"1.234"
+    assert conn.read_response() == b""
+    assert conn.read_response() == b"KEYSIGHT,DSOX1204G"
+
+
+def test_definite_length_block_larger_than_recv(pair):
+    device, conn = pair
+    payload = bytes(range(256)) * 400     # 含换行字节，且超过一次recv
+    device.sendall(b"#6%06d" % len(payload) + payload + b"\n")
+    device.sendall(b"OK\n")
+    assert conn.read_response() == payload
+    assert conn.read_response() == b"OK"
+
+
+def test_indefinite_block(pair):
+    device, conn = pair
+    device.sendall(b"#0abc\n")
+    assert conn.read_response() == b"#0abc"
+
+
+@pytest.mark.parametrize("data", [b"#x12\n", b"#2ab0123\n"])
+def test_malformed_block_header(pair, data):
+    device, conn = pair
+    device.sendall(data)
+    with pytest.raises(ScpiProtocolError):
+        conn.read_response()
+
+
+def test_protocol_error_drops_connection(pair):
+    device, conn = pair
+    transport = ScpiSocketTransport()
+    transport._connections["127.0.0.1"] = conn
+    device.sendall(b"#x\n")
+    with pytest.raises(ScpiProtocolError):
+        transport.send("127.0.0.1", "*IDN?")
+    assert transport.get_stats()["open_connections"] == 0
+
+
+def test_pipeline_collects_query_responses(pair):
+    device, conn = pair
+    transport = ScpiSocketTransport()
+    transport._connections["127.0.0.1"] = conn
+    device.sendall(b"+1\n+2\n")
+    assert transport.pipeline("127.0.0.1", ["VOLT 5", "VOLT?", "CURR 1", "CURR?", "OUTP ON"]) == ["+1", "+2"]
+    expected = b"VOLT 5\nVOLT?\nCURR 1\nCURR?\nOUTP ON\n"
+    device.settimeout(1.0)
+    received = b""
+    while len(received) < len(expected):
+        received += device.recv(1024)
+    assert received == expected
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_failed_reconnect_is_not_counted(pair):
+    device, conn = pair
+    device.close()
+    transport = ScpiSocketTransport(ports=(closed_port(),), connect_timeout=1.0)
+    transport._connections["127.0.0.1"] = conn
+    with pytest.raises(ConnectionError):
+        transport.send("127.0.0.1", "OUTP ON")
+    assert transport.get_stats()["reconnected"] == 0
+
+
+def test_lost_connection_reconnects_once(pair):
+    device, conn = pair
+    device.close()
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        transport = ScpiSocketTransport(ports=(server.getsockname()[1],), connect_timeout=1.0)
+        transport._connections["127.0.0.1"] = conn
+        transport.send("127.0.0.1", "OUTP ON")
+        peer, _ = server.accept()
+        with peer:
+            peer.settimeout(1.0)
+            assert peer.recv(64) == b"OUTP ON\n"
+        stats = transport.get_stats()
+        transport.close_all()
+    assert stats["reconnected"] == 1
@@ -0,0 +1,57 @@
+"""
+SCPI指令模板：两个选项卡原有的参数模板、替换和解析结果
+"""
+from interface.tabs.instrument_command import InstrumentCommandTab
+from scpi_template import (compile_template, parameter_template, parse_parameter_input,
+                           render_command)
+
+
+def instrument_template(text):
+    return InstrumentCommandTab.generate_parameter_template(None, text)
+
+
+def test_instrument_tab_lists_value_parameters_sorted_and_unique():
+    text = ":CH1:SCAle value2;:CH2:SCAle value1;:CH3:SCAle value1;:HOR:SCAle value"
+    assert instrument_template(text) == "value=?;value1=?;value2=?;"
+
+
+def test_instrument_tab_matches_value_without_leading_boundary():
+    assert instrument_template(":CHvalue1:SCAle VALUE2") == "value1=?;VALUE2=?;"
+
+
+def test_instrument_tab_ignores_bracket_parameters():
+    assert instrument_template(":MEASUrement:IMMed:SOUrce <src>") == ""
+    assert instrument_template(":CH<ch>:SCAle value1") == "value1=?;"
+    assert instrument_template("*RST") == ""
+    assert instrument_template(None) == ""
+
+
+def test_custom_tab_uses_bracket_parameters_without_value():
+    assert parameter_template(":MEAS:SOUR <src>;:MEAS:TYPE <type>;:MEAS:SOUR <src>") == "src=?;type=?;"
+    assert parameter_template(":CH<ch>:SCAle value1") == "value1=?;"
+    assert parameter_template(":HOR:SCAle value1", fill='123') == "value1=123;"
+
+
+def test_render_replaces_each_occurrence():
+    text = ":CHvalue1:SCAle value2;:CHvalue1:OFFSet 0"
+    assert render_command(text, {"value1": "2", "value2": "0.5"}) == ":CH2:SCAle 0.5;:CH2:OFFSet 0"
+
+
+def test_render_keeps_unfilled_parameters():
+    text = ":CH<ch>:SCAle value1;:HOR:SCAle value2"
+    assert render_command(text, {"value1": "?", "ch": "3"}) == ":CH3:SCAle value1;:HOR:SCAle value2"
+    assert render_command("*IDN?", {"value1": "1"}) == "*IDN?"
+
+
+def test_render_does_not_touch_longer_names():
+    assert render_command("value1 value10", {"value1": "A"}) == "A value10"
+
+
+def test_parse_parameter_input():
+    assert parse_parameter_input(" value1=2; value2 = 3 ;") == {"value1": "2", "value2": "3"}
+    assert parse_parameter_input("expr=a=b;novalue;") == {"expr": "a=b"}
+    assert parse_parameter_input("") == {}
+
+
+def test_compiled_templates_are_cached():
+    assert compile_template(":HOR:SCAle value1") is compile_template(":HOR:SCAle value1")
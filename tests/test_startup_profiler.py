@@ -0,0 +1,33 @@
+"""
+启动计时：按完整模块名统计子模块的导入耗时
+"""
+import importlib
+import sys
+
+from startup_profiler import HEAVY_MODULES, StartupProfiler, _ImportTimer
+
+
+def test_heavy_modules_name_imported_submodules():
+    for name in ("PIL.Image", "PIL.ImageTk", "serial.tools.list_ports"):
+        assert name in HEAVY_MODULES
+
+
+def test_submodule_import_is_timed(tmp_path, monkeypatch):
+    package = tmp_path / "fakeheavy"
+    (package / "tools").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "tools" / "__init__.py").write_text("")
+    (package / "tools" / "ports.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler(modules=("fakeheavy.tools.ports",))
+    try:
+        importlib.import_module("fakeheavy.tools.ports")
+    finally:
+        sys.meta_path[:] = [finder for finder in sys.meta_path
+                            if not isinstance(finder, _ImportTimer)]
+        for name in ("fakeheavy.tools.ports", "fakeheavy.tools", "fakeheavy"):
+            sys.modules.pop(name, None)
+
+    report = profiler.build_report()
+    assert report["imports"]["fakeheavy.tools.ports"]["status"] == "imported"
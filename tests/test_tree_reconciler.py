@@ -0,0 +1,128 @@
+"""
+Treeview差异更新：在模拟Treeview上检查插入、重排、隐藏和删除
+"""
+from tree_reconciler import TreeReconciler
+
+
+class FakeTree:
+    """只实现TreeReconciler用到的Treeview方法，并记录每类操作的次数"""
+
+    def __init__(self):
+        self.children = []      # 显示中的项目ID（按顺序）
+        self.items = {}         # 项目ID -> (values, tags)，包括已隐藏的项目
+        self.calls = {"insert": 0, "move": 0, "item": 0, "detach": 0, "delete": 0}
+
+    def insert(self, parent, index, iid, values, tags):
+        assert iid not in self.items
+        self.calls["insert"] += 1
+        self.items[iid] = (values, tags)
+        self.children.insert(index, iid)
+        return iid
+
+    def item(self, iid, values, tags):
+        self.calls["item"] += 1
+        self.items[iid] = (values, tags)
+
+    def move(self, iid, parent, index):
+        self.calls["move"] += 1
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def detach(self, *iids):
+        self.calls["detach"] += 1
+        for iid in iids:
+            self.children.remove(iid)
+
+    def delete(self, *iids):
+        self.calls["delete"] += 1
+        for iid in iids:
+            if iid in self.children:
+                self.children.remove(iid)
+            del self.items[iid]
+
+    def rows(self):
+        return [(iid,) + self.items[iid] for iid in self.children]
+
+
+def make_rows(*ids, suffix=""):
+    return [(iid, (f"{iid}{suffix}", "*IDN?"), ("even" if i % 2 == 0 else "odd",))
+            for i, iid in enumerate(ids)]
+
+
+def test_first_reconcile_inserts_in_order():
+    tree = FakeTree()
+    stats = TreeReconciler(tree).reconcile(make_rows("a", "b", "c"))
+    assert tree.rows() == make_rows("a", "b", "c")
+    assert stats.inserted == 3
+
+
+def test_unchanged_rows_are_not_touched():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    reconciler.reconcile(make_rows("a", "b", "c"))
+    calls = dict(tree.calls)
+    stats = reconciler.reconcile(make_rows("a", "b", "c"))
+    assert tree.calls == calls
+    assert stats.unchanged == 3
+
+
+def test_reorder_moves_only_rows_outside_longest_run():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    reconciler.reconcile(make_rows("a", "b", "c", "d", "e"))
+    stats = reconciler.reconcile(make_rows("e", "a", "b", "c", "d"))
+    assert tree.children == ["e", "a", "b", "c", "d"]
+    # 只有e需要移动；交替行标签变化的行只更新内容
+    assert stats.moved == 1
+    assert tree.rows() == make_rows("e", "a", "b", "c", "d")
+
+
+def test_reverse_order():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    reconciler.reconcile(make_rows("a", "b", "c", "d"))
+    stats = reconciler.reconcile(make_rows("d", "c", "b", "a"))
+    assert tree.rows() == make_rows("d", "c", "b", "a")
+    assert stats.moved == 3
+
+
+def test_duplicate_commands_keep_separate_rows():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    same = ("示波器 - MSO46B - 测量", "MEAS?")
+    reconciler.reconcile([("1", same, ()), ("2", same, ()), ("3", same, ())])
+    stats = reconciler.reconcile([("3", same, ()), ("1", same, ())])
+    assert tree.children == ["3", "1"]
+    assert stats.detached == 1
+    assert stats.updated == 0
+
+
+def test_hidden_rows_are_reattached_and_pruned():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    reconciler.reconcile(make_rows("a", "b", "c"))
+    reconciler.reconcile(make_rows("a", "c"))
+    assert tree.children == ["a", "c"]
+    assert "b" in tree.items
+
+    stats = reconciler.reconcile(make_rows("a", "b", "c"))
+    assert tree.rows() == make_rows("a", "b", "c")
+    assert stats.reattached == 1
+    assert stats.inserted == 0
+
+    assert reconciler.prune(["a", "c"]) == 1
+    assert "b" not in tree.items
+    reconciler.reconcile(make_rows("c", "a"))
+    assert tree.rows() == make_rows("c", "a")
+    assert reconciler.prune(["a", "c"]) == 0
+
+
+def test_content_change_updates_in_place():
+    tree = FakeTree()
+    reconciler = TreeReconciler(tree)
+    reconciler.reconcile(make_rows("a", "b"))
+    stats = reconciler.reconcile(make_rows("a", "b", suffix="*"))
+    assert tree.rows() == make_rows("a", "b", suffix="*")
+    assert stats.updated == 2
+    assert tree.calls["move"] == 0
@@ -0,0 +1,136 @@
+"""
+VISA会话管理器：只有连接断开时才重连重试
+"""
+import sys
+import types
+
+import pytest
+
+import visa_session_manager
+from visa_session_manager import VisaSessionManager
+
+
+class FakeSession:
+    def __init__(self, errors):
+        self.errors = errors
+        self.writes = []
+        self.closed = False
+
+    def write(self, command):
+        self.writes.append(command)
+        if self.errors:
+            raise self.errors.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeResourceManager:
+    def __init__(self, errors=(), open_errors=()):
+        self.errors = list(errors)
+        self.open_errors = list(open_errors)
+        self.sessions = []
+
+    def open_resource(self, address):
+        if self.open_errors:
+            raise self.open_errors.pop(0)
+        session = FakeSession(self.errors)
+        self.sessions.append(session)
+        return session
+
+
+def make_manager(**kwargs):
+    manager = VisaSessionManager()
+    manager._resource_manager = FakeResourceManager(**kwargs)
+    return manager
+
+
+def test_reuses_session():
+    manager = make_manager()
+    manager.write("TCPIP::1::INSTR", "OUTP ON")
+    manager.write("TCPIP::1::INSTR", "OUTP OFF")
+    stats = manager.get_stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] == 1
+
+
+def test_connection_error_reconnects_once():
+    manager = make_manager(errors=[ConnectionError("lost")])
+    manager.write("TCPIP::1::INSTR", "OUTP ON")
+    sessions = manager._resource_manager.sessions
+    assert len(sessions) == 2
+    assert sessions[0].closed
+    assert manager.get_stats()["reconnected"] == 1
+
+
+def test_other_errors_are_not_retried():
+    manager = make_manager(errors=[TimeoutError("timeout")])
+    with pytest.raises(TimeoutError):
+        manager.write("TCPIP::1::INSTR", "OUTP ON")
+    sessions = manager._resource_manager.sessions
+    # 指令只发送一次，会话被丢弃
+    assert len(sessions) == 1
+    assert sessions[0].writes == ["OUTP ON"]
+    assert sessions[0].closed
+    stats = manager.get_stats()
+    assert stats["reconnected"] == 0
+    assert stats["open_sessions"] == 0
+
+
+def test_failed_reconnect_is_not_counted():
+    manager = make_manager(errors=[ConnectionError("lost")])
+    manager._get_session("TCPIP::1::INSTR")
+    manager._resource_manager.open_errors = [ConnectionError("down")]
+    with pytest.raises(ConnectionError):
+        manager.write("TCPIP::1::INSTR", "OUTP ON")
+    assert manager.get_stats()["reconnected"] == 0
+
+
+def make_fake_pyvisa(resource_manager):
+    """模拟PyVISA中会话管理器用到的部分"""
+    class VisaIOError(Exception):
+        def __init__(self, error_code):
+            super().__init__(error_code)
+            self.error_code = error_code
+
+    class InvalidSession(Exception):
+        pass
+
+    module = types.ModuleType("pyvisa")
+    module.errors = types.SimpleNamespace(VisaIOError=VisaIOError, InvalidSession=InvalidSession)
+    module.constants = types.SimpleNamespace(StatusCode=types.SimpleNamespace(
+        error_connection_lost=-1073807194, error_invalid_object=-1073807346, error_timeout=-1073807339))
+    module.ResourceManager = lambda: resource_manager
+    return module
+
+
+@pytest.fixture
+def fake_pyvisa(monkeypatch):
+    """未经预先导入、由会话管理器第一次导入PyVISA"""
+    resource_manager = FakeResourceManager()
+    module = make_fake_pyvisa(resource_manager)
+    monkeypatch.setitem(sys.modules, "pyvisa", module)
+    monkeypatch.setitem(visa_session_manager.pyvisa.__dict__, "_module", None)
+    monkeypatch.setitem(visa_session_manager.pyvisa.__dict__, "_error", None)
+    return module, resource_manager
+
+
+def test_visa_connection_lost_reconnects_without_prewarm(fake_pyvisa):
+    module, resource_manager = fake_pyvisa
+    lost = module.errors.VisaIOError(module.constants.StatusCode.error_connection_lost)
+    resource_manager.errors.append(lost)
+    manager = VisaSessionManager()
+    manager.write("TCPIP::1::INSTR", "OUTP ON")
+    assert visa_session_manager.pyvisa.loaded
+    assert len(resource_manager.sessions) == 2
+    assert manager.get_stats()["reconnected"] == 1
+
+
+def test_visa_timeout_is_not_retried(fake_pyvisa):
+    module, resource_manager = fake_pyvisa
+    timeout = module.errors.VisaIOError(module.constants.StatusCode.error_timeout)
+    resource_manager.errors.append(timeout)
+    manager = VisaSessionManager()
+    with pytest.raises(module.errors.VisaIOError):
+        manager.write("TCPIP::1::INSTR", "OUTP ON")
+    assert len(resource_manager.sessions) == 1
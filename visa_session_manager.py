@@ -0,0 +1,211 @@
+"""
+VISA会话管理器
+进程内为每个仪器地址保持一个打开的VISA会话并重复使用，
+避免每发送一条指令都重新建立VXI-11/HiSLIP连接
+"""
+import atexit
+import threading
+
+# 默认设备配置文件（device_addresses 中保存各仪器地址）
+from config_store import DEFAULT_CONFIG_PATH, get_config_store
+from lazy_import import lazy_import
+
+pyvisa = lazy_import("pyvisa")
+
+# 默认IO超时（毫秒）
+DEFAULT_TIMEOUT_MS = 5000
+
+# 表示连接已断开或会话失效的VISA状态码：指令没有送达仪器，可以重连后再发送
+RECONNECT_STATUS_CODES = ("error_connection_lost", "error_invalid_object")
+
+
+def is_reconnectable_error(error):
+    """通信失败是否可以重连重试
+
+    只有连接断开、会话失效时才重试；超时等其他错误发生时指令可能已经被仪器执行，
+    重试会让输出开关、负载设置等非幂等指令执行两次。
+    """
+    if isinstance(error, ConnectionError):
+        return True
+    if not pyvisa.loaded:
+        return False
+    if isinstance(error, pyvisa.errors.InvalidSession):
+        return True
+    if isinstance(error, pyvisa.errors.VisaIOError):
+        codes = {getattr(pyvisa.constants.StatusCode, name, None) for name in RECONNECT_STATUS_CODES}
+        return error.error_code in codes
+    return False
+
+
+class VisaSessionManager:
+    """按地址缓存VISA会话：失败时懒重连，同一仪器的访问用锁串行化"""
+
+    def __init__(self, timeout_ms=DEFAULT_TIMEOUT_MS):
+        self.timeout_ms = timeout_ms
+        self._resource_manager = None
+        self._sessions = {}               # 地址 -> 已打开的会话
+        self._address_locks = {}          # 地址 -> 该仪器的访问锁
+        self._lock = threading.Lock()     # 保护上面两个字典和资源管理器
+        self.stats = {
+            "opened": 0,        # 新打开的会话数
+            "reused": 0,        # 复用已有会话的次数
+            "reconnected": 0,   # 通信失败后重新连接的次数
+            "failures": 0,      # 重连后仍然失败的次数
+        }
+
+    def write(self, address, command):
+        """发送控制指令"""
+        self._call(address, lambda session: session.write(command))
+
+    def query(self, address, command):
+        """发送查询指令并返回响应"""
+        return self._call(address, lambda session: session.query(command))
+
+    def send(self, address, command):
+        """以?结尾的指令按查询发送并返回响应，其余按控制指令发送并返回None"""
+        if command.endswith('?'):
+            return self.query(address, command)
+        self.write(address, command)
+        return None
+
+    def preconnect(self, addresses):
+        """预先打开一组地址的会话，返回成功打开的地址列表（失败的地址会在使用时再连接）"""
+        connected = []
+        for address in addresses:
+            try:
+                with self._get_address_lock(address):
+                    self._get_session(address)
+                connected.append(address)
+            except Exception as e:
+                print(f"⚠️ 预连接 {address} 失败: {e}")
+        return connected
+
+    def preconnect_configured_devices(self, config_path=DEFAULT_CONFIG_PATH):
+        """按设备配置文件中的 device_addresses 预先打开VISA会话"""
+        config_store = get_config_store(config_path)
+        if not config_store.exists():
+            print(f"⚠️ 设备配置文件不存在: {config_path}")
+            return []
+
+        addresses = []
+        for address in config_store.get("device_addresses", {}).values():
+            if isinstance(address, str) and address.startswith(("TCPIP", "GPIB", "USB")) \
+                    and address not in addresses:
+                addresses.append(address)
+        return self.preconnect(addresses)
+
+    def close(self, address):
+        """关闭指定地址的会话"""
+        with self._get_address_lock(address):
+            with self._lock:
+                session = self._sessions.pop(address, None)
+            self._close_session(session)
+
+    def close_all(self):
+        """关闭所有会话和资源管理器（程序退出时调用）"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            resource_manager = self._resource_manager
+            self._resource_manager = None
+        for session in sessions:
+            self._close_session(session)
+        if resource_manager is not None:
+            try:
+                resource_manager.close()
+            except Exception:
+                pass
+
+    def get_stats(self):
+        """获取会话打开/复用/重连统计"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["open_sessions"] = len(self._sessions)
+        return stats
+
+    def _call(self, address, action):
+        """在该仪器的锁内执行操作；连接断开或会话失效时丢弃会话重连一次再试
+
+        超时等其他错误不重试（仪器可能已执行指令），只丢弃会话避免残留响应错位。
+        """
+        with self._get_address_lock(address):
+            session = self._get_session(address)
+            try:
+                return action(session)
+            except Exception as e:
+                self._drop_session(address)
+                if not is_reconnectable_error(e):
+                    raise
+                print(f"⚠️ VISA会话 {address} 连接已断开，尝试重新连接: {e}")
+
+            session = self._get_session(address)
+            with self._lock:
+                self.stats["reconnected"] += 1
+            try:
+                return action(session)
+            except Exception:
+                with self._lock:
+                    self.stats["failures"] += 1
+                self._drop_session(address)
+                raise
+
+    def _get_session(self, address):
+        """获取地址对应的会话，没有时新建（调用方需持有该地址的锁）"""
+        with self._lock:
+            session = self._sessions.get(address)
+            if session is not None:
+                self.stats["reused"] += 1
+                return session
+            resource_manager = self._get_resource_manager()
+
+        session = resource_manager.open_resource(address)
+        session.timeout = self.timeout_ms
+        with self._lock:
+            self._sessions[address] = session
+            self.stats["opened"] += 1
+        print(f"🔗 已打开VISA会话: {address}")
+        return session
+
+    def _drop_session(self, address):
+        with self._lock:
+            session = self._sessions.pop(address, None)
+        self._close_session(session)
+
+    def _get_address_lock(self, address):
+        with self._lock:
+            lock = self._address_locks.get(address)
+            if lock is None:
+                lock = threading.RLock()
+                self._address_locks[address] = lock
+            return lock
+
+    def _get_resource_manager(self):
+        """创建共享的ResourceManager（调用方需持有self._lock），未安装PyVISA时抛出ImportError"""
+        if self._resource_manager is None:
+            # 通过延迟导入代理导入，is_reconnectable_error 依据代理判断PyVISA是否已导入
+            self._resource_manager = pyvisa.load().ResourceManager()
+        return self._resource_manager
+
+    @staticmethod
+    def _close_session(session):
+        if session is None:
+            return
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+_session_manager = None
+_session_manager_lock = threading.Lock()
+
+
+def get_visa_session_manager():
+    """获取进程内共享的VISA会话管理器"""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = VisaSessionManager()
+                atexit.register(_session_manager.close_all)
+    return _session_manager